@@ -61,40 +61,43 @@ def _exportshape(szshapefile, lstszcroptypeids, szyyyyyear, szoutputrootdir, lst
     #
     #
     #
-    for parcel in parcelsgeodataframe.itertuples():
-        icountparcels = icountparcels + 1
-        datetime_tick = datetime.datetime.now()
-        szfieldID     = str(parcel.fieldID)
-        icroptype     = str(int(parcel.croptype))
-        shapelypoint  = parcel.geometry.centroid
-        eepoint       = ee.Geometry.Point(shapelypoint.x, shapelypoint.y)
-        szoutputdir   = CropSARParcels.getparceldirectory(szoutputrootdir, icroptype, szfieldID)
+    try:
+        for parcel in parcelsgeodataframe.itertuples():
+            icountparcels = icountparcels + 1
+            datetime_tick = datetime.datetime.now()
+            szfieldID     = str(parcel.fieldID)
+            icroptype     = str(int(parcel.croptype))
+            shapelypoint  = parcel.geometry.centroid
+            eepoint       = ee.Geometry.Point(shapelypoint.x, shapelypoint.y)
+            szoutputdir   = CropSARParcels.getparceldirectory(szoutputrootdir, icroptype, szfieldID)
         
-        if True:
-            try: 
-                #
-                # might be nice to have a shape file of specific patch
-                #
-                szparcelshapefile = os.path.join(szoutputdir, szfieldID + ".shp")
-                if not os.path.isfile(szparcelshapefile): # no need if it is already there
-                    CropSARParcels.pandastoshp(
-                        geopandas.GeoDataFrame( geometry=[parcel.geometry], crs=parcelsgeodataframe.crs), 
-                        szparcelshapefile)
+            if True:
+                try: 
+                    #
+                    # might be nice to have a shape file of specific patch
+                    #
+                    szparcelshapefile = os.path.join(szoutputdir, szfieldID + ".shp")
+                    if not os.path.isfile(szparcelshapefile): # no need if it is already there
+                        CropSARParcels.pandastoshp(
+                            geopandas.GeoDataFrame( geometry=[parcel.geometry], crs=parcelsgeodataframe.crs), 
+                            szparcelshapefile)
+                except:
+                    #
+                    # but we do not want any additional problems with this
+                    #
+                    pass
+
+            #
+            # actual export
+            #
+            try:
+                exporter.exportimages(eepoint, ee.Date(szyyyymmddfrom), ee.Date(szyyyymmddtill), szoutputdir, verbose=verbose)
+                logging.info(f"export field {szfieldID} - croptype {icroptype} parcel({icountparcels} of {numberofparcels}) done - {int((datetime.datetime.now()-datetime_tick).total_seconds())} seconds")
             except:
-                #
-                # but we do not want any additional problems with this
-                #
-                pass
-
-        #
-        # actual export
-        #
-        try:
-            exporter.exportimages(eepoint, ee.Date(szyyyymmddfrom), ee.Date(szyyyymmddtill), szoutputdir, verbose=verbose)
-            logging.info(f"export field {szfieldID} - croptype {icroptype} parcel({icountparcels} of {numberofparcels}) done - {int((datetime.datetime.now()-datetime_tick).total_seconds())} seconds")
-        except:
-            logging.warning(f"export field {szfieldID} - croptype {icroptype} parcel({icountparcels} of {numberofparcels}) failed - {int((datetime.datetime.now()-datetime_tick).total_seconds())} seconds")
-            raise
+                logging.warning(f"export field {szfieldID} - croptype {icroptype} parcel({icountparcels} of {numberofparcels}) failed - {int((datetime.datetime.now()-datetime_tick).total_seconds())} seconds")
+                raise
+    finally:
+        exporter.close()
 
 #
 #
@@ -0,0 +1,149 @@
+"""
+migrating existing patches (one tif per date per product) into per-patch cubes (geecube.GEECube)
+
+    szrootdir - PV100LC_lua - Lonxxxx.xxxxxxxx_Latyyyy.yyyyyyyy - productdescription.YYYY-MM-DD.tif
+                                                                - ...
+    =>
+    szrootdir - PV100LC_lua - Lonxxxx.xxxxxxxx_Latyyyy.yyyyyyyy - geepatches.zarr
+                                                                - (productdescription.YYYY-MM-DD.tif removed if so specified)
+
+conversion is append-only: dates already in the cube are skipped, so an interrupted conversion can simply be restarted.
+"""
+
+import os
+import logging
+import datetime
+
+import numpy
+import osgeo.gdal
+
+import geecube
+
+from utils_patches import Patches
+
+
+#
+#
+#
+IAMRUNNINGONTHEMEP = False
+
+#
+#
+#
+def _readgeotiff(szfilename):
+    """
+    returns (numpy array (bands, y, x), geotransform, projection, nodata) - masked floats ('-inf') as nan
+    """
+    ds = osgeo.gdal.Open(szfilename)
+    try:
+        data = ds.ReadAsArray()
+        if data.ndim == 2: data = data[numpy.newaxis]
+        geotransform = ds.GetGeoTransform()
+        projection   = ds.GetProjection()
+        nodata       = ds.GetRasterBand(1).GetNoDataValue()
+        lstbandnames = [ds.GetRasterBand(iband+1).GetDescription() for iband in range(ds.RasterCount)]
+    finally:
+        ds = None
+    if numpy.issubdtype(data.dtype, numpy.floating):
+        data[numpy.isneginf(data)] = numpy.nan
+        nodata = float('nan')
+    return data, geotransform, projection, nodata, lstbandnames
+
+#
+#
+#
+def convertpatchtocube(szpatchdir, bremovefiles=False, verbose=False):
+    """
+    append all szdescription.YYYY-MM-DD.tif files in szpatchdir to its cube
+    returns number of files converted
+    """
+    cube              = geecube.GEECube(szpatchdir, verbose=verbose)
+    productsfilesdict = Patches.findproductsfilesdict(szpatchdir)
+    iconverted        = 0
+    for szcollectiondescription, productfilesdict in productsfilesdict.items():
+        sziso8601dates = sorted(productfilesdict.keys())
+        #
+        #    per CUBEDATECHUNK dates - limits memory and matches the cube chunking
+        #
+        for ioffset in range(0, len(sziso8601dates), geecube.CUBEDATECHUNK):
+            lstszdates = sziso8601dates[ioffset:ioffset + geecube.CUBEDATECHUNK]
+            lstdata    = []
+            for sziso8601date in lstszdates:
+                data, geotransform, projection, nodata, lstbandnames = _readgeotiff(productfilesdict[sziso8601date])
+                lstdata.append(data)
+            cube.append(szcollectiondescription, lstszdates, numpy.stack(lstdata), geotransform, projection, nodata=nodata, lstbandnames=lstbandnames)
+            #
+            #    only remove the files once they are safely in the cube
+            #
+            if bremovefiles:
+                for sziso8601date in lstszdates: os.remove(productfilesdict[sziso8601date])
+            iconverted += len(lstszdates)
+        if verbose: logging.info(f"{szpatchdir}: {szcollectiondescription} {len(sziso8601dates)} files converted")
+    return iconverted
+
+#
+#
+#
+def convertpatchestocubes(szrootdir, lstlanduseclasses=None, bremovefiles=False, verbose=False):
+    """
+    convert all patches in all (or lstlanduseclasses) land use directories in szrootdir
+    """
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname).3s {%(module)s:%(funcName)s:%(lineno)d} - %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
+
+    if not os.path.isdir(szrootdir)                   : raise ValueError(f"invalid root directory szrootdir ({str(szrootdir)})")
+    osgeo.gdal.UseExceptions()
+    #
+    #    logging to file
+    #
+    datetime_tick_all  = datetime.datetime.now()
+    szoutputbasename=os.path.join(szrootdir, f"{os.path.basename(__file__)[0:-3]}_{datetime_tick_all.strftime('%Y%m%d%H%M%S')}")
+    logfilehandler = logging.FileHandler(szoutputbasename + ".log")
+    logfilehandler.setFormatter(logging.Formatter('%(asctime)s %(levelname).4s %(message)s', datefmt='%Y-%m-%d %H:%M:%S'))
+    logging.getLogger().addHandler(logfilehandler) # (don't forget to remove it!)
+    try:
+        logging.info(" ")
+        logging.info(f"{os.path.basename(__file__)[0:-3]}")
+        logging.info(f"    root dir:     {szrootdir}")
+        logging.info(f"    land use:     {lstlanduseclasses if lstlanduseclasses is not None else 'any'}")
+        logging.info(f"    remove files: {bremovefiles}")
+        logging.info(" ")
+
+        landusedirectories = Patches.findlandusedirectoriesdict(szrootdir)
+        if lstlanduseclasses:
+            landusedirectories = {ilu:lud for ilu,lud in landusedirectories.items() if ilu in lstlanduseclasses}
+
+        icountpatches = 0
+        icountfiles   = 0
+        for ilanduse, landusedirectory in landusedirectories.items():
+            for szpatchID, szpatchdir in Patches.findpatchIDdirectoriesdict(landusedirectory).items():
+                iconverted     = convertpatchtocube(szpatchdir, bremovefiles=bremovefiles, verbose=verbose)
+                icountpatches += 1
+                icountfiles   += iconverted
+                logging.info(f"szpatchID({szpatchID}) land use({ilanduse}) - {iconverted} files converted")
+        logging.info(f"{icountpatches} patches - {icountfiles} files converted")
+
+    finally:
+        logging.info(f"{os.path.basename(__file__)[0:-3]} exit - {int( (datetime.datetime.now()-datetime_tick_all).total_seconds()/6/6)/100} hours")
+        logging.getLogger().removeHandler(logfilehandler)
+
+#
+#
+#
+def main():
+    """
+    """
+    szrootdir         = r"/vitodata/CropSAR/tmp/dominique/gee/tmp" if IAMRUNNINGONTHEMEP else r"C:\tmp"
+    lstlanduseclasses = [40]
+    bremovefiles      = False
+    verbose           = False
+    convertpatchestocubes(szrootdir, lstlanduseclasses=lstlanduseclasses, bremovefiles=bremovefiles, verbose=verbose)
+
+#
+#
+#
+if __name__ == '__main__':
+    """
+    """
+    print('starting main')
+    main()
+    print('finishing main')
@@ -66,6 +66,7 @@ def updateexistingpatches(szsrcrootdir, lstlanduseclasses, binvertlanduse, eereg
     if (len(lstszyyyyyears) <=0)                      : raise ValueError("lstszyyyyyears contains no valid szyyyyyears")
 
     lstszproducts  = GEEExporter.saneproducts(lstszproducts)  # assert at least one exportable product specified
+    exporter       = GEEExporter(lstszproducts)
     #
     #    logging to file
     #
@@ -111,82 +112,20 @@ def updateexistingpatches(szsrcrootdir, lstlanduseclasses, binvertlanduse, eereg
                 #
                 patchdestinationdirectory = Patches.getpatchdirectoryfromLonLat(Patches.getlandusedirectory(szdstrootdir, ilanduse), fpointlon, fpointlat)
                 #
-                #    evaluate potential existing products in destination
+                #    incremental export: the patch manifest (geemanifest) knows which dates are present per product
+                #    (seeded from the existing files in case the patch was exported before manifests existed),
+                #    hence only missing dates are exported, and products known to be empty for a year are skipped.
+                #    this replaces the former "minimum entries per year" heuristic, which considered a product 
+                #    present as soon as a single date of it was found, and missed dates added to the archive later on.
                 #
-                patchproductsfilesdict = Patches.findproductsfilesdict(patchdestinationdirectory) # find all products there - limit directory scans
+                #    the reference grid of the patch is persisted (geegrid) - computed once, identical over the years.
                 #
-                #    
-                #
-                for szproduct in lstszproducts:
-                    #
-                    #    count existing product entries per year - if any
-                    #
-                    patchproductsdict = {}
-                    for szcollectiondescription, productfilesdict in patchproductsfilesdict.items():
-                        #
-                        #    only consider entries in patchproductsfilesdict where szcollectiondescription starts with current szproduct
-                        #
-                        if not szcollectiondescription.startswith(szproduct):
-                            continue
-    
-                        sziso8601dates = sorted(productfilesdict.keys())
-                        szyyyyyears    = sorted(list(set([sziso8601date[0:4] for sziso8601date in sziso8601dates]))) # sets are not guaranteed to be sorted
-                        if szyyyyyears:                                                                              # defense again potential bug productfilesdict = {}
-                            for szyyyyyear in szyyyyyears:
-                                countentries = len([sziso8601date for sziso8601date in sziso8601dates if sziso8601date.startswith(szyyyyyear)])
-                                if 0 < countentries:
-                                    #
-                                    #
-                                    #
-                                    if not szcollectiondescription in patchproductsdict:
-                                        patchproductsdict.update({szcollectiondescription : {}})
-                                    patchproductsdict.get(szcollectiondescription).update({szyyyyyear : countentries})
-                    #
-                    #    example patchproductsdict: for szpatchID, szproduct 'S2ndvi'
-                    #        {
-                    #            'S2ndvi': {'2020': 63, '2021': 59}}
-                    #        }
-                    #
-                    #    example patchproductsdict: for szpatchID, szproduct 'S1gamma0'
-                    #        {
-                    #            'S1gamma0_VV_ASC': {'2020': 60,  '2021': 55},
-                    #            'S1gamma0_VH_ASC': {'2020': 60,  '2021': 55},
-                    #            'S1gamma0_VV_DES': {'2020': 122, '2021': 119},
-                    #            'S1gamma0_VH_DES': {'2020': 122, '2021': 119}
-                    #        }
-                    #
-                    #    now we need a heuristic to check if the actual szproduct in the specified lstszproducts
-                    #    is considered "already present" in the destination per specified year in lstszyyyyyears
-                    #    bearing in mind the mismatch between the szproduct specifications of the GEEExporter
-                    #    and the szcollectiondescription strings found in the actual filenames by Patches.findproductsfilesdict
-                    #
-                    #
-                    #    we'll use the minimum over all descriptions present. this is NOT fail safe:
-                    #    e.g. : assume S1gamma0_VV_ASC being the first, crashed halfway => S1gamma0_VV_DES did not start
-                    #           but S1gamma0 is considered to be present.
-                    #    explicit requesting both _ASC and _DES to be present does not work; for some regions only one of ASC/DES exist.
-                    #
-                    for szyyyyyear in lstszyyyyyears:
-                        minentriesfound = None
-                        for szcollectiondescription, countentriesdict in patchproductsdict.items():
-                            entriesfound    = countentriesdict.get(szyyyyyear, 0)
-                            minentriesfound = entriesfound if minentriesfound is None else min(minentriesfound, entriesfound)
-                        if minentriesfound is None: minentriesfound = 0
-                        #
-                        #
-                        #
-                        if 0 < minentriesfound:
-                            logging.info(f"szpatchID({szpatchID}) szproduct({szproduct}) szyyyyyear({szyyyyyear}) minentriesfound({minentriesfound}) - considered present")
-                        else:
-                            logging.info(f"szpatchID({szpatchID}) szproduct({szproduct}) szyyyyyear({szyyyyyear}) minentriesfound({minentriesfound}) - considered absent")
-                            #
-                            #    exporting per product requires overhead, but no way i'm going to mess with intersections of 
-                            #    available dates between different products to get some marginal performance  gain
-                            #
-                            eepoint    = ee.Geometry.Point(fpointlon, fpointlat)
-                            eedatefrom = ee.Date(str(int(szyyyyyear)    )  + "-01-01" )
-                            eedatetill = ee.Date(str(int(szyyyyyear) + 1)  + "-01-01" )
-                            GEEExporter([szproduct]).exportimages(eepoint, eedatefrom, eedatetill, patchdestinationdirectory, verbose=verbose)
+                eepoint = ee.Geometry.Point(fpointlon, fpointlat)
+                for szyyyyyear in lstszyyyyyears:
+                    logging.info(f"szpatchID({szpatchID}) szproducts({lstszproducts}) szyyyyyear({szyyyyyear}) - updating")
+                    eedatefrom = ee.Date(str(int(szyyyyyear)    )  + "-01-01" )
+                    eedatetill = ee.Date(str(int(szyyyyyear) + 1)  + "-01-01" )
+                    exporter.exportimages(eepoint, eedatefrom, eedatetill, patchdestinationdirectory, usemanifest=True, userefgrid=True, verbose=verbose)
 
     finally:
         #
@@ -194,6 +133,7 @@ def updateexistingpatches(szsrcrootdir, lstlanduseclasses, binvertlanduse, eereg
         #
         logging.info(f"{os.path.basename(__file__)[0:-3]} exit - {int( (datetime.datetime.now()-datetime_tick_all).total_seconds()/6/6)/100} hours")
         logging.getLogger().removeHandler(logfilehandler)
+        exporter.close()
                             
 #
 #
@@ -0,0 +1,117 @@
+"""
+benchmark the geetiff output profiles on typical patches: bytes on disk and read time
+
+synthetic data only - no ee involved:
+- "S2scl"     : uint8 classes 0..11
+- "S2mask"    : uint8 0/1 masks with 255 as no-data
+- "S2ndvi"    : float32 smooth field with some nan (masked) pixels
+- "S2ndvistack": float32 100-band stack (exportimagestack)
+on 64x64 and 128x128 patches
+"""
+import geetiff
+
+import os
+import time
+import tempfile
+import numpy
+import osgeo.gdal
+import osgeo.osr
+
+
+#
+#
+#
+NUMBEROFFILES = 50
+
+
+"""
+"""
+def _syntheticdata(szkind, ipixels, rng):
+    yy, xx = numpy.mgrid[0:ipixels, 0:ipixels] / ipixels
+    if szkind == "S2scl":
+        data = (4 + 3*numpy.sin(6*xx) + 3*numpy.cos(5*yy) + rng.integers(0, 2, (ipixels, ipixels))).clip(0, 11).astype(numpy.uint8)
+        return data[numpy.newaxis], osgeo.gdal.GDT_Byte, 0
+    if szkind == "S2mask":
+        data = (numpy.sin(9*xx) * numpy.cos(7*yy) > 0.3).astype(numpy.uint8)
+        data[0:ipixels//8, :] = 255
+        return data[numpy.newaxis], osgeo.gdal.GDT_Byte, 255
+    if szkind == "S2ndvi":
+        data = (0.4 + 0.3*numpy.sin(6*xx)*numpy.cos(4*yy) + 0.02*rng.standard_normal((ipixels, ipixels))).astype(numpy.float32)
+        data[rng.random((ipixels, ipixels)) < 0.05] = numpy.nan
+        return data[numpy.newaxis], osgeo.gdal.GDT_Float32, numpy.nan
+    if szkind == "S2ndvistack":
+        lstbands = []
+        for iband in range(100):
+            band = (0.4 + 0.3*numpy.sin(6*xx + iband/20)*numpy.cos(4*yy) + 0.02*rng.standard_normal((ipixels, ipixels))).astype(numpy.float32)
+            if iband % 3 == 0: band[:] = numpy.nan
+            lstbands.append(band)
+        return numpy.stack(lstbands), osgeo.gdal.GDT_Float32, numpy.nan
+    raise ValueError(szkind)
+
+"""
+"""
+def _memdataset(data, datatype, nodata):
+    ibands, iysize, ixsize = data.shape
+    mem_ds = osgeo.gdal.GetDriverByName('MEM').Create('', ixsize, iysize, ibands, datatype)
+    mem_ds.SetGeoTransform([600000.0, 20.0, 0.0, 5700000.0, 0.0, -20.0])
+    srs = osgeo.osr.SpatialReference()
+    srs.ImportFromEPSG(32631)
+    mem_ds.SetProjection(srs.ExportToWkt())
+    for iband in range(ibands):
+        mem_ds.GetRasterBand(iband+1).WriteArray(data[iband])
+    mem_ds.GetRasterBand(1).SetNoDataValue(float(nodata))
+    return mem_ds
+
+"""
+"""
+def _benchmark(szkind, ipixels, szprofile, szworkdir, rng):
+    """
+    returns (average bytes per file, average read milliseconds per file)
+    """
+    lstszfilenames = []
+    for ifile in range(NUMBEROFFILES):
+        data, datatype, nodata = _syntheticdata(szkind, ipixels, rng)
+        mem_ds     = _memdataset(data, datatype, nodata)
+        szfilename = os.path.join(szworkdir, f"{szkind}_{ipixels}_{szprofile}_{ifile}.tif")
+        if szprofile == "NONE":
+            osgeo.gdal.GetDriverByName('GTiff').CreateCopy(szfilename, mem_ds)  # server zip layout
+        else:
+            geetiff.writeprofiled(mem_ds, szfilename, szprofile)
+        mem_ds = None
+        lstszfilenames.append(szfilename)
+
+    ibytes = sum(os.path.getsize(szfilename) for szfilename in lstszfilenames)
+
+    starttime = time.perf_counter()
+    for szfilename in lstszfilenames:
+        ds = osgeo.gdal.Open(szfilename)
+        ds.ReadAsArray()
+        ds = None
+    readseconds = time.perf_counter() - starttime
+
+    for szfilename in lstszfilenames: os.remove(szfilename)
+    return ibytes / NUMBEROFFILES, 1000 * readseconds / NUMBEROFFILES
+
+"""
+"""
+def main():
+    osgeo.gdal.UseExceptions()
+    rng = numpy.random.default_rng(1234)
+    with tempfile.TemporaryDirectory() as szworkdir:
+        print(f"{'product':>12} {'patch':>8} {'profile':>8} {'bytes':>10} {'read ms':>8}")
+        for szkind in ["S2scl", "S2mask", "S2ndvi", "S2ndvistack"]:
+            for ipixels in [64, 128]:
+                for szprofile in ["NONE"] + geetiff.OUTPUTPROFILES:
+                    try:
+                        fbytes, freadms = _benchmark(szkind, ipixels, szprofile, szworkdir, rng)
+                        print(f"{szkind:>12} {ipixels:>4}x{ipixels:<3} {szprofile:>8} {fbytes:>10.0f} {freadms:>8.3f}")
+                    except Exception as e:
+                        print(f"{szkind:>12} {ipixels:>4}x{ipixels:<3} {szprofile:>8} failed: {str(e)}")
+
+
+"""
+"""
+if __name__ == '__main__':
+    print('starting main')
+    main()
+    print('finishing main')
@@ -4,6 +4,7 @@ if not ee.data._credentials: ee.Initialize()
 import geeproduct
 import geeexport
 import geeutils
+import geecache
 
 import os
 import numpy
@@ -18,14 +19,16 @@ IAMRUNNINGONTHEMEP = False
 #
 #
 #
-def docompare(eepoint, eedatefrom, eedatetill, szoutputdir, verbose=False):
+def docompare(eepoint, eedatefrom, eedatetill, szoutputdir, cache=None, verbose=False):
     """
+    :param cache: optional geecache.GEEDownloadCache - re-running with other mask parameters only re-fetches the masks
     """
     #
     # in case szoutputdir has been specified - it must exist
     #
     if szoutputdir:
         if not os.path.isdir(szoutputdir) : raise ValueError(f"invalid szoutputdir ({str(szoutputdir)})")
+    exporter          = geeexport.GEEExp(cache=cache)
     #
     #
     #
@@ -82,11 +85,11 @@ def docompare(eepoint, eedatefrom, eedatetill, szoutputdir, verbose=False):
         s2sclcollection =  s2scl.getcollection(eedatefrom, eedatetill, eepoint, refcolpix,                       verbose=verbose)
         s2rgbcollection =  s2rgb.getcollection (eedatefrom, eedatetill, eepoint, refcolpix*2, refcol, refcolpix, verbose=verbose)
 
-        geeexport.GEEExp().exportimages(s2sclcollection,    szoutputdir, szfilenameprefix="",           verbose=verbose)
-        geeexport.GEEExp().exportimages(s2rgbcollection,    szoutputdir, szfilenameprefix="",           verbose=verbose)
-        geeexport.GEEExp().exportimages(s2ndvicollection,   szoutputdir, szfilenameprefix="",           verbose=verbose)
-        geeexport.GEEExp().exportimages(keepsnowcollection, szoutputdir, szfilenameprefix="keep_snow_", verbose=verbose)
-        geeexport.GEEExp().exportimages(masksnowcollection, szoutputdir, szfilenameprefix="mask_snow_", verbose=verbose)
+        exporter.exportimages(s2sclcollection,    szoutputdir, szfilenameprefix="",           verbose=verbose)
+        exporter.exportimages(s2rgbcollection,    szoutputdir, szfilenameprefix="",           verbose=verbose)
+        exporter.exportimages(s2ndvicollection,   szoutputdir, szfilenameprefix="",           verbose=verbose)
+        exporter.exportimages(keepsnowcollection, szoutputdir, szfilenameprefix="keep_snow_", verbose=verbose)
+        exporter.exportimages(masksnowcollection, szoutputdir, szfilenameprefix="mask_snow_", verbose=verbose)
 
     #
     # assign the masks to the product - add the masked product as bands
@@ -114,7 +117,7 @@ def docompare(eepoint, eedatefrom, eedatetill, szoutputdir, verbose=False):
     # in case szoutputdir has been specified - and exists - we'll the masked tiff's too
     #        
     if szoutputdir:
-        geeexport.GEEExp().exportimages(
+        exporter.exportimages(
             s2ndvicollection.select(['NDVI_MASKED_MASKSNOW', 'NDVI_MASKED_KEEPSNOW']), 
             szoutputdir, szfilenameprefix='', verbose=verbose)
     #
@@ -210,6 +213,13 @@ def main():
     #
     #
     #
+    cache          = None
+    if False:
+        szcachedir = r"/vitodata/CropSAR/tmp/dominique/gee/cache" if IAMRUNNINGONTHEMEP else r"C:\tmp\geecache"
+        cache      = geecache.GEEDownloadCache(szcachedir)
+    #
+    #
+    #
     lsteepoints = [
         geeutils.bobspoint,
         geeutils.tapspoint,
@@ -237,7 +247,8 @@ def main():
         #
         #    get some work done.
         #
-        docompare(eepoint, eedatefrom, eedatetill, szoutputdir, verbose=verbose)
+        docompare(eepoint, eedatefrom, eedatetill, szoutputdir, cache=cache, verbose=verbose)
+    if cache is not None: print(f"download cache: {cache.stats()}")
 
 
 """
@@ -10,6 +10,11 @@ import ee
 import geeutils
 import geeproduct
 import geeexport
+import geetransport
+import geemanifest
+import geecube
+import geecache
+import geegrid
 
 
 
@@ -24,12 +29,69 @@ IAMRUNNINGONTHEMEP = False
 #
 EXPORTABLEPRODUCTS = ["S2ndvi", "S2ndvi_he", "S2fapar", "S2fapar_he", "S2tcirgb",
                       "S2scl", "S2sclsimplemask", "S2sclconvmask", "S2sclcombimask", "S2sclstaticsmask", "S2sclclassfractions",
-                      "S2cloudlessmask",
+                      "S2cloudlessmask", "S2multimask",
                       "S1sigma0",  "S1gamma0",  "S1rvi",
                       "S1Asigma0", "S1Agamma0", "S1Arvi",
                       "S1Bsigma0", "S1Bgamma0", "S1Brvi",
                       "PV333ndvi", "PV333ndvi_he", "PV333sm", "PV333smsimplemask", "PV333rgb"]
 #
+#    product registry - per exportable product, the collections it consists of (typically one), each declared by
+#    - 'geecol' : source - geeproduct.GEECol class name
+#    - 'kwargs' : derivation - constructor arguments (optional)
+#    - 'filter' : collection filter passed as colfilter: "s2f" (S2sclcppfilter) or "pvf" (PV333smfilter) (optional)
+#    - 'pixels' : reprojection type - roi diameter class: "s2_10m", "s2_20m", "s1_10m" or "pv333m" (see GEEExporter._pixels)
+#    products sharing upstream collections (e.g. the SCL mosaic of S2scl and the S2scl masks) are planned on a common
+#    geeproduct.GEEUpstream memo per point, hence these are built once (see GEEExporter._plan)
+#
+PRODUCTREGISTRY = {
+    #
+    #    S2
+    #
+    "S2ndvi"              : [{'geecol': "GEECol_s2ndvi",             'filter': "s2f", 'pixels': "s2_10m"}],
+    "S2ndvi_he"           : [{'geecol': "GEECol_s2ndvi_he",          'filter': "s2f", 'pixels': "s2_10m"}],
+    "S2fapar"             : [{'geecol': "GEECol_s2fapar",            'filter': "s2f", 'pixels': "s2_10m"}],
+    "S2fapar_he"          : [{'geecol': "GEECol_s2fapar_he",         'filter': "s2f", 'pixels': "s2_10m"}],
+    "S2tcirgb"            : [{'geecol': "GEECol_s2rgb",              'filter': "s2f", 'pixels': "s2_10m"}],
+
+    "S2scl"               : [{'geecol': "GEECol_s2scl",              'filter': "s2f", 'pixels': "s2_20m"}],
+    "S2sclsimplemask"     : [{'geecol': "GEECol_s2sclsimplemask",    'filter': "s2f", 'pixels': "s2_20m"}],
+    "S2sclconvmask"       : [{'geecol': "GEECol_s2sclconvmask",      'filter': "s2f", 'pixels': "s2_20m"}],
+    "S2sclcombimask"      : [{'geecol': "GEECol_s2sclcombimask",     'filter': "s2f", 'pixels': "s2_20m"}],
+    "S2sclstaticsmask"    : [{'geecol': "GEECol_s2sclstaticsmask",   'kwargs': {'threshold': 98,  'thresholdunits': "percentile"}, 'pixels': "s2_20m"},
+                             {'geecol': "GEECol_s2sclstaticsmask",   'kwargs': {'threshold': 2.0, 'thresholdunits': "sigma"},      'pixels': "s2_20m"}],
+    "S2sclclassfractions" : [{'geecol': "GEECol_s2sclclassfractions",                 'pixels': "s2_20m"}],
+
+    "S2cloudlessmask"     : [{'geecol': "GEECol_s2cloudlessmask",    'filter': "s2f", 'pixels': "s2_20m"}],
+    "S2multimask"         : [{'geecol': "GEECol_s2multimask",        'filter': "s2f", 'pixels': "s2_20m"}],
+    #
+    #    S1 - all S1 platforms
+    #
+    "S1sigma0"            : [{'geecol': "GEECol_s1sigma0multi",                       'pixels': "s1_10m"}],
+    "S1gamma0"            : [{'geecol': "GEECol_s1gamma0multi",                       'pixels': "s1_10m"}],
+    "S1rvi"               : [{'geecol': "GEECol_s1rvi",              'kwargs': {'szorbitpass': 'ASC'},                          'pixels': "s1_10m"},
+                             {'geecol': "GEECol_s1rvi",              'kwargs': {'szorbitpass': 'DES'},                          'pixels': "s1_10m"}],
+    #
+    #    S1 - S1A and S1B separate
+    #
+    "S1Asigma0"           : [{'geecol': "GEECol_s1sigma0multi",      'kwargs': {'szplatformnumber': 'A'},                       'pixels': "s1_10m"}],
+    "S1Bsigma0"           : [{'geecol': "GEECol_s1sigma0multi",      'kwargs': {'szplatformnumber': 'B'},                       'pixels': "s1_10m"}],
+    "S1Agamma0"           : [{'geecol': "GEECol_s1gamma0multi",      'kwargs': {'szplatformnumber': 'A'},                       'pixels': "s1_10m"}],
+    "S1Bgamma0"           : [{'geecol': "GEECol_s1gamma0multi",      'kwargs': {'szplatformnumber': 'B'},                       'pixels': "s1_10m"}],
+    "S1Arvi"              : [{'geecol': "GEECol_s1rvi",              'kwargs': {'szorbitpass': 'ASC', 'szplatformnumber': 'A'}, 'pixels': "s1_10m"},
+                             {'geecol': "GEECol_s1rvi",              'kwargs': {'szorbitpass': 'DES', 'szplatformnumber': 'A'}, 'pixels': "s1_10m"}],
+    "S1Brvi"              : [{'geecol': "GEECol_s1rvi",              'kwargs': {'szorbitpass': 'ASC', 'szplatformnumber': 'B'}, 'pixels': "s1_10m"},
+                             {'geecol': "GEECol_s1rvi",              'kwargs': {'szorbitpass': 'DES', 'szplatformnumber': 'B'}, 'pixels': "s1_10m"}],
+    #
+    #    misc
+    #
+    "PV333ndvi"           : [{'geecol': "GEECol_pv333ndvi",          'filter': "pvf", 'pixels': "pv333m"}],
+    "PV333ndvi_he"        : [{'geecol': "GEECol_pv333ndvi_he",       'filter': "pvf", 'pixels': "pv333m"}],
+    "PV333sm"             : [{'geecol': "GEECol_pv333sm",            'filter': "pvf", 'pixels': "pv333m"}],
+    "PV333smsimplemask"   : [{'geecol': "GEECol_pv333simplemask",    'filter': "pvf", 'pixels': "pv333m"}],
+    "PV333rgb"            : [{'geecol': "GEECol_pv333rgb",           'filter': "pvf", 'pixels': "pv333m"}],
+}
+assert set(PRODUCTREGISTRY) == set(EXPORTABLEPRODUCTS), "product registry out of sync with EXPORTABLEPRODUCTS"
+#
 #    available methods
 #
 EXPORTMETHODS = ["exportimages", "exportimagestack", "exportimagestodrive", "exportimagestacktodrive"]
@@ -76,19 +138,127 @@ class GEEExporter():
     #
     #
     #
-    def __init__(self, *szproducts, pulse=None):
+    def __init__(self, *szproducts, pulse=None, maxconcurrentdownloads=1, outputprofile=None, szcachedir=None, cachemaxbytes=geecache.CACHE_MAXBYTES, bypasscache=False, minvalidpct=None, hedgepercentile=None,
+                 transferencoding=None, transferdecode=True, cachecoveragetags=True):
         """
         e.g. exporter = GEEExporter("S2ndvi", "S1sigma0")
+        e.g. exporter = GEEExporter("S2ndvi", "S1sigma0", maxconcurrentdownloads=4, outputprofile="COG")
+        e.g. exporter = GEEExporter("S2ndvi", "S1sigma0", szcachedir=r"C:\tmp\geecache") # local download cache for repeated runs
+        e.g. exporter = GEEExporter("S2ndvi", "S1sigma0", minvalidpct=1)                  # skip dates without (1%) valid pixels
+        e.g. exporter = GEEExporter("S2ndvi", "S1sigma0", hedgepercentile=95)             # duplicate downloads slower than 95% of the recent ones
+        e.g. exporter = GEEExporter("S2ndvi", "S1sigma0", transferencoding="INT16")       # float products downloaded as scaled int16
+        e.g. exporter = GEEExporter("S2ndvi", "S1sigma0", cachecoveragetags=False)        # collection filters aggregate every image, every time
+
+        the exporter owns a transport (threads, keep-alive sessions): close() it when done, or use it as context manager
+        e.g. with GEEExporter("S2ndvi", "S1sigma0", hedgepercentile=95) as exporter: exporter.exportimages(...)
+        """
+        self.szproducts             = GEEExporter.saneproducts(*szproducts)
+        self.pulse                  = pulse
+        self.maxconcurrentdownloads = maxconcurrentdownloads
+        #
+        #    hedged downloads run the original and its duplicate in the transports' own threads: two per concurrent download
+        #
+        self.transport              = geetransport.GEETransport(chunksize=geeexport.DOWNLOAD_CHUNKSIZE, spoolsize=geeexport.DOWNLOAD_SPOOLSIZE, hedgepercentile=hedgepercentile,
+                                                                hedgeworkers=2*max(1, int(maxconcurrentdownloads)))
+        self.taskscheduler          = geeexport.GEETaskScheduler()
+        self.outputprofile          = outputprofile
+        self.minvalidpct            = minvalidpct
+        self.transferencoding       = transferencoding
+        self.transferdecode         = transferdecode
+        self.cache                  = geecache.GEEDownloadCache(szcachedir, maxbytes=cachemaxbytes, bypass=bypasscache) if szcachedir is not None else None
+        self._lastrefcontext        = None
+        #
+        #    coverage tags of the collection filters: in memory, and next to the download cache (if any) for later runs
+        #
+        self.tagcache               = geecache.GEECoverageTagCache(szcachedir) if cachecoveragetags else None
+        #
+        #    filters shared over all products and points: their instances identify the upstream collections (geeproduct.GEEUpstream)
+        #
+        self._colfilters            = {
+            "s2f" : geeproduct.S2sclcppfilter(tagcache=self.tagcache), # using default configuration: s2sclclassesarray=[8,9,10], thresholdpct=-95
+            "pvf" : geeproduct.PV333smfilter(tagcache=self.tagcache)}  # using default configuration: classesarray=[112, 120, 240, 248], thresholdpct=5
+    #
+    #
+    #
+    def close(self):
+        """
+        release the transport (hedge threads, keep-alive sessions) - the exporter is not to be used afterwards
+        """
+        self.transport.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+    #
+    #
+    #
+    def _refcontext(self, refcol, eedatefrom, eedatetill, eepoint, refcolpix, refgridstore=None):
         """
-        self.szproducts = GEEExporter.saneproducts(*szproducts)
-        self.pulse      = pulse
+        geeproduct.GEERefContext for the point and period
+        - the last one is kept: products are exported point by point, possibly product by product (usemanifest)
+        - identified client side, via the serialized point and dates, and the grid store file (if any)
+        - refgridstore (optional): geegrid.GEERefGridStore of the patch, reusing the grid of earlier runs
+        """
+        szkey = (str(type(refcol).__name__) + ee.List([ee.Date(eedatefrom), ee.Date(eedatetill), eepoint, refcolpix]).serialize()
+                 + str(refgridstore.szrefgridfile if refgridstore is not None else None))
+        if self._lastrefcontext is None or self._lastrefcontext[0] != szkey:
+            self._lastrefcontext = (szkey, geeproduct.GEERefContext(refcol, eedatefrom, eedatetill, eepoint, refcolpix, refgridstore=refgridstore), geeproduct.GEEUpstream())
+        return self._lastrefcontext[1]
     #
     #
     #
-    def _getgeecollections(self, eedatefrom, eedatetill, eepoint, verbose=False):
+    @staticmethod
+    def _pixels(refcolpix):
         """
-        generator yielding collections for specified products
+        roi diameters per reprojection type (PRODUCTREGISTRY 'pixels') - heuristics, relative to the reference collection (S2 20m) diameter
+        """
+        s2_20m_pix = refcolpix
+        return {
+            "s2_20m" : s2_20m_pix,
+            "s2_10m" : 2 * s2_20m_pix,
+            "s1_10m" : 2 * s2_20m_pix,
+            "pv333m" : int(s2_20m_pix*20/333) + 2}
+    #
+    #
+    #
+    def _plan(self, szproducts, upstream=None):
+        """
+        plan the collections for the products (PRODUCTREGISTRY), in registry order
+        returns list of (szproduct, GEECol instance, pixels class) - the GEECol instances share the upstream memo (if any)
+        """
+        lstplan = []
+        for szproduct, lstdeclarations in PRODUCTREGISTRY.items():
+            if szproduct not in szproducts: continue
+            for declaration in lstdeclarations:
+                kwargs = dict(declaration.get('kwargs', {}))
+                if declaration.get('filter') is not None: kwargs['colfilter'] = self._colfilters[declaration['filter']]
+                geecol = getattr(geeproduct, declaration['geecol'])(**kwargs)
+                geecol.upstream = upstream
+                lstplan.append((szproduct, geecol, declaration['pixels']))
+        return lstplan
+    #
+    #
+    #
+    def _geeexp(self):
         """
+        exporter instance configured with the GEEExporter settings
+        - sharing the transport (and its keep-alive sessions) over all exports
+        - sharing the task scheduler (and its view on the task queue) over all toDrive exports
+        - sharing the download cache (if any) and its statistics
+        """
+        return geeexport.GEEExp(maxconcurrentdownloads=self.maxconcurrentdownloads, transport=self.transport, taskscheduler=self.taskscheduler, outputprofile=self.outputprofile, cache=self.cache, minvalidpct=self.minvalidpct,
+                                transferencoding=self.transferencoding, transferdecode=self.transferdecode)
+    #
+    #
+    #
+    def _getgeecollections(self, eedatefrom, eedatetill, eepoint, szproducts=None, refgridstore=None, verbose=False):
+        """
+        generator yielding collections for specified products (default: all products of this exporter)
+        """
+        if szproducts is None: szproducts = self.szproducts
         #
         #    using sentinel 2 20m as reference
         #
@@ -100,116 +270,85 @@ class GEEExporter():
         #
         #    heuristics for other products
         #
-        s2_20m_pix  = refcolpix
-        s2_10m_pix  = 2 * s2_20m_pix
-        s1_10m_pix  = s2_10m_pix
-        pv333m_pix = int(s2_20m_pix*20/333) + 2
+        pixels    = self._pixels(refcolpix)
         #
-        #    filter for sentinel 2 and probaV 333m products
+        #    reference context (reference image, roi) - evaluated once, shared over all products of the point
+        #    as is the upstream memo: upstream collections shared by several products are built once per point
         #
-        s2f = geeproduct.S2sclcppfilter() # using default configuration: s2sclclassesarray=[8,9,10], thresholdpct=-95
-        pvf = geeproduct.PV333smfilter()  # using default configuration: classesarray=[112, 120, 240, 248], thresholdpct=5
+        refcontext = self._refcontext(refcol, eedatefrom, eedatetill, eepoint, refcolpix, refgridstore=refgridstore)
+        upstream   = self._lastrefcontext[2]
         #
         #    generator
         #
-        
-        #
-        #    S2
-        #
-        if "S2ndvi"              in self.szproducts: yield geeproduct.GEECol_s2ndvi(colfilter=s2f).getcollection(             eedatefrom, eedatetill, eepoint, s2_10m_pix, refcol, refcolpix, verbose=verbose)
-        if "S2ndvi_he"           in self.szproducts: yield geeproduct.GEECol_s2ndvi_he(colfilter=s2f).getcollection(          eedatefrom, eedatetill, eepoint, s2_10m_pix, refcol, refcolpix, verbose=verbose)
-        if "S2fapar"             in self.szproducts: yield geeproduct.GEECol_s2fapar(colfilter=s2f).getcollection(            eedatefrom, eedatetill, eepoint, s2_10m_pix, refcol, refcolpix, verbose=verbose)
-        if "S2fapar_he"          in self.szproducts: yield geeproduct.GEECol_s2fapar_he(colfilter=s2f).getcollection(         eedatefrom, eedatetill, eepoint, s2_10m_pix, refcol, refcolpix, verbose=verbose)
-        if "S2tcirgb"            in self.szproducts: yield geeproduct.GEECol_s2rgb(colfilter=s2f).getcollection(              eedatefrom, eedatetill, eepoint, s2_10m_pix, refcol, refcolpix, verbose=verbose)
-
-        if "S2scl"               in self.szproducts: yield geeproduct.GEECol_s2scl(colfilter=s2f).getcollection(              eedatefrom, eedatetill, eepoint, s2_20m_pix, refcol, refcolpix, verbose=verbose)
-        if "S2sclsimplemask"     in self.szproducts: yield geeproduct.GEECol_s2sclsimplemask(colfilter=s2f).getcollection(    eedatefrom, eedatetill, eepoint, s2_20m_pix, refcol, refcolpix, verbose=verbose)
-        if "S2sclconvmask"       in self.szproducts: yield geeproduct.GEECol_s2sclconvmask(colfilter=s2f).getcollection(      eedatefrom, eedatetill, eepoint, s2_20m_pix, refcol, refcolpix, verbose=verbose)
-        if "S2sclcombimask"      in self.szproducts: yield geeproduct.GEECol_s2sclcombimask(colfilter=s2f).getcollection(     eedatefrom, eedatetill, eepoint, s2_20m_pix, refcol, refcolpix, verbose=verbose)
-#        if "S2sclstaticsmask"  in self.szproducts: yield geeproduct.GEECol_s2sclstaticsmask().getcollection(   eedatefrom, eedatetill, eepoint, s2_20m_pix, refcol, refcolpix, verbose=verbose)
-        if "S2sclstaticsmask"    in self.szproducts: 
-            yield geeproduct.GEECol_s2sclstaticsmask(threshold=98,   thresholdunits="percentile").getcollection(   eedatefrom, eedatetill, eepoint, s2_20m_pix, refcol, refcolpix, verbose=verbose)
-        if "S2sclstaticsmask"    in self.szproducts: 
-            yield geeproduct.GEECol_s2sclstaticsmask(threshold=2.0,  thresholdunits="sigma").getcollection(   eedatefrom, eedatetill, eepoint, s2_20m_pix, refcol, refcolpix, verbose=verbose)
-        if "S2sclclassfractions" in self.szproducts: yield geeproduct.GEECol_s2sclclassfractions().getcollection(    eedatefrom, eedatetill, eepoint, s2_20m_pix, refcol, refcolpix, verbose=verbose)
-
-        if "S2cloudlessmask"     in self.szproducts: yield geeproduct.GEECol_s2cloudlessmask(colfilter=s2f).getcollection(    eedatefrom, eedatetill, eepoint, s2_20m_pix, refcol, refcolpix, verbose=verbose)
-
-        #
-        #    S1 - all S1 platforms
-        #
-        if "S1sigma0"            in self.szproducts: yield geeproduct.GEECol_s1sigma0('VV', 'ASC').getcollection(eedatefrom, eedatetill, eepoint, s1_10m_pix, refcol, refcolpix, verbose=verbose)
-        if "S1sigma0"            in self.szproducts: yield geeproduct.GEECol_s1sigma0('VH', 'ASC').getcollection(eedatefrom, eedatetill, eepoint, s1_10m_pix, refcol, refcolpix, verbose=verbose)
-        if "S1sigma0"            in self.szproducts: yield geeproduct.GEECol_s1sigma0('VV', 'DES').getcollection(eedatefrom, eedatetill, eepoint, s1_10m_pix, refcol, refcolpix, verbose=verbose)
-        if "S1sigma0"            in self.szproducts: yield geeproduct.GEECol_s1sigma0('VH', 'DES').getcollection(eedatefrom, eedatetill, eepoint, s1_10m_pix, refcol, refcolpix, verbose=verbose)
-
-        if "S1gamma0"            in self.szproducts: yield geeproduct.GEECol_s1gamma0('VV', 'ASC').getcollection(eedatefrom, eedatetill, eepoint, s1_10m_pix, refcol, refcolpix, verbose=verbose)
-        if "S1gamma0"            in self.szproducts: yield geeproduct.GEECol_s1gamma0('VH', 'ASC').getcollection(eedatefrom, eedatetill, eepoint, s1_10m_pix, refcol, refcolpix, verbose=verbose)
-        if "S1gamma0"            in self.szproducts: yield geeproduct.GEECol_s1gamma0('VV', 'DES').getcollection(eedatefrom, eedatetill, eepoint, s1_10m_pix, refcol, refcolpix, verbose=verbose)
-        if "S1gamma0"            in self.szproducts: yield geeproduct.GEECol_s1gamma0('VH', 'DES').getcollection(eedatefrom, eedatetill, eepoint, s1_10m_pix, refcol, refcolpix, verbose=verbose)
-
-        if "S1rvi"               in self.szproducts: yield geeproduct.GEECol_s1rvi('ASC').getcollection(         eedatefrom, eedatetill, eepoint, s1_10m_pix, refcol, refcolpix, verbose=verbose)
-        if "S1rvi"               in self.szproducts: yield geeproduct.GEECol_s1rvi('DES').getcollection(         eedatefrom, eedatetill, eepoint, s1_10m_pix, refcol, refcolpix, verbose=verbose)
-        #
-        #    S1 - S1A and S1B separate
-        #
-        if "S1Asigma0"           in self.szproducts: yield geeproduct.GEECol_s1sigma0('VV', 'ASC', 'A').getcollection(eedatefrom, eedatetill, eepoint, s1_10m_pix, refcol, refcolpix, verbose=verbose)
-        if "S1Asigma0"           in self.szproducts: yield geeproduct.GEECol_s1sigma0('VH', 'ASC', 'A').getcollection(eedatefrom, eedatetill, eepoint, s1_10m_pix, refcol, refcolpix, verbose=verbose)
-        if "S1Asigma0"           in self.szproducts: yield geeproduct.GEECol_s1sigma0('VV', 'DES', 'A').getcollection(eedatefrom, eedatetill, eepoint, s1_10m_pix, refcol, refcolpix, verbose=verbose)
-        if "S1Asigma0"           in self.szproducts: yield geeproduct.GEECol_s1sigma0('VH', 'DES', 'A').getcollection(eedatefrom, eedatetill, eepoint, s1_10m_pix, refcol, refcolpix, verbose=verbose)
-        if "S1Bsigma0"           in self.szproducts: yield geeproduct.GEECol_s1sigma0('VV', 'ASC', 'B').getcollection(eedatefrom, eedatetill, eepoint, s1_10m_pix, refcol, refcolpix, verbose=verbose)
-        if "S1Bsigma0"           in self.szproducts: yield geeproduct.GEECol_s1sigma0('VH', 'ASC', 'B').getcollection(eedatefrom, eedatetill, eepoint, s1_10m_pix, refcol, refcolpix, verbose=verbose)
-        if "S1Bsigma0"           in self.szproducts: yield geeproduct.GEECol_s1sigma0('VV', 'DES', 'B').getcollection(eedatefrom, eedatetill, eepoint, s1_10m_pix, refcol, refcolpix, verbose=verbose)
-        if "S1Bsigma0"           in self.szproducts: yield geeproduct.GEECol_s1sigma0('VH', 'DES', 'B').getcollection(eedatefrom, eedatetill, eepoint, s1_10m_pix, refcol, refcolpix, verbose=verbose)
-
-        if "S1Agamma0"            in self.szproducts: yield geeproduct.GEECol_s1gamma0('VV', 'ASC', 'A').getcollection(eedatefrom, eedatetill, eepoint, s1_10m_pix, refcol, refcolpix, verbose=verbose)
-        if "S1Agamma0"            in self.szproducts: yield geeproduct.GEECol_s1gamma0('VH', 'ASC', 'A').getcollection(eedatefrom, eedatetill, eepoint, s1_10m_pix, refcol, refcolpix, verbose=verbose)
-        if "S1Agamma0"            in self.szproducts: yield geeproduct.GEECol_s1gamma0('VV', 'DES', 'A').getcollection(eedatefrom, eedatetill, eepoint, s1_10m_pix, refcol, refcolpix, verbose=verbose)
-        if "S1Agamma0"            in self.szproducts: yield geeproduct.GEECol_s1gamma0('VH', 'DES', 'A').getcollection(eedatefrom, eedatetill, eepoint, s1_10m_pix, refcol, refcolpix, verbose=verbose)
-        if "S1Bgamma0"            in self.szproducts: yield geeproduct.GEECol_s1gamma0('VV', 'ASC', 'B').getcollection(eedatefrom, eedatetill, eepoint, s1_10m_pix, refcol, refcolpix, verbose=verbose)
-        if "S1Bgamma0"            in self.szproducts: yield geeproduct.GEECol_s1gamma0('VH', 'ASC', 'B').getcollection(eedatefrom, eedatetill, eepoint, s1_10m_pix, refcol, refcolpix, verbose=verbose)
-        if "S1Bgamma0"            in self.szproducts: yield geeproduct.GEECol_s1gamma0('VV', 'DES', 'B').getcollection(eedatefrom, eedatetill, eepoint, s1_10m_pix, refcol, refcolpix, verbose=verbose)
-        if "S1Bgamma0"            in self.szproducts: yield geeproduct.GEECol_s1gamma0('VH', 'DES', 'B').getcollection(eedatefrom, eedatetill, eepoint, s1_10m_pix, refcol, refcolpix, verbose=verbose)
-
-        if "S1Arvi"               in self.szproducts: yield geeproduct.GEECol_s1rvi('ASC', 'A').getcollection(         eedatefrom, eedatetill, eepoint, s1_10m_pix, refcol, refcolpix, verbose=verbose)
-        if "S1Arvi"               in self.szproducts: yield geeproduct.GEECol_s1rvi('DES', 'A').getcollection(         eedatefrom, eedatetill, eepoint, s1_10m_pix, refcol, refcolpix, verbose=verbose)
-        if "S1Brvi"               in self.szproducts: yield geeproduct.GEECol_s1rvi('ASC', 'B').getcollection(         eedatefrom, eedatetill, eepoint, s1_10m_pix, refcol, refcolpix, verbose=verbose)
-        if "S1Brvi"               in self.szproducts: yield geeproduct.GEECol_s1rvi('DES', 'B').getcollection(         eedatefrom, eedatetill, eepoint, s1_10m_pix, refcol, refcolpix, verbose=verbose)
-
-        #
-        #    misc
-        #
-        if "PV333ndvi"           in self.szproducts: yield geeproduct.GEECol_pv333ndvi(colfilter=pvf).getcollection(          eedatefrom, eedatetill, eepoint, pv333m_pix, refcol, refcolpix, verbose=verbose)
-        if "PV333ndvi_he"        in self.szproducts: yield geeproduct.GEECol_pv333ndvi_he(colfilter=pvf).getcollection(       eedatefrom, eedatetill, eepoint, pv333m_pix, refcol, refcolpix, verbose=verbose)
-        if "PV333sm"             in self.szproducts: yield geeproduct.GEECol_pv333sm(colfilter=pvf).getcollection(            eedatefrom, eedatetill, eepoint, pv333m_pix, refcol, refcolpix, verbose=verbose)
-        if "PV333smsimplemask"   in self.szproducts: yield geeproduct.GEECol_pv333simplemask(colfilter=pvf).getcollection(    eedatefrom, eedatetill, eepoint, pv333m_pix, refcol, refcolpix, verbose=verbose)
-        if "PV333rgb"            in self.szproducts: yield geeproduct.GEECol_pv333rgb(colfilter=pvf).getcollection(           eedatefrom, eedatetill, eepoint, pv333m_pix, refcol, refcolpix, verbose=verbose)     
+        for szproduct, geecol, szpixels in self._plan(szproducts, upstream=upstream):
+            if verbose: print(f"{str(type(self).__name__)}._getgeecollections - {szproduct}: {str(type(geecol).__name__)}")
+            yield geecol.getcollection(eedatefrom, eedatetill, eepoint, pixels[szpixels], refcontext=refcontext, verbose=verbose)
 
     #
     #    export methods
     #     
-    def exportimages(self, eepoint, eedatefrom, eedatetill, szoutputdir, szfilenameprefix="", verbose=False):
-        for geecollection in self._getgeecollections(eedatefrom, eedatetill, eepoint, verbose=verbose):
-            if geecollection:
-                geeexport.GEEExp().exportimages(geecollection, szoutputdir, szfilenameprefix=szfilenameprefix, verbose=verbose)
+    def exportimages(self, eepoint, eedatefrom, eedatetill, szoutputdir, szfilenameprefix="", usemanifest=False, usecube=False, stackproducts=False, userefgrid=False, verbose=False):
+        """
+        :param usemanifest: incremental export using the geemanifest.GEEManifest of szoutputdir:
+                            only dates not exported yet are downloaded, and products known to be empty in the period are skipped
+        :param usecube: export into the geecube.GEECube of szoutputdir (appending) iso separate files per date
+        :param stackproducts: export the products via geeexport.GEEExp.exportimagesmulti: products on the same grid 
+                              (e.g. S2scl and the S2 masks) share their downloads. resulting files are identical.
+        :param userefgrid: reference grid of the patch persisted in szoutputdir (geegrid.GEERefGridStore): looked up once, 
+                           reused by later runs (e.g. later years), keeping the patch pixel-identical over the years
+        """
+        cube         = geecube.GEECube(szoutputdir, verbose=verbose) if usecube else None
+        refgridstore = geegrid.GEERefGridStore(szoutputdir, verbose=verbose) if userefgrid else None
+        if not usemanifest and not stackproducts:
+            for geecollection in self._getgeecollections(eedatefrom, eedatetill, eepoint, refgridstore=refgridstore, verbose=verbose):
+                if geecollection:
+                    self._geeexp().exportimages(geecollection, szoutputdir, szfilenameprefix=szfilenameprefix, cube=cube, verbose=verbose)
+                if self.pulse: self.pulse.pulse()
+            return
+
+        manifest = geemanifest.GEEManifest(szoutputdir, verbose=verbose) if usemanifest else None
+        if manifest is not None:
+            szdatefrom, szdatetill = ee.List([ee.Date(eedatefrom).format('YYYY-MM-dd'), ee.Date(eedatetill).format('YYYY-MM-dd')]).getInfo()
+        lststackcollections = []
+        for szproduct in self.szproducts:
+            if manifest is not None and manifest.isempty(szproduct, szdatefrom, szdatetill):
+                if verbose: print(f"{str(type(self).__name__)}.exportimages - {szproduct} empty in [{szdatefrom}, {szdatetill}) - skipped (manifest)")
+                continue
+            bempty = True
+            for geecollection in self._getgeecollections(eedatefrom, eedatetill, eepoint, szproducts=[szproduct], refgridstore=refgridstore, verbose=verbose):
+                if geecollection:
+                    bempty = False
+                    if stackproducts:
+                        lststackcollections.append(geecollection)
+                    else:
+                        self._geeexp().exportimages(geecollection, szoutputdir, szfilenameprefix=szfilenameprefix, manifest=manifest, cube=cube, verbose=verbose)
+                if self.pulse: self.pulse.pulse()
+            if bempty and manifest is not None:
+                manifest.addempty(szproduct, szdatefrom, szdatetill)
+                manifest.save()
+        #
+        #    stacked: all collections at once
+        #
+        if lststackcollections:
+            self._geeexp().exportimagesmulti(lststackcollections, szoutputdir, szfilenameprefix=szfilenameprefix, manifest=manifest, cube=cube, verbose=verbose)
             if self.pulse: self.pulse.pulse()
  
     def exportimagestack(self, eepoint, eedatefrom, eedatetill, szoutputdir, szfilenameprefix="", verbose=False):
         for geecollection in self._getgeecollections(eedatefrom, eedatetill, eepoint, verbose=verbose):
             if geecollection:
-                geeexport.GEEExp().exportimagestack(geecollection, szoutputdir, szfilenameprefix=szfilenameprefix, verbose=verbose)
+                self._geeexp().exportimagestack(geecollection, szoutputdir, szfilenameprefix=szfilenameprefix, verbose=verbose)
             if self.pulse: self.pulse.pulse()
  
     def exportimagestodrive(self, eepoint, eedatefrom, eedatetill, szgdrivefolder, szfilenameprefix="", verbose=False):
         for geecollection in self._getgeecollections(eedatefrom, eedatetill, eepoint, verbose=verbose):
             if geecollection:
-                geeexport.GEEExp().exportimagestodrive(geecollection, szgdrivefolder, szfilenameprefix=szfilenameprefix, verbose=verbose)
+                self._geeexp().exportimagestodrive(geecollection, szgdrivefolder, szfilenameprefix=szfilenameprefix, verbose=verbose)
             if self.pulse: self.pulse.pulse()
          
     def exportimagestacktodrive(self, eepoint, eedatefrom, eedatetill, szgdrivefolder, szfilenameprefix="", verbose=False):
         for geecollection in self._getgeecollections(eedatefrom, eedatetill, eepoint, verbose=verbose):
             if geecollection:
-                geeexport.GEEExp().exportimagestacktodrive(geecollection, szgdrivefolder, szfilenameprefix=szfilenameprefix, verbose=verbose)
+                self._geeexp().exportimagestacktodrive(geecollection, szgdrivefolder, szfilenameprefix=szfilenameprefix, verbose=verbose)
             if self.pulse: self.pulse.pulse()
 
 
@@ -302,6 +441,7 @@ def export_point(lstszproducts, lstszmethods, szdatefrom, szdatetill, pointlon,
         #
         logging.info(f"{os.path.basename(__file__)[0:-3]} export field {szid} done - {int((datetime.datetime.now()-datetime_tick_all).total_seconds())} seconds")
         logging.getLogger().removeHandler(logfilehandler)
+        exporter.close()
 
 
 """
@@ -429,6 +569,7 @@ def export_shape(lstszproducts, lstszmethods, szyyyyyear, szshapefile, szoutputd
         #
         logging.info(f"{os.path.basename(__file__)[0:-3]} run ({icountparcels} of {numberofparcels}) parcels - {int( (datetime.datetime.now()-datetime_tick_all).total_seconds()/6/6)/100} hours")
         logging.getLogger().removeHandler(logfilehandler)
+        exporter.close()
 
 
 
@@ -670,9 +811,9 @@ def _export_random_points(lstszproducts, szyyyyyear, szoutputdir, itreepoints, p
             logging.info(f"    point: ( lon {szpointlon} lat {szpointlat} ) class( {landuseclass:3d} )")
 
             #
+            #    reference grid persisted in the point directory: revisiting the point (export_existing_points) reuses it
             #
-            #
-            exporter.exportimages(eepoint, eedatefrom, eedatetill, szfieldoutputdir, verbose=verbose)
+            exporter.exportimages(eepoint, eedatefrom, eedatetill, szfieldoutputdir, userefgrid=True, verbose=verbose)
 
     except Exception as e:
         #
@@ -689,6 +830,7 @@ def _export_random_points(lstszproducts, szyyyyyear, szoutputdir, itreepoints, p
         #
         logging.info(f"{os.path.basename(__file__)[0:-3]} exit - {int( (datetime.datetime.now()-datetime_tick_all).total_seconds()/6/6)/100} hours")
         logging.getLogger().removeHandler(logfilehandler)
+        exporter.close()
 
 """
 """
@@ -698,7 +840,7 @@ def demo_export_point():
     #
     testproducts = ["S2ndvi", "S2ndvi_he", "S2fapar", "S2fapar_he", "S2tcirgb",
                     "S2scl", "S2sclsimplemask", "S2sclconvmask", "S2sclcombimask", "S2sclstaticsmask", "S2sclclassfractions",
-                    "S2cloudlessmask",
+                    "S2cloudlessmask", "S2multimask",
                     "S1sigma0", "S1gamma0", "S1rvi",
                     "PV333ndvi", "PV333ndvi_he", "PV333sm", "PV333smsimplemask", "PV333rgb"]
     testproducts = ["S1sigma0"]
@@ -0,0 +1,269 @@
+"""
+content-addressed on-disk cache for the GEEExp local downloads (getDownloadURL zips)
+
+repeated runs (demos, updates of existing patches, experiments) download the same product/roi/date/scale chunks over and over.
+the cache keys each download by a hash of everything determining its content:
+- the serialized image expression (ee.ComputedObject.serialize - client side, no round trip)
+- region, scale and crs
+- the file name and file_per_band setting (which determine the names of the zip members)
+hence changing a parameter of one product (e.g. a mask) only changes the keys of that product.
+
+- the zips are stored as szcachedir/xx/<sha256>.zip (xx: first two hex digits - keeping directories small)
+- least recently used zips (by modification time - refreshed on each hit) are evicted once the cache exceeds maxbytes
+- hit/miss statistics via stats()
+- bypass=True: the cache is not consulted, but fresh downloads still refresh it
+
+GEECoverageTagCache - a small sibling - remembers the per-image class coverage percentages computed by the collection filters
+(geemask.SimpleFilter: two reduceRegion aggregations per image), keyed by source collection, band, class set, region and image id.
+in memory, and optionally on disk (szcachedir/COVERAGETAGSFILENAME), so repeated filtering of the same images over the same
+region - several products of a point, or later runs - only needs a cheap ee.Filter.inList on the image ids.
+"""
+import os
+import json
+import hashlib
+import shutil
+import logging
+import threading
+
+
+
+CACHE_MAXBYTES       = 10 * 1024 * 1024 * 1024
+COVERAGETAGSFILENAME = "geepatches.coveragetags.json"
+COVERAGETAGSVERSION  = 1
+
+
+"""
+"""
+class GEEDownloadCache(object):
+    """
+    e.g.
+        cache = GEEDownloadCache(r"C:\\tmp\\geecache", maxbytes=2*1024*1024*1024)
+        key   = cache.key(eeimage, "S2ndvi.tif", scale=10, crs=None, region=eeregion, file_per_band=True)
+        zipbuffer = cache.open(key)
+        if zipbuffer is None:
+            zipbuffer = ... download ...
+            cache.put(key, zipbuffer)
+    """
+    def __init__(self, szcachedir, maxbytes=CACHE_MAXBYTES, bypass=False, verbose=False):
+        if not os.path.isdir(szcachedir) : raise ValueError(f"invalid cache directory szcachedir ({str(szcachedir)})")
+        self.szcachedir = os.path.normpath(szcachedir)
+        self.maxbytes   = int(maxbytes)
+        self.bypass     = bypass
+        self._verbose   = verbose
+        self._lock      = threading.Lock()
+        self._hits      = 0
+        self._misses    = 0
+        self._puts      = 0
+        self._evictions = 0
+        #
+        #    index of the cached zips: key -> [size, last use]
+        #
+        self._index     = {}
+        for szsubdir in os.scandir(self.szcachedir):
+            if not szsubdir.is_dir(): continue
+            for direntry in os.scandir(szsubdir.path):
+                if not (direntry.is_file() and direntry.name.endswith(".zip")): continue
+                stat = direntry.stat()
+                self._index[direntry.name[:-4]] = [stat.st_size, stat.st_mtime]
+        self._bytes     = sum(entry[0] for entry in self._index.values())
+
+    """
+    """
+    @staticmethod
+    def _serialize(value):
+        import ee
+        if isinstance(value, ee.ComputedObject): return value.serialize()
+        return json.dumps(value, sort_keys=True, default=str)
+
+    """
+    """
+    def key(self, ee_object, filename, scale=None, crs=None, region=None, file_per_band=False):
+        """
+        content hash of a download request - client side only
+        """
+        szrequest = json.dumps({
+            'expression'   : self._serialize(ee_object),
+            'name'         : os.path.basename(filename),
+            'scale'        : self._serialize(scale),
+            'crs'          : self._serialize(crs),
+            'region'       : self._serialize(region),
+            'file_per_band': bool(file_per_band)}, sort_keys=True)
+        return hashlib.sha256(szrequest.encode('utf-8')).hexdigest()
+
+    """
+    """
+    def _filename(self, key):
+        return os.path.join(self.szcachedir, key[:2], f"{key}.zip")
+
+    """
+    """
+    def open(self, key):
+        """
+        returns the cached zip for key as an opened (binary) file object, or None (miss or bypass)
+        the caller is supposed to close it.
+        """
+        with self._lock:
+            if self.bypass or key not in self._index:
+                self._misses += 1
+                return None
+            szfilename = self._filename(key)
+            try:
+                fd = open(szfilename, "rb")
+                os.utime(szfilename)
+            except OSError:
+                #
+                #    removed behind our back (e.g. by another process sharing the cache directory)
+                #
+                self._bytes -= self._index.pop(key)[0]
+                self._misses += 1
+                return None
+            self._index[key][1] = os.path.getmtime(szfilename)
+            self._hits += 1
+        if self._verbose: print(f"{str(type(self).__name__)}.open - hit {key}")
+        return fd
+
+    """
+    """
+    def put(self, key, zipbuffer):
+        """
+        store the zip in zipbuffer (file object) under key - zipbuffer is positioned at its start afterwards
+        """
+        szfilename = self._filename(key)
+        sztmpfile  = f"{szfilename}.{threading.get_ident()}.tmp"
+        os.makedirs(os.path.dirname(szfilename), exist_ok=True)
+        zipbuffer.seek(0)
+        with open(sztmpfile, "wb") as fd:
+            shutil.copyfileobj(zipbuffer, fd, 1024*1024)
+        zipbuffer.seek(0)
+        os.replace(sztmpfile, szfilename)
+        isize = os.path.getsize(szfilename)
+        with self._lock:
+            if key in self._index: self._bytes -= self._index[key][0]
+            self._index[key] = [isize, os.path.getmtime(szfilename)]
+            self._bytes += isize
+            self._puts  += 1
+            self._evict()
+        if self._verbose: print(f"{str(type(self).__name__)}.put - {key} ({isize} bytes) - cache {self._bytes} bytes")
+
+    """
+    """
+    def _evict(self):
+        """
+        remove least recently used zips until the cache fits maxbytes (lock held by caller)
+        """
+        if self._bytes <= self.maxbytes: return
+        for key in sorted(self._index, key=lambda key: self._index[key][1]):
+            if self._bytes <= self.maxbytes: break
+            try:
+                os.remove(self._filename(key))
+            except OSError as e:
+                logging.warning(f"{str(type(self).__name__)}._evict - could not remove {key}: {str(e)}")
+                continue
+            self._bytes     -= self._index.pop(key)[0]
+            self._evictions += 1
+
+    """
+    """
+    def stats(self):
+        """
+        hit/miss statistics
+        """
+        with self._lock:
+            irequests = self._hits + self._misses
+            return {
+                'hits'      : self._hits,
+                'misses'    : self._misses,
+                'hitratio'  : (self._hits / irequests) if irequests else 0.0,
+                'puts'      : self._puts,
+                'evictions' : self._evictions,
+                'entries'   : len(self._index),
+                'bytes'     : self._bytes}
+
+
+"""
+"""
+class GEECoverageTagCache(object):
+    """
+    e.g.
+        tagcache = GEECoverageTagCache(r"C:\\tmp\\geecache")            # or GEECoverageTagCache() - in memory only
+        szkey    = tagcache.key('SCL', [8,9,10], eeregion, 'COPERNICUS/S2_SR')
+        dictpct  = tagcache.get(szkey, lstszids)                     # {szid: pct} for the known ids (pct None: no pixels in region)
+        ...
+        tagcache.put(szkey, {szid: pct, ...})
+    """
+    def __init__(self, szcachedir=None, verbose=False):
+        if (szcachedir is not None) and not os.path.isdir(szcachedir) : raise ValueError(f"invalid cache directory szcachedir ({str(szcachedir)})")
+        self.sztagsfile = os.path.join(os.path.normpath(szcachedir), COVERAGETAGSFILENAME) if szcachedir is not None else None
+        self._verbose   = verbose
+        self._lock      = threading.Lock()
+        self._hits      = 0
+        self._misses    = 0
+        self._tags      = {}
+        if (self.sztagsfile is not None) and os.path.isfile(self.sztagsfile):
+            try:
+                with open(self.sztagsfile, "r") as fd:
+                    tags = json.load(fd)
+                if tags.get("version") == COVERAGETAGSVERSION: self._tags = tags.get("tags", {})
+            except ValueError:
+                #
+                #    unreadable tags - start over: costs aggregations, not correctness
+                #
+                self._tags = {}
+            if self._verbose: print(f"{str(type(self).__name__)}: {self.sztagsfile}: {len(self._tags)} filter/region combinations")
+
+    """
+    """
+    @staticmethod
+    def key(szband, classesarray, eeregion, szcollection=None):
+        """
+        identifies band, class set and region - client side only - and the source collection ('system:id'), 
+        since image ids are only unique within a collection. None for collections without id (e.g. merged ones).
+        """
+        szrequest = json.dumps({
+            'collection' : szcollection,
+            'band'       : szband,
+            'classes'    : sorted(set(classesarray)),
+            'region'     : GEEDownloadCache._serialize(eeregion)}, sort_keys=True)
+        return hashlib.sha256(szrequest.encode('utf-8')).hexdigest()
+
+    """
+    """
+    def get(self, szkey, lstszids):
+        """
+        known coverage percentages for the image ids: {szid: pct} - ids not in the result are yet to be computed
+        """
+        with self._lock:
+            tags    = self._tags.get(szkey, {})
+            dictpct = {szid: tags[szid] for szid in lstszids if szid in tags}
+            self._hits   += len(dictpct)
+            self._misses += len(lstszids) - len(dictpct)
+        if self._verbose: print(f"{str(type(self).__name__)}.get - {szkey[:8]}: {len(dictpct)} of {len(lstszids)} images known")
+        return dictpct
+
+    """
+    """
+    def put(self, szkey, dictpct):
+        """
+        register computed coverage percentages {szid: pct} - saved immediately (if on disk)
+        """
+        with self._lock:
+            self._tags.setdefault(szkey, {}).update(dictpct)
+            if self.sztagsfile is None: return
+            sztmpfile = f"{self.sztagsfile}.{threading.get_ident()}.tmp"
+            with open(sztmpfile, "w") as fd:
+                json.dump({"version": COVERAGETAGSVERSION, "tags": self._tags}, fd)
+            os.replace(sztmpfile, self.sztagsfile)
+
+    """
+    """
+    def stats(self):
+        """
+        hit/miss statistics (in images)
+        """
+        with self._lock:
+            irequests = self._hits + self._misses
+            return {
+                'hits'      : self._hits,
+                'misses'    : self._misses,
+                'hitratio'  : (self._hits / irequests) if irequests else 0.0,
+                'entries'   : sum(len(tags) for tags in self._tags.values())}
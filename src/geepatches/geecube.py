@@ -0,0 +1,156 @@
+"""
+per-patch datacubes as an alternative export target for GEEExp.exportimages
+
+exporting one file per date per product (szdescription.YYYY-MM-DD.tif) results in hundreds of files per patch-year,
+and millions of inodes over the archive. a patch directory can hold a single (zarr) cube instead:
+
+    Lonxxxx.xxxxxxxx_Latyyyy.yyyyyyyy - geepatches.zarr - S2ndvi           (dates, bands, y, x)
+                                                        - S1gamma0_VV_ASC  (dates, bands, y, x)
+                                                        - ...
+
+- one array per file description (as in the filenames, hence including the optional filename prefix)
+- chunked CUBEDATECHUNK dates at a time over the full patch: a patch-year of a product is a handful of chunk files
+- the array attributes hold the dates (along axis 0, in order of appending), band names, geotransform, projection (wkt) and nodata
+- append mode: dates already in the cube are skipped, new dates (e.g. a new year) are appended
+
+zarr is an optional dependency - it is only imported when a cube is actually used.
+"""
+import os
+import math
+import threading
+
+
+
+CUBEDIRNAME   = "geepatches.zarr"
+CUBEDATECHUNK = 32
+
+
+"""
+"""
+class GEECube(object):
+    """
+    e.g.
+        cube = GEECube(szpatchdir)
+        cube.append("S2ndvi", ["2020-01-05", "2020-01-10"], data, geotransform, projection, nodata=math.nan)
+        lstszdates, data = cube.read("S2ndvi")
+    """
+    def __init__(self, szpatchdir, verbose=False):
+        try:
+            import zarr
+        except ImportError:
+            raise ImportError("GEECube requires the zarr package (pip install zarr)")
+        if not os.path.isdir(szpatchdir) : raise ValueError(f"invalid patch directory szpatchdir ({str(szpatchdir)})")
+        self.szcubepath = os.path.join(os.path.normpath(szpatchdir), CUBEDIRNAME)
+        self._verbose   = verbose
+        self._lock      = threading.Lock()
+        self._group     = zarr.open_group(self.szcubepath, mode='a')
+
+    """
+    """
+    def descriptions(self):
+        """
+        file descriptions (products) present in the cube
+        """
+        with self._lock:
+            return sorted(self._group.array_keys())
+
+    """
+    """
+    def dates(self, szdescription):
+        """
+        dates present in the cube for the file description (order of appending - as along axis 0)
+        """
+        with self._lock:
+            if szdescription not in self._group: return []
+            return list(self._group[szdescription].attrs.get('dates', []))
+
+    """
+    """
+    def _createarray(self, szdescription, ibands, iysize, ixsize, dtype, nodata):
+        #
+        #    zarr 3 renamed create_dataset to create_array
+        #
+        create = getattr(self._group, 'create_array', None) or self._group.create_dataset
+        ifillvalue = nodata if nodata is not None else 0
+        return create(szdescription, shape=(0, ibands, iysize, ixsize), chunks=(CUBEDATECHUNK, ibands, iysize, ixsize), dtype=dtype, fill_value=ifillvalue)
+
+    """
+    """
+    def append(self, szdescription, lstszdates, data, geotransform, projection, nodata=None, lstbandnames=None):
+        """
+        append data (numpy array (dates, bands, y, x) or (dates, y, x)) for lstszdates to the file description
+        - dates already present are skipped
+        - the patch geometry (shape, geotransform, projection) must match the existing array
+        returns the number of dates appended
+        """
+        import numpy
+
+        data = numpy.asarray(data)
+        if data.ndim == 3: data = data[:, numpy.newaxis, :, :]
+        if data.ndim != 4 or data.shape[0] != len(lstszdates):
+            raise ValueError(f"expected data of shape ({len(lstszdates)}, bands, y, x) - found {data.shape}")
+
+        with self._lock:
+            if szdescription not in self._group:
+                array = self._createarray(szdescription, data.shape[1], data.shape[2], data.shape[3], data.dtype, nodata)
+                array.attrs['dates']        = []
+                array.attrs['bandnames']    = list(lstbandnames) if lstbandnames is not None else []
+                array.attrs['geotransform'] = list(geotransform)
+                array.attrs['projection']   = projection
+                array.attrs['nodata']       = None if (nodata is None or math.isnan(nodata)) else float(nodata)
+                array.attrs['nodataisnan']  = bool(nodata is not None and math.isnan(nodata))
+            else:
+                array = self._group[szdescription]
+                if tuple(array.shape[1:]) != tuple(data.shape[1:]):
+                    raise ValueError(f"{szdescription}: data shape {data.shape[1:]} does not match cube shape {tuple(array.shape[1:])}")
+                if list(array.attrs.get('geotransform')) != list(geotransform) or array.attrs.get('projection') != projection:
+                    raise ValueError(f"{szdescription}: georeferencing does not match the cube")
+            #
+            #    append mode: skip dates present
+            #
+            lstszknown  = list(array.attrs.get('dates', []))
+            setknown    = set(lstszknown)
+            lstinew     = [iIdx for iIdx, szdate in enumerate(lstszdates) if szdate not in setknown]
+            if not lstinew: return 0
+
+            ioffset = array.shape[0]
+            array.resize((ioffset + len(lstinew),) + tuple(array.shape[1:]))
+            array[ioffset:ioffset + len(lstinew)] = data[lstinew]
+            array.attrs['dates'] = lstszknown + [lstszdates[iIdx] for iIdx in lstinew]
+
+        if self._verbose: print(f"{str(type(self).__name__)}.append - {szdescription}: {len(lstinew)} dates appended to {self.szcubepath}")
+        return len(lstinew)
+
+    """
+    """
+    def read(self, szdescription, lstszdates=None):
+        """
+        returns (lstszdates, numpy array (dates, bands, y, x)) for the file description, sorted by date
+        - lstszdates (optional) restricts the result to these dates (as far as present)
+        """
+        import numpy
+
+        with self._lock:
+            if szdescription not in self._group: raise KeyError(f"{szdescription} not in cube {self.szcubepath}")
+            array      = self._group[szdescription]
+            lstszknown = list(array.attrs.get('dates', []))
+            lstiidx    = sorted(range(len(lstszknown)), key=lambda iIdx: lstszknown[iIdx])
+            if lstszdates is not None:
+                setwanted = set(lstszdates)
+                lstiidx   = [iIdx for iIdx in lstiidx if lstszknown[iIdx] in setwanted]
+            data = array[:] if lstiidx else numpy.empty((0,) + tuple(array.shape[1:]), dtype=array.dtype)
+        return [lstszknown[iIdx] for iIdx in lstiidx], data[lstiidx]
+
+    """
+    """
+    def attributes(self, szdescription):
+        """
+        georeferencing and nodata for the file description: dict with 'geotransform', 'projection', 'nodata', 'bandnames'
+        """
+        with self._lock:
+            attrs = self._group[szdescription].attrs
+            return {
+                'geotransform' : list(attrs.get('geotransform')),
+                'projection'   : attrs.get('projection'),
+                'nodata'       : math.nan if attrs.get('nodataisnan') else attrs.get('nodata'),
+                'bandnames'    : list(attrs.get('bandnames', []))}
@@ -4,10 +4,15 @@
 import ee
 import geemap
 import geeutils
+import geetransport
+import geetiff
+import geemanifest
 import os
 import time
 import math
 import logging
+import functools
+import threading
 
 
 
@@ -16,10 +21,13 @@ with ee.__version__(0.1.248):
 
 GEEExp.exportimages uses getDownloadURL.
 - the maximum number of bands in a file is 100 (otherwise we get: "Number of bands (xxx) must be less than or equal to 100.")
-- the maximum file size is 32MB. currently we do not check this: considering the 100 band limit, 
+- the maximum file size is 32MB. considering the 100 band limit, 
   and assumption we're working on small patches (typical <= 256 pixels roi diameter) this should be no problem:
   - sqrt( (32 x 1024 x 1024 bytes) / (100 bands x 4byte per pixel) ) = 288 pixels roi diameter maximum
   - and actually, error messages specify "Total request size (... bytes) must be less than or equal to 50331648 bytes." which is 48MB
+- nevertheless, the number of bands per download is computed from the patch dimensions and the band data type,
+  as the largest chunk staying within MAXBANDS_PERDOWNLOAD and MAXBYTES_PERDOWNLOAD (with a MAXBYTES_SAFETYFACTOR margin)
+  (see GEEExp.estimatedownloads). remark that the band limit still caps byte- and float-products alike.
 
 GEEExp.exportimagestodrive uses Export.image.toDrive, to export a multiband image, with bandnames YYYY-MM-dd
 - it is hard to find documentation about limitations; there are some questions in discussion groups, but no decent answers
@@ -29,8 +37,208 @@ GEEExp.exportimagestodrive uses Export.image.toDrive, to export a multiband imag
     - example: using YYYY-MM-dd we find we can export files with 416 bands correct. files with more bands loose their bandnames
 - for the time being we'll try using a 366 limit - so it should be possible to have one file per year
 """
-MAXBANDS_PERDOWNLOAD = 100
-MAXBANDS_PERTODRIVE  = 366
+MAXBANDS_PERDOWNLOAD  = 100
+MAXBYTES_PERDOWNLOAD  = 50331648
+MAXBYTES_SAFETYFACTOR = 0.9
+MAXBANDS_PERTODRIVE   = 366
+
+"""
+GEEExp local downloads never write the zip to disk:
+- the zip is buffered in a tempfile.SpooledTemporaryFile - in memory as long as it does not exceed DOWNLOAD_SPOOLSIZE
+- the member GeoTIFFs are written directly to their final names
+- the response is streamed in DOWNLOAD_CHUNKSIZE chunks (1KB chunks cost a lot of cpu on 30MB downloads)
+- http itself (keep-alive sessions, resume, verification, retries) is handled by geetransport.GEETransport
+"""
+DOWNLOAD_CHUNKSIZE   = 1024 * 1024
+DOWNLOAD_SPOOLSIZE   = 64 * 1024 * 1024
+
+"""
+GEEExp local downloads are retried per job (a single getDownloadURL request): JOB_ATTEMPTS attempts, with a fresh url each time
+and backoff JOB_BACKOFFSECONDS (doubling). completed jobs are recorded in a checkpoint (geemanifest.GEECheckpoint) in the output
+directory, hence retrying the export as a whole (or a new process after a crash) continues at the first incomplete job.
+the checkpoint is removed once the export completes.
+"""
+JOB_ATTEMPTS         = 4
+JOB_BACKOFFSECONDS   = 30
+
+"""
+GEEExp.exportarrays uses ee.data.computePixels with fileFormat NUMPY_NDARRAY
+- no zip, no GeoTIFF: pixels arrive as a numpy structured array (a field per band), on the exact grid of the patch
+- the NPY payload carries no mask: masked pixels of float products are filled with ARRAYS_FLOATNODATA server side,
+  and replaced by nan client side
+- the same request size limits are assumed as for getDownloadURL (chunks via GEEExp._imagesperdownload)
+"""
+ARRAYS_FLOATNODATA   = -3.0e38
+ARRAYS_OUTPUTFORMATS = ["NPZ", "GTIFF", "CUBE"]
+
+"""
+GEEExp exportimages/exportimagestack optional transfer encoding (transferencoding="INT16") for float products
+- float32 is 4 bytes per pixel per date and compresses poorly. products specifying a transfer scaling
+  (GEECol.transferscaling: 'gee_transferscale' and 'gee_transferoffset' collection properties) are converted server side to
+      encoded = round((value - offset) / scale)  clamped to [-32767, 32767] - masked pixels as TRANSFER_INT16NODATA
+  which halves the bytes per download, hence doubles the images fitting in a request (as far as MAXBANDS_PERDOWNLOAD allows)
+- locally, the files are decoded back to float32 (value = encoded * scale + offset, nodata as nan), or - transferdecode=False -
+  kept as int16, with the scale, offset and nodata in the GeoTIFF band metadata (gdal applies these e.g. via gdal_translate -unscale)
+- cubes are always decoded
+- collections without transfer scaling (byte products, 3-band collections) are exported as before
+"""
+TRANSFERENCODINGS    = ["INT16"]
+TRANSFER_INT16NODATA = -32768
+
+
+"""
+"""
+class GEETaskScheduler(object):
+    """
+    scheduler for ee.batch.Task-s (Export.image.toDrive), to be shared over exportimagestodrive/exportimagestacktodrive calls
+    - keeps a locally cached view of the queue occupancy (active tasks: READY, RUNNING, CANCEL_REQUESTED), 
+      refreshed via ee.batch.Task.list() every refreshseconds only - in between, submitted tasks are counted locally.
+      (listing all tasks before each submission makes submission O(n^2) on large batches)
+    - submits tasks via a token bucket (tokenspersecond, burst) as long as the occupancy is below maxactivetasks
+    - in case the queue is full, it sleeps fullqueuesleepseconds and refreshes
+    - the task listing is retried (attempts, backoffseconds) as task.start() is
+    - sleeps and task listings run without holding the lock: other submitters and throughput() are not blocked meanwhile
+    - reports throughput
+
+    the task api is only accessed via tasklister() and task.start(), task.state; 
+    clock and sleep can be replaced too, hence it can be exercised against a local stand-in. e.g.
+        class FakeTask():
+            def __init__(self): self.state = ee.batch.Task.State.UNSUBMITTED
+            def start(self)   : self.state = ee.batch.Task.State.READY
+        tasks     = []
+        scheduler = GEETaskScheduler(maxactivetasks=5, tasklister=lambda: tasks, sleep=lambda seconds: None)
+    """
+    def __init__(self, maxactivetasks=100, refreshseconds=60, tokenspersecond=2.0, burst=10, fullqueuesleepseconds=120, 
+                 attempts=3, backoffseconds=60, tasklister=None, clock=None, sleep=None, verbose=False):
+        self.maxactivetasks        = maxactivetasks
+        self.refreshseconds        = refreshseconds
+        self.tokenspersecond       = tokenspersecond
+        self.burst                 = burst
+        self.fullqueuesleepseconds = fullqueuesleepseconds
+        self.attempts              = attempts
+        self.backoffseconds        = backoffseconds
+        self._tasklister           = tasklister if tasklister is not None else ee.batch.Task.list
+        self._clock                = clock      if clock      is not None else time.monotonic
+        self._sleep                = sleep      if sleep      is not None else time.sleep
+        self._verbose              = verbose
+        self._lock                 = threading.Lock()
+        #
+        #    cached queue view
+        #
+        self._activecount          = 0
+        self._refreshtime          = None
+        self._submittedsincerefresh= 0
+        #
+        #    token bucket
+        #
+        self._tokens               = float(burst)
+        self._tokenstime           = self._clock()
+        #
+        #    statistics
+        #
+        self._starttime            = None
+        self._submitted            = 0
+        self._failed               = 0
+        self._listcalls            = 0
+        self._waitseconds          = 0.0
+
+    def _unlocked(self, func, *args):
+        """
+        call func without holding the lock (called with the lock held)
+        """
+        self._lock.release()
+        try:
+            return func(*args)
+        finally:
+            self._lock.acquire()
+
+    def _refresh(self):
+        def _listtasks():
+            return self._tasklister()
+        taskslist = self._unlocked(lambda: geeutils.wrapretry(_listtasks, attempts=self.attempts, backoffseconds=self.backoffseconds, verbose=self._verbose))
+        self._listcalls            += 1
+        self._activecount           = len([task for task in taskslist if task.state in (
+            ee.batch.Task.State.READY,
+            ee.batch.Task.State.RUNNING,
+            ee.batch.Task.State.CANCEL_REQUESTED)])
+        self._submittedsincerefresh = 0
+        self._refreshtime           = self._clock()
+        if self._verbose: print(f"{str(type(self).__name__)}._refresh: {self._activecount} tasks active")
+
+    def _occupancy(self, forcerefresh=False):
+        if forcerefresh or (self._refreshtime is None) or (self._clock() - self._refreshtime >= self.refreshseconds):
+            self._refresh()
+        return self._activecount + self._submittedsincerefresh
+
+    def _secondsuntiltoken(self):
+        now = self._clock()
+        self._tokens     = min(float(self.burst), self._tokens + (now - self._tokenstime) * self.tokenspersecond)
+        self._tokenstime = now
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return 0.0
+        return (1.0 - self._tokens) / self.tokenspersecond
+
+    def _wait(self, seconds):
+        self._waitseconds += seconds
+        self._unlocked(self._sleep, seconds)
+
+    def submit(self, task):
+        """
+        start the task as soon as the queue and the token bucket allow it. retries task.start() (and the task listing) in case of exceptions.
+        returns True on success, False in case the task could not be started.
+        """
+        with self._lock:
+            if self._starttime is None: self._starttime = self._clock()
+            bforcerefresh = False
+            while True:
+                try:
+                    ioccupancy = self._occupancy(forcerefresh=bforcerefresh)
+                except Exception as e:
+                    self._failed += 1
+                    logging.warning(f"{str(type(self).__name__)}.submit: listing tasks failed: {str(e)}")
+                    return False
+                if ioccupancy >= self.maxactivetasks:
+                    if self._verbose: print(f"{str(type(self).__name__)}.submit: queue full - sleep a while for gee")
+                    self._wait(self.fullqueuesleepseconds)
+                    bforcerefresh = True
+                    continue
+                bforcerefresh = False
+                seconds = self._secondsuntiltoken()
+                if seconds > 0:
+                    self._wait(seconds)
+                    continue
+                break
+
+            #
+            #    the queue slot is reserved while starting (without the lock): other submitters count it already
+            #
+            self._submittedsincerefresh += 1
+            try:
+                self._unlocked(lambda: geeutils.wrapretry(task.start, attempts=self.attempts, backoffseconds=self.backoffseconds, verbose=self._verbose))
+            except Exception as e:
+                self._submittedsincerefresh = max(0, self._submittedsincerefresh - 1)
+                self._failed += 1
+                logging.warning(f"{str(type(self).__name__)}.submit: starting task failed: {str(e)}")
+                return False
+
+            self._submitted             += 1
+            if self._verbose: print(f"{str(type(self).__name__)}.submit: task started ({self._submitted} submitted)")
+            return True
+
+    def throughput(self):
+        """
+        returns dict with 'submitted', 'failed', 'elapsedseconds', 'tasksperminute', 'listcalls', 'waitseconds'
+        """
+        with self._lock:
+            elapsedseconds = (self._clock() - self._starttime) if self._starttime is not None else 0.0
+            return {
+                'submitted'      : self._submitted,
+                'failed'         : self._failed,
+                'elapsedseconds' : elapsedseconds,
+                'tasksperminute' : (60.0 * self._submitted / elapsedseconds) if elapsedseconds > 0 else 0.0,
+                'listcalls'      : self._listcalls,
+                'waitseconds'    : self._waitseconds}
 
 
 """
@@ -39,6 +247,7 @@ class GEEExp(object):
     """
     The 'GEEExp' class hosts methods to export the image collections obtained from the GEECol.getcollection method.
     - exportimages:            exports the separate images to a local directory
+    - exportimagesmulti:       exports the separate images of several collections to a local directory, sharing downloads where possible
     - exportimagestack:        exports the images stacked as bands in a multiband image to a local directory
     - exportimagestodrive:     exports the separate images to the google drive
     - exportimagestacktodrive: exports the images stacked as bands in a multiband image to the google drive
@@ -46,6 +255,7 @@ class GEEExp(object):
     For local downloads: prefer exportimages; 
         exportimagestack seems slower, due to splitting the collection to meet the maximum-bands-per-image limit,
          and due to the additional osgeo.gdal manipulations to restore the bandnames.
+         (these manipulations are now done in a single pass on the in-memory download, see _writestack)
     
     For export to google drive: prefer exportimagestacktodrive; 
         exportimagestodrive should only be used for very 'short' timeseries, otherwise the ee.batch.Task.start()
@@ -54,16 +264,79 @@ class GEEExp(object):
 
     """
     """
-    def _getgeecolproperties(self, eeimagecollection, verbose=False):
+    def __init__(self, maxconcurrentdownloads=1, transport=None, taskscheduler=None, outputprofile=None, cache=None, minvalidpct=None, usecheckpoint=True,
+                 transferencoding=None, transferdecode=True):
         """
-        helper method to retrieve parameters needed for export, from the GEECol imagecollection properties:
+        :param maxconcurrentdownloads: maximum number of downloads in flight for exportimages.
+                                       default 1: sequential downloads, as in the good old days
+        :param transport: geetransport.GEETransport used for the downloads. can be shared between GEEExp instances
+                          to reuse its keep-alive sessions. default: private instance, released by close()
+        :param taskscheduler: GEETaskScheduler used to start the toDrive tasks. should be shared between GEEExp instances
+                              to keep its view on the task queue. default: private instance
+        :param outputprofile: geetiff output profile ("DEFLATE", "ZSTD", "COG", "NBITS") applied while writing local exports.
+                              default None: files as in the server zip (exportimages), DEFLATE (exportimagestack)
+        :param cache: geecache.GEEDownloadCache consulted before - and filled after - each getDownloadURL download.
+                      default None: no caching
+        :param minvalidpct: dates with less valid (unmasked) pixels in the export region (percentage) are not exported.
+                            the valid pixel counts are evaluated in the descriptor round trip. default None: export all dates
+        :param usecheckpoint: record completed download jobs in a checkpoint in the output directory (geemanifest.GEECheckpoint),
+                              so retries and restarted processes continue at the first incomplete job. default True
+        :param transferencoding: "INT16": float products specifying a transfer scaling are downloaded as scaled int16 (see TRANSFERENCODINGS).
+                                 default None: as is
+        :param transferdecode: decode transfer encoded downloads back to float32 (default), or keep them as int16 with scale metadata
+        """
+        if outputprofile is not None and outputprofile not in geetiff.OUTPUTPROFILES:
+            raise ValueError(f"invalid outputprofile '{outputprofile}' - expected one of {geetiff.OUTPUTPROFILES}")
+        if transferencoding is not None and transferencoding not in TRANSFERENCODINGS:
+            raise ValueError(f"invalid transferencoding '{transferencoding}' - expected one of {TRANSFERENCODINGS}")
+        self.maxconcurrentdownloads = max(1, int(maxconcurrentdownloads))
+        self.transport              = transport if transport is not None else geetransport.GEETransport(chunksize=DOWNLOAD_CHUNKSIZE, spoolsize=DOWNLOAD_SPOOLSIZE)
+        self._owntransport          = transport is None
+        self.taskscheduler          = taskscheduler if taskscheduler is not None else GEETaskScheduler()
+        self.outputprofile          = outputprofile
+        self.cache                  = cache
+        self.minvalidpct            = minvalidpct
+        self.usecheckpoint          = usecheckpoint
+        self.transferencoding       = transferencoding
+        self.transferdecode         = transferdecode
+
+    """
+    """
+    def close(self):
+        """
+        release the private transport (if any) - a shared transport is closed by its owner
+        """
+        if self._owntransport: self.transport.close()
+
+    """
+    """
+    def _getgeecoldescriptor(self, eeimagecollection, verbose=False):
+        """
+        helper method to retrieve everything needed for export, from the GEECol imagecollection and its properties,
+        in a single ee.Dictionary - hence a single getInfo round trip.
+
+        returns a (client side) dict:
+            'size'           : int - number of images in the collection
+            'description'    : string - 'gee_description' property - used to brew filenames for exports
+            'bandnames'      : list of distinct band names
+            'bands'          : dict - per band name: {'size': number of images containing the band,
+                                                      'dates': list of 'YYYY-MM-dd' image dates (system:time_start) in collection order,
+                                                      'type' : ee PixelType dict (precision, min, max) of the band,
+                                                      'validpct': (only if minvalidpct is specified) list of percentages of valid 
+                                                                  (unmasked) pixels in the export region, along 'dates'}
+            'dates'          : list of 'YYYY-MM-dd' 'gee_date' properties in collection order
+            'region'         : GeoJSON of the export region
+            'scale'          : export scale (nominal scale of the 'gee_projection' property)
+            'projection'     : 'gee_projection' property (crs, transform)
+            'dimensions'     : [width, height] of the export region in 'gee_projection' pixels
+            'pixelorigin'    : [x, y] upper left corner of the export region in 'gee_projection' pixels
+            'perband'        : bool - 'gee_perband' property: the collection is always exported per band, with band suffixed names
+            'rgb'            : bool - exported as 3-band images: collections with 3 bands, unless their 'gee_perband' property is set
+            'bandsuffix'     : bool - file descriptions are suffixed with the band name (description_band): multi band or 'perband' collections
+            'transferscale'  : 'gee_transferscale' property - None if the product specifies no transfer scaling
+            'transferoffset' : 'gee_transferoffset' property
+            'eeexportregion' : ee.Geometry - the export region itself, to be used as region parameter for exports
         """
-        #
-        # collection.size().getInfo() forces the collection to be evaluated
-        # if this crashes during the evaluation, this might be retry-able - hence we do nothing, 
-        # and the exception is passed on, so a retry might be triggered.
-        #
-        icollectionsize = eeimagecollection.size().getInfo()
         #
         # retrieve properties from GEECol eeimagecollection
         #    GEECol imagecollections are supposed to have these properties available
@@ -72,42 +345,203 @@ class GEEExp(object):
         #    - 'gee_projection'  : ee.Projection - used to shrink the exported region a little, and to find the scale parameter for exports
         #    - 'gee_description' : string - used to brew filenames for exports
         #
-        # if these are not present, there is no chance the export methods could ever run correctly,
-        # hence we'll raise a "NoRetryException" to avoid needless retries
+        eeregion     = ee.Geometry(eeimagecollection.get('gee_refroi'))
+        eeprojection = ee.Projection(eeimagecollection.get('gee_projection'))
         #
-        try:
-            eeregion     = ee.Geometry(eeimagecollection.get('gee_refroi'))
-            eeprojection = ee.Projection(eeimagecollection.get('gee_projection'))
-            #
-            # everlasting war between pixel_as_surface vs pixel_as_point: 
-            #    - export seems to use 'pixel_as_point'
-            #    - our roi represents the pixel_as_surface bounding box
-            #    - rounding errors can introduce an extra row/column in our exported image
-            #    => shrinking the original roi with 10% of its own pixel size and prayer might take care of this
-            #
-            exportregion = eeregion.buffer(-0.1, proj=eeprojection)
-            exportscale  = eeprojection.nominalScale()
-            #
-            # description will be used in filenames
-            #
-            szcollectiondescription = eeimagecollection.get('gee_description').getInfo()
-            #
-            # list of band names 
-            #    normal GEECol collections are expected to be single-band
-            #    in case there are more, each band is exported separately
-            #
-            szbandnames = eeimagecollection.aggregate_array('system:band_names').flatten().distinct().getInfo()    
-            #
+        # everlasting war between pixel_as_surface vs pixel_as_point: 
+        #    - export seems to use 'pixel_as_point'
+        #    - our roi represents the pixel_as_surface bounding box
+        #    - rounding errors can introduce an extra row/column in our exported image
+        #    => shrinking the original roi with 10% of its own pixel size and prayer might take care of this
+        #
+        exportregion = eeregion.buffer(-0.1, proj=eeprojection)
+        exportscale  = eeprojection.nominalScale()
+        #
+        # list of band names 
+        #    normal GEECol collections are expected to be single-banded
+        #    in case there are more, each band is exported separately
+        #
+        eebandnames  = eeimagecollection.aggregate_array('system:band_names').flatten().distinct()
+        def _bandinfo(bandname):
+            bandcollection = eeimagecollection.filter(ee.Filter.listContains('system:band_names', bandname))
+            bandinfo = ee.Dictionary({
+                'size'  : bandcollection.size(),
+                'dates' : bandcollection.aggregate_array('system:time_start').map(lambda millis: ee.Date(millis).format('YYYY-MM-dd')),
+                'type'  : bandcollection.first().select([bandname]).bandTypes().get(bandname)})
+            if self.minvalidpct is None: return bandinfo
             #
+            # valid pixels: mean of the mask over the export region, in the export projection
+            #    all dates in a single aggregation - a reduceRegion per image would run into "Too many concurrent aggregations."
+            #    (toBands keeps the collection order, hence the order of 'dates')
             #
-            return icollectionsize, exportregion, exportscale, szcollectiondescription, szbandnames
+            eevalidstack = bandcollection.map(lambda image: ee.Image(image).select([bandname]).mask().gt(0).unmask(0, False).rename('valid')).toBands()
+            eemeans      = eevalidstack.reduceRegion(reducer=ee.Reducer.mean(), geometry=exportregion, crs=eeprojection, maxPixels=1e9)
+            return bandinfo.set('validpct', eemeans.values(eevalidstack.bandNames()).map(
+                lambda mean: ee.Number(ee.Algorithms.If(mean, mean, 0)).multiply(100)))
 
-        except:
-            #
-            # arriving here is expected to indicate that the collection exists somehow,
-            # but does not contain the expected properties, and cannot be exported
-            #
-            raise geeutils.NoRetryInvalidCollectionException(f"{str(type(self).__name__)}._getgeecolproperties: invalid collection.")
+        eedescriptor = ee.Dictionary({
+            'size'        : eeimagecollection.size(),
+            'description' : eeimagecollection.get('gee_description'),
+            'bandnames'   : eebandnames,
+            'bands'       : ee.Dictionary.fromLists(eebandnames, eebandnames.map(_bandinfo)),
+            'dates'       : eeimagecollection.aggregate_array('gee_date'),
+            'region'      : exportregion,
+            'scale'       : exportscale,
+            'projection'  : eeprojection,
+            'transferscale' : eeimagecollection.get('gee_transferscale'),
+            'transferoffset': eeimagecollection.get('gee_transferoffset'),
+            'perband'     : eeimagecollection.get('gee_perband'),
+            'bounds'      : eeregion.bounds(0.001, eeprojection).coordinates().flatten()})
+        #
+        # descriptor.getInfo() forces the collection to be evaluated
+        # if this crashes during the evaluation, this might be retry-able - hence we pass the exception on, so a retry might be triggered.
+        #
+        # however, if the GEECol properties are not present, there is no chance the export methods could ever run correctly,
+        # hence we'll raise a "NoRetryException" to avoid needless retries. to keep the normal case at a single round trip,
+        # the properties are verified in the same evaluation - the descriptor itself is only evaluated for valid collections.
+        #
+        eebvalid = eeimagecollection.propertyNames().containsAll(['gee_refroi', 'gee_projection', 'gee_description'])
+        def _checkdescriptor(result):
+            if (not result['valid']) or (result['descriptor'] is None) or (result['descriptor'].get('description') is None):
+                #
+                # arriving here is expected to indicate that the collection exists somehow,
+                # but does not contain the expected properties, and cannot be exported
+                #
+                raise geeutils.NoRetryInvalidCollectionException(f"{str(type(self).__name__)}._getgeecoldescriptor: invalid collection.")
+            return result['descriptor']
+        descriptor = geeutils.getinfo(
+            ee.Dictionary({'valid': eebvalid, 'descriptor': ee.Algorithms.If(eebvalid, eedescriptor, None)}), check=_checkdescriptor, verbose=verbose)
+
+        #
+        # patch dimensions in pixels: the roi bounds in 'gee_projection' units are pixels
+        #
+        lstbounds = descriptor.pop('bounds')
+        descriptor['dimensions'] = [
+            int(math.ceil(max(lstbounds[0::2]) - min(lstbounds[0::2]) - 0.001)),
+            int(math.ceil(max(lstbounds[1::2]) - min(lstbounds[1::2]) - 0.001))]
+        descriptor['pixelorigin'] = [
+            int(math.floor(min(lstbounds[0::2]) + 0.001)),
+            int(math.floor(min(lstbounds[1::2]) + 0.001))]
+
+        descriptor['perband']    = bool(descriptor['perband'])
+        descriptor['rgb']        = (3 == len(descriptor['bandnames'])) and not descriptor['perband']
+        descriptor['bandsuffix'] = (1 < len(descriptor['bandnames'])) or descriptor['perband']
+        descriptor['eeexportregion'] = exportregion
+        if verbose: print(f"{str(type(self).__name__)}._getgeecoldescriptor - collection: {descriptor['description']} images: {descriptor['size']} bands: {descriptor['bandnames']}")
+        return descriptor
+
+
+    """
+    """
+    @staticmethod
+    def _bytesperpixel(pixeltype):
+        """
+        bytes per pixel for an ee PixelType dict as found in ee.Image.bandTypes() e.g. {'type': 'PixelType', 'precision': 'int', 'min': 0, 'max': 255}
+        """
+        szprecision = pixeltype.get('precision', 'double') if pixeltype else 'double'
+        if szprecision == 'float' : return 4
+        if szprecision == 'double': return 8
+        imin = pixeltype.get('min', -2**63)
+        imax = pixeltype.get('max',  2**63-1)
+        for ibytes in (1, 2, 4):
+            if (0 <= imin and imax < 2**(8*ibytes)) or (-2**(8*ibytes-1) <= imin and imax < 2**(8*ibytes-1)): return ibytes
+        return 8
+
+    """
+    """
+    def _imagesperdownload(self, descriptor, szbandname, ibandsperimage=1):
+        """
+        largest number of images (of band szbandname, each with ibandsperimage bands) per getDownloadURL request,
+        staying within the MAXBANDS_PERDOWNLOAD band limit and the MAXBYTES_PERDOWNLOAD request size limit
+        """
+        ibytesperimage = self._bytesperimage(descriptor, szbandname, ibandsperimage=ibandsperimage)
+        ibandlimit     = MAXBANDS_PERDOWNLOAD // ibandsperimage
+        ibytelimit     = int((MAXBYTES_PERDOWNLOAD * MAXBYTES_SAFETYFACTOR) // max(1, ibytesperimage))
+        #
+        #    a single image exceeding the request size limit: try it anyway - the server will tell.
+        #
+        return max(1, min(ibandlimit, ibytelimit))
+
+    """
+    """
+    def _bytesperimage(self, descriptor, szbandname, ibandsperimage=1):
+        """
+        (uncompressed) bytes per image of band szbandname in the export region
+        """
+        iwidth, iheight = descriptor['dimensions']
+        if self._transferscaling(descriptor) is not None: return iwidth * iheight * ibandsperimage * 2
+        return iwidth * iheight * ibandsperimage * GEEExp._bytesperpixel(descriptor['bands'][szbandname].get('type'))
+
+    """
+    """
+    def _transferscaling(self, descriptor):
+        """
+        (scale, offset) in case the downloads of the collection are to be transfer encoded, otherwise None
+        """
+        if self.transferencoding is None or descriptor.get('transferscale') is None: return None
+        if descriptor['rgb']: return None # exported as 3-band images (see exportimages)
+        return (descriptor['transferscale'], descriptor.get('transferoffset') or 0.0)
+
+    """
+    """
+    @staticmethod
+    def _transferencode(eeimage, transferscaling):
+        """
+        server side int16 transfer encoding of (all bands of) eeimage - see TRANSFERENCODINGS
+        """
+        scale, offset = transferscaling
+        return (eeimage
+                .subtract(offset).divide(scale).round()
+                .clamp(-32767, 32767)
+                .unmask(TRANSFER_INT16NODATA, False)
+                .toInt16())
+
+    """
+    """
+    @staticmethod
+    def _transferdecode(data, transferscaling):
+        """
+        client side decoding of int16 transfer encoded data (numpy array) to float32 - TRANSFER_INT16NODATA as nan
+        """
+        import numpy
+        scale, offset = transferscaling
+        decoded = data.astype(numpy.float32) * numpy.float32(scale) + numpy.float32(offset)
+        decoded[data == TRANSFER_INT16NODATA] = numpy.nan
+        return decoded
+
+    """
+    """
+    def estimatedownloads(self, eeimagecollection, verbose=False):
+        """
+        predict the getDownloadURL requests exportimages/exportimagestack will issue for a GEECol imagecollection
+        (exportimagestack issues the same number of requests)
+
+        returns dict:
+            'description' : collection description
+            'dimensions'  : [width, height] in pixels
+            'bands'       : per band name: {'images', 'bytesperimage', 'imagesperdownload', 'downloads'}
+            'downloads'   : total number of requests
+            'bytes'       : total (uncompressed) bytes
+        """
+        descriptor = self._getgeecoldescriptor(eeimagecollection, verbose=verbose)
+        #
+        #    3-band collections are exported as stacks of 3-band images (see exportimages)
+        #
+        b3bands    = descriptor['rgb']
+        estimate   = {'description': descriptor['description'], 'dimensions': descriptor['dimensions'], 'bands': {}, 'downloads': 0, 'bytes': 0}
+        for szbandname in descriptor['bandnames']:
+            iimages            = descriptor['bands'][szbandname]['size']
+            ibytesperimage     = self._bytesperimage(descriptor, szbandname)
+            iimagesperdownload = self._imagesperdownload(descriptor, szbandname, ibandsperimage=3 if b3bands else 1)
+            idownloads         = 0 if b3bands else int(math.ceil(iimages / iimagesperdownload))
+            estimate['bands'][szbandname] = {'images': iimages, 'bytesperimage': ibytesperimage, 'imagesperdownload': iimagesperdownload, 'downloads': idownloads}
+            estimate['downloads'] += idownloads
+            estimate['bytes']     += iimages * ibytesperimage
+        if b3bands:
+            estimate['downloads'] = int(math.ceil(descriptor['size'] / self._imagesperdownload(descriptor, descriptor['bandnames'][0], ibandsperimage=3)))
+
+        if verbose: print(f"{str(type(self).__name__)}.estimatedownloads - collection: {estimate['description']} dimensions: {estimate['dimensions']} downloads: {estimate['downloads']} bytes: {estimate['bytes']}")
+        return estimate
 
 
     #####################################################################################
@@ -118,101 +552,528 @@ class GEEExp(object):
 
     """
     """
-    def _geemap_ee_export_image(self, ee_object, filename, scale=None, crs=None, region=None, file_per_band=False, verbose=False):
+    def _geemap_ee_getdownloadurl(self, ee_object, filename, scale=None, crs=None, region=None, file_per_band=False, verbose=False):
         """
-        local copy from the geemap.common.ee_export_image method (https://geemap.org/)
-        modified slightly to avoid unconditional 'print' statements, replace error returns with exceptions and have a simple retry for the download
+        first half of the geemap.common.ee_export_image method: obtain the ee.Image.getDownloadURL
+        this is an ee-server-side call, hence it should be done by the thread owning the ee objects (see geeutils.wrapasprocess remarks)
         """
-        import zipfile
-        import requests
         if not isinstance(ee_object, ee.Image):
             raise ValueError("ee_object must be an ee.Image")
-    
+
         filename = os.path.abspath(filename)
         basename = os.path.basename(filename)
         name = os.path.splitext(basename)[0]
         filetype = os.path.splitext(basename)[1][1:].lower()
-        filename_zip = filename.replace(".tif", ".zip")
-    
+
         if filetype != "tif":
             raise ValueError("filename must end with .tif")
-    
+
+        if verbose: print(f"{str(type(self).__name__)}._geemap_ee_getdownloadurl - Generating URL ...")
+        params = {"name": name, "filePerBand": file_per_band}
+        if scale is None:
+            scale = ee_object.projection().nominalScale().multiply(10)
+        params["scale"] = scale
+        if region is None:
+            region = ee_object.geometry()
+        params["region"] = region
+        if crs is not None:
+            params["crs"] = crs
+
+        return geeutils.wrapretry(
+            ee_object.getDownloadURL,
+            args=(params,),
+            attempts=3, backoffseconds=10, backofffactor=1, verbose=verbose)
+
+    """
+    """
+    def _geemap_ee_extractzip(self, zipbuffer, szdirname, transferscaling=None, verbose=False):
+        """
+        write the members of the zip straight to their final names in szdirname - no temporary zip file on disk
+        in case an outputprofile is specified, the GeoTIFF members are handed to gdal via /vsimem/ and written according to this profile
+        in case of transfer encoded downloads (transferscaling), the GeoTIFF members are decoded (or labeled) via _writetransfermember
+        returns the list of files written
+        """
+        import zipfile
+        import shutil
+
+        lstszfilenames = []
+        with zipfile.ZipFile(zipbuffer) as z:
+            for member in z.infolist():
+                if member.is_dir(): continue
+                szfilename = os.path.join(szdirname, os.path.basename(member.filename))
+                if transferscaling is not None and szfilename.lower().endswith(".tif"):
+                    self._writetransfermember(z.read(member), szfilename, transferscaling, verbose=verbose)
+                elif self.outputprofile is not None and szfilename.lower().endswith(".tif"):
+                    self._writeprofiledmember(z.read(member), szfilename, verbose=verbose)
+                else:
+                    with z.open(member) as src, open(szfilename, "wb") as dst:
+                        shutil.copyfileobj(src, dst, DOWNLOAD_CHUNKSIZE)
+                lstszfilenames.append(szfilename)
+        return lstszfilenames
+
+    """
+    """
+    def _writeprofiledmember(self, bytesmember, szfilename, verbose=False):
+        """
+        write GeoTIFF bytes (zip member) to szfilename according to self.outputprofile
+        """
+        import uuid
+        import osgeo.gdal
+
+        osgeo.gdal.UseExceptions()
+        szvsimemfilename = f"/vsimem/{uuid.uuid4().hex}.tif"
+        osgeo.gdal.FileFromMemBuffer(szvsimemfilename, bytesmember)
+        src_ds = None
+        try:
+            src_ds = osgeo.gdal.Open(szvsimemfilename)
+            geetiff.writeprofiled(src_ds, szfilename, self.outputprofile, verbose=verbose)
+        finally:
+            src_ds = None
+            osgeo.gdal.Unlink(szvsimemfilename)
+
+    """
+    """
+    def _writetransfermember(self, bytesmember, szfilename, transferscaling, verbose=False):
+        """
+        write transfer encoded GeoTIFF bytes (zip member) to szfilename
+        - transferdecode: decoded to float32, masked values as nan
+        - otherwise: int16 as downloaded, with scale, offset and nodata in the band metadata
+        as plain GTiff (as downloaded), or according to self.outputprofile
+        """
+        import uuid
+        import osgeo.gdal
+
+        osgeo.gdal.UseExceptions()
+        szvsimemfilename = f"/vsimem/{uuid.uuid4().hex}.tif"
+        osgeo.gdal.FileFromMemBuffer(szvsimemfilename, bytesmember)
+        src_ds = None
+        dst_ds = None
+        try:
+            src_ds = osgeo.gdal.Open(szvsimemfilename)
+            dst_ds = self._transferdataset(src_ds, transferscaling)
+            if self.outputprofile is None:
+                osgeo.gdal.GetDriverByName('GTiff').CreateCopy(szfilename, dst_ds)
+            else:
+                geetiff.writeprofiled(dst_ds, szfilename, self.outputprofile, verbose=verbose)
+        finally:
+            dst_ds = None
+            src_ds = None
+            osgeo.gdal.Unlink(szvsimemfilename)
+
+    """
+    """
+    def _transferdataset(self, src_ds, transferscaling):
+        """
+        MEM copy of transfer encoded gdal dataset src_ds: decoded to float32 (transferdecode), or int16 with scale metadata
+        """
+        import osgeo.gdal
+
+        if self.transferdecode:
+            dst_ds = osgeo.gdal.GetDriverByName('MEM').Create('', src_ds.RasterXSize, src_ds.RasterYSize, src_ds.RasterCount, osgeo.gdal.GDT_Float32)
+            dst_ds.SetGeoTransform(src_ds.GetGeoTransform())
+            dst_ds.SetProjection(src_ds.GetProjection())
+        else:
+            dst_ds = osgeo.gdal.Translate('', src_ds, format='MEM')
+        for iband in range(src_ds.RasterCount):
+            dst_band = dst_ds.GetRasterBand(iband+1)
+            dst_band.SetDescription(src_ds.GetRasterBand(iband+1).GetDescription())
+            if self.transferdecode:
+                dst_band.WriteArray(self._transferdecode(src_ds.GetRasterBand(iband+1).ReadAsArray(), transferscaling))
+                dst_band.SetNoDataValue(math.nan)
+            else:
+                dst_band.SetScale(transferscaling[0])
+                dst_band.SetOffset(transferscaling[1])
+                dst_band.SetNoDataValue(TRANSFER_INT16NODATA)
+        return dst_ds
+
+    """
+    """
+    def _geemap_ee_download(self, url, filename, file_per_band=False, zipbufferhandler=None, cachekey=None, verbose=False):
+        """
+        second half of the geemap.common.ee_export_image method: download the zip from the url and extract it.
+        plain http - no ee calls - hence this can be done by worker threads.
+        in case a cachekey is specified, the zip is stored in the cache before it is extracted
+        """
+        zipbuffer = self.transport.downloadzip(url, verbose=verbose)
+        if cachekey is not None:
+            try:
+                self.cache.put(cachekey, zipbuffer)
+            except Exception as e:
+                #
+                #    a failing cache should not fail the export
+                #
+                logging.warning(f"{str(type(self).__name__)}._geemap_ee_download - caching failed: {str(e)}")
+                zipbuffer.seek(0)
+        self._geemap_ee_processzip(zipbuffer, filename, file_per_band=file_per_band, zipbufferhandler=zipbufferhandler, verbose=verbose)
+
+    """
+    """
+    def _geemap_ee_processzip(self, zipbuffer, filename, file_per_band=False, zipbufferhandler=None, verbose=False):
+        """
+        extract the downloaded (or cached) zip - and close it.
+        in case a zipbufferhandler(zipbuffer) is specified, it replaces the default extraction
+        """
+        filename = os.path.abspath(filename)
         try:
-            if verbose: print(f"{str(type(self).__name__)}._geemap_ee_export_image - Generating URL ...")
-            params = {"name": name, "filePerBand": file_per_band}
-            if scale is None:
-                scale = ee_object.projection().nominalScale().multiply(10)
-            params["scale"] = scale
-            if region is None:
-                region = ee_object.geometry()
-            params["region"] = region
-            if crs is not None:
-                params["crs"] = crs
+            if zipbufferhandler is not None:
+                zipbufferhandler(zipbuffer)
+            else:
+                self._geemap_ee_extractzip(zipbuffer, os.path.dirname(filename), verbose=verbose)
     
+            if file_per_band:
+                if verbose: print(f"{str(type(self).__name__)}._geemap_ee_download - Data downloaded to {os.path.dirname(filename)}")
+            else:
+                if verbose: print(f"{str(type(self).__name__)}._geemap_ee_download - Data downloaded to {filename}")
+        except Exception as e:
+            if verbose: print(f"{str(type(self).__name__)}._geemap_ee_download - An error occurred while unzipping: Exception({str(e)})")
+            raise
+        finally:
+            zipbuffer.close()
+
+    """
+    """
+    def _geemap_ee_export_image(self, ee_object, filename, scale=None, crs=None, region=None, file_per_band=False, zipbufferhandler=None, verbose=False):
+        """
+        local copy from the geemap.common.ee_export_image method (https://geemap.org/)
+        modified slightly to avoid unconditional 'print' statements, replace error returns with exceptions and have retries for the download
+        split up in _geemap_ee_getdownloadurl and _geemap_ee_download, to allow concurrent downloads in _geemap_ee_export_images
+        """
+        cachekey, zipbuffer = self._cachedzip(ee_object, filename, scale=scale, crs=crs, region=region, file_per_band=file_per_band, verbose=verbose)
+        if zipbuffer is not None:
+            self._geemap_ee_processzip(zipbuffer, filename, file_per_band=file_per_band, zipbufferhandler=zipbufferhandler, verbose=verbose)
+            return
+        url = self._geemap_ee_getdownloadurl(ee_object, filename, scale=scale, crs=crs, region=region, file_per_band=file_per_band, verbose=verbose)
+        self._geemap_ee_download(url, filename, file_per_band=file_per_band, zipbufferhandler=zipbufferhandler, cachekey=cachekey, verbose=verbose)
+
+    """
+    """
+    def _cachedzip(self, ee_object, filename, scale=None, crs=None, region=None, file_per_band=False, verbose=False):
+        """
+        returns (cachekey, zipbuffer) - cachekey None if there is no cache, zipbuffer None unless the download was found in the cache
+        """
+        if self.cache is None: return None, None
+        cachekey  = self.cache.key(ee_object, filename, scale=scale, crs=crs, region=region, file_per_band=file_per_band)
+        zipbuffer = self.cache.open(cachekey)
+        if verbose and zipbuffer is not None: print(f"{str(type(self).__name__)}._cachedzip - {os.path.basename(filename)} from cache")
+        return cachekey, zipbuffer
+
+    """
+    """
+    def _geemap_ee_export_images(self, itrejobs, checkpoint=None, verbose=False):
+        """
+        export a series of images, each job specified as a dict of _geemap_ee_export_image keyword arguments
+        (ee_object, filename, scale, crs, region, file_per_band, zipbufferhandler)
+        and an optional 'ondone' callable, called (in this thread) once the job has finished successfully
+        returns the list of job keys of all jobs (completed now or before)
+
+        retries are per job (JOB_ATTEMPTS) - a failing download does not restart the jobs done so far.
+        with a checkpoint (geemanifest.GEECheckpoint), jobs are identified by their 'jobkey', completed jobs are recorded,
+        and jobs already completed (by a previous attempt, or a previous process) are skipped - provided their 'outputs'
+        (optional callable) confirms the outputs are still there.
+
+        with maxconcurrentdownloads > 1 the jobs are pipelined:
+        - the download urls are still obtained one after another, in this (the calling) thread, since ee is not expected to be thread-safe
+        - the actual http downloads (and unzipping) run in a pool of worker threads, with at most maxconcurrentdownloads in flight
+        - a failed download is retried in this thread, with a fresh download url
+        - jobs are expected to write distinct files, so the results are identical to the sequential export
+        """
+        import concurrent.futures
+
+        def _exportjob(job):
+            geeutils.wrapretry(
+                self._geemap_ee_export_image, 
+                args=(job['ee_object'], job['filename']),
+                kwargs={'scale':job.get('scale'), 'crs':job.get('crs'), 'region':job.get('region'), 'file_per_band':job.get('file_per_band', False), 
+                        'zipbufferhandler':job.get('zipbufferhandler'), 'verbose':verbose},
+                attempts=JOB_ATTEMPTS, backoffseconds=JOB_BACKOFFSECONDS, backofffactor=2, verbose=verbose)
+
+        def _done(job):
+            if job.get('ondone') is not None: job['ondone']()
+            if checkpoint is not None and job.get('jobkey') is not None: checkpoint.done(job['jobkey'])
+
+        lstszjobkeys = []
+        def _gtodojobs():
+            for job in itrejobs:
+                if job.get('jobkey') is not None: lstszjobkeys.append(job['jobkey'])
+                if checkpoint is not None and job.get('jobkey') is not None and checkpoint.isdone(job['jobkey']):
+                    if job.get('outputs') is None or job['outputs']():
+                        if verbose: print(f"{str(type(self).__name__)}._geemap_ee_export_images - {job['jobkey']} completed before - skipped")
+                        continue
+                    logging.warning(f"{str(type(self).__name__)}._geemap_ee_export_images - {job['jobkey']} completed before, but outputs missing - redone")
+                yield job
+
+        if self.maxconcurrentdownloads <= 1:
+            for job in _gtodojobs():
+                _exportjob(job)
+                _done(job)
+            return lstszjobkeys
+
+        def _collect(future):
+            job = pending.pop(future)
+            try:
+                future.result()
+            except geeutils.NoRetryException:
+                raise
+            except Exception as e:
+                logging.warning(f"{str(type(self).__name__)}._geemap_ee_export_images - download failed ({str(e)}) - retrying {os.path.basename(job['filename'])}")
+                _exportjob(job)
+            _done(job)
+
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.maxconcurrentdownloads)
+        pending  = {}
+        try:
+            for job in _gtodojobs():
+                #
+                #    wait for a free slot - retrying failed downloads as soon as possible
+                #
+                while len(pending) >= self.maxconcurrentdownloads:
+                    done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                    for future in done: _collect(future)
+                #
+                #    cached: only the extraction in worker thread
+                #
+                cachekey, zipbuffer = self._cachedzip(
+                    job['ee_object'], job['filename'], scale=job.get('scale'), crs=job.get('crs'), region=job.get('region'), file_per_band=job.get('file_per_band', False), verbose=verbose)
+                if zipbuffer is not None:
+                    future = executor.submit(
+                        self._geemap_ee_processzip, zipbuffer, job['filename'], file_per_band=job.get('file_per_band', False), zipbufferhandler=job.get('zipbufferhandler'), verbose=verbose)
+                    pending[future] = job
+                    continue
+                #
+                #    ee-server-side call in this thread, download in worker thread
+                #
+                url = self._geemap_ee_getdownloadurl(
+                    job['ee_object'], job['filename'], scale=job.get('scale'), crs=job.get('crs'), region=job.get('region'), file_per_band=job.get('file_per_band', False), verbose=verbose)
+                future = executor.submit(
+                    self._geemap_ee_download, url, job['filename'], file_per_band=job.get('file_per_band', False), zipbufferhandler=job.get('zipbufferhandler'), cachekey=cachekey, verbose=verbose)
+                pending[future] = job
+                if verbose: print(f"{str(type(self).__name__)}._geemap_ee_export_images - {len(pending)} downloads in flight")
             #
-            #    retries might solve sporadic download failures ? - TODO: use geeutils.wrapretry instead of local implementation?
+            #    wait for the stragglers
             #
-            MAXATTEMPTS = 3
-            DELAY       = 10
-            for attempt in range(1, MAXATTEMPTS+1):
-                try:
-                    url = ee_object.getDownloadURL(params)
-                    if verbose: print(f"{str(type(self).__name__)}._geemap_ee_export_image - Downloading data from {url}\nPlease wait ...")
-                    r = requests.get(url, stream=True)
-            
-                    if r.status_code != 200:
-                        raise Exception(f"error occurred while downloading - status code({r.status_code})")
-            
-                    with open(filename_zip, "wb") as fd:
-                        for chunk in r.iter_content(chunk_size=1024):
-                            fd.write(chunk)
+            for future in concurrent.futures.as_completed(list(pending)):
+                _collect(future)
+
+        except Exception:
+            for future in pending: future.cancel()
+            raise
+
+        finally:
+            executor.shutdown(wait=True)
+
+        return lstszjobkeys
+
 
-                    if verbose: print(f"{str(type(self).__name__)}._geemap_ee_export_image - Downloading data attempt {attempt} of {MAXATTEMPTS} success")
-                    break
+    """
+    """
+    def _jobkey(self, szfilename, lstszdates, cube=None):
+        """
+        client side identification of a download job, e.g. 'S2ndvi.tif:2020-01-05:2020-06-30:33:1f0c6a2e'
+        the last part identifies the export configuration (target, output profile, transfer encoding), since
+        jobs completed under another configuration did not produce the outputs of this one.
+        """
+        import json
+        import hashlib
+
+        szconfig = json.dumps({
+            'target'           : 'cube' if cube is not None else 'files',
+            'outputprofile'    : self.outputprofile,
+            'transferencoding' : self.transferencoding,
+            'transferdecode'   : bool(self.transferdecode)}, sort_keys=True)
+        return f"{os.path.basename(szfilename)}:{lstszdates[0]}:{lstszdates[-1]}:{len(lstszdates)}:{hashlib.sha256(szconfig.encode('utf-8')).hexdigest()[:8]}"
+
+    """
+    """
+    @staticmethod
+    def _outputsexist(lsttargets, cube=None):
+        """
+        True if the outputs of a job - lsttargets: [(szfilename, szfiledescription, szdate), ...] - are present:
+        the dates in the cube (if any), the files otherwise (e.g. not removed since the job completed)
+        """
+        if cube is not None:
+            dictsetdates = {}
+            for _, szfiledescription, szdate in lsttargets:
+                if szfiledescription not in dictsetdates: dictsetdates[szfiledescription] = set(cube.dates(szfiledescription))
+                if szdate not in dictsetdates[szfiledescription]: return False
+            return True
+        return all(os.path.isfile(szfilename) for szfilename, _, _ in lsttargets)
+
+    """
+    """
+    def _validdates(self, descriptor, szbandname, lstszdates, szfiledescription):
+        """
+        subset of lstszdates having at least minvalidpct valid pixels for band szbandname (order preserved)
+        skipped dates are logged
+        """
+        if self.minvalidpct is None: return lstszdates
+        dictvalidpct  = dict(zip(descriptor['bands'][szbandname]['dates'], descriptor['bands'][szbandname]['validpct']))
+        lstszvalid    = [szdate for szdate in lstszdates if dictvalidpct.get(szdate, 100) >= self.minvalidpct]
+        lstszskipped  = [szdate for szdate in lstszdates if dictvalidpct.get(szdate, 100) <  self.minvalidpct]
+        if lstszskipped:
+            logging.info(f"{str(type(self).__name__)}.exportimages - {szfiledescription}: {len(lstszskipped)} of {len(lstszdates)} dates skipped (valid pixels < {self.minvalidpct}%): {lstszskipped}")
+        return lstszvalid
+
+    """
+    """
+    @staticmethod
+    def _manifestondone(manifest, szfiledescription, lstszdates, descriptor, szbandname):
+        """
+        job 'ondone' callable registering the exported dates in the manifest (if any)
+        """
+        if manifest is None: return None
+        pixeltype = descriptor['bands'][szbandname].get('type') or {}
+        szdtype   = pixeltype.get('precision', '')
+        if szdtype == 'int': szdtype += f"[{pixeltype.get('min')},{pixeltype.get('max')}]"
+        def _ondone():
+            manifest.adddates(szfiledescription, lstszdates, szdtype=szdtype, roi=descriptor['region'])
+            manifest.save()
+        return _ondone
+
+    """
+    """
+    def _perbandzipbufferhandler(self, szoutputdir, cube, szfiledescription, lstszdates, szbandname, transferscaling, verbose=False):
+        """
+        job 'zipbufferhandler' for the per band downloads of exportimages: 
+        appending to the cube (if any), decoding transfer encoded downloads (if so), or None for the default extraction
+        """
+        if cube is not None:
+            return functools.partial(
+                self._writecube, cube=cube, szfiledescription=szfiledescription, lstszdates=lstszdates, lstbandnames=[szbandname], transferscaling=transferscaling, verbose=verbose)
+        if transferscaling is not None:
+            return functools.partial(self._geemap_ee_extractzip, szdirname=szoutputdir, transferscaling=transferscaling, verbose=verbose)
+        return None
+
+    """
+    """
+    def _writecube(self, zipbuffer, cube, szfiledescription, lstszdates, lstbandnames, transferscaling=None, verbose=False):
+        """
+        post-processor for exportimages downloads with a cube as export target: appends the downloaded GeoTIFF members to the cube
+        - per band downloads (file_per_band): one single-band member per date, named szfilename.YYYY-MM-dd.tif
+        - masked values in Float32 and Float64 images ('-inf') are stored as nan
+        - transfer encoded downloads (transferscaling) are decoded
+        """
+        import re
+        import zipfile
+        import uuid
+        import numpy
+        import osgeo.gdal
+
+        osgeo.gdal.UseExceptions()
+        osgeo.gdal.PushErrorHandler('CPLQuietErrorHandler')
+        try:
+            dictdata     = {}
+            geotransform = None
+            projection   = None
+            nodata       = None
+            with zipfile.ZipFile(zipbuffer) as z:
+                lstmembers = [member for member in z.infolist() if member.filename.lower().endswith(".tif")]
+                for member in lstmembers:
+                    match  = re.search(r"(\d{4}-\d{2}-\d{2})\.tif$", member.filename)
+                    szdate = match.group(1) if match else (lstszdates[0] if len(lstmembers) == 1 and len(lstszdates) == 1 else None)
+                    if szdate not in lstszdates:
+                        raise ValueError(f"unexpected member {member.filename} in download for {szfiledescription}")
+                    szvsimemfilename = f"/vsimem/{uuid.uuid4().hex}.tif"
+                    osgeo.gdal.FileFromMemBuffer(szvsimemfilename, z.read(member))
+                    src_ds = None
+                    try:
+                        src_ds = osgeo.gdal.Open(szvsimemfilename)
+                        data   = src_ds.ReadAsArray()
+                        if data.ndim == 2: data = data[numpy.newaxis]
+                        geotransform = src_ds.GetGeoTransform()
+                        projection   = src_ds.GetProjection()
+                        nodata       = src_ds.GetRasterBand(1).GetNoDataValue()
+                    finally:
+                        src_ds = None
+                        osgeo.gdal.Unlink(szvsimemfilename)
+                    if transferscaling is not None:
+                        data = self._transferdecode(data, transferscaling)
+                    if numpy.issubdtype(data.dtype, numpy.floating):
+                        data[numpy.isneginf(data)] = numpy.nan
+                        nodata = math.nan
+                    dictdata[szdate] = data
+
+            if len(dictdata) != len(lstszdates):
+                raise ValueError(f"expected {len(lstszdates)} dates in download for {szfiledescription} - found {len(dictdata)}")
+            iappended = cube.append(szfiledescription, lstszdates, numpy.stack([dictdata[szdate] for szdate in lstszdates]),
+                                    geotransform, projection, nodata=nodata, lstbandnames=lstbandnames)
+            if verbose: print(f"{str(type(self).__name__)}._writecube - {iappended} dates of {szfiledescription} appended to {cube.szcubepath}")
+        finally:
+            osgeo.gdal.PopErrorHandler()
+
+    """
+    """
+    def _writergbstack(self, zipbuffer, lstszfilenames, lstbandnames, cube=None, szfiledescription=None, lstszdates=None, verbose=False):
+        """
+        post-processor for stacked 3-band downloads: splits the (3 x n)-band GeoTIFF into n 3-band images lstszfilenames
+        - the GeoTIFF member of the zip is handed to gdal via /vsimem/ - it never touches the disk as such
+        - the 3-band images are written as plain GTiff (as they would have been downloaded separately), or according to the outputprofile
+        - with a cube, the (n, 3, y, x) stack is appended to the cube iso written as files
+        """
+        import zipfile
+        import uuid
+        import numpy
+        import osgeo.gdal
 
-                except Exception as e:
-                    if verbose: print(f"{str(type(self).__name__)}._geemap_ee_export_image - Downloading data attempt {attempt} of {MAXATTEMPTS} failed")
-                    last_exception = e
-                    time.sleep(DELAY)   
+        osgeo.gdal.UseExceptions()
+        osgeo.gdal.PushErrorHandler('CPLQuietErrorHandler')
+        szvsimemfilename = f"/vsimem/{uuid.uuid4().hex}.tif"
+        src_ds = None
+        try:
+            with zipfile.ZipFile(zipbuffer) as z:
+                lstmembers = [member for member in z.infolist() if member.filename.lower().endswith(".tif")]
+                if len(lstmembers) != 1:
+                    raise ValueError(f"expected a single GeoTIFF in download - found {len(lstmembers)}")
+                osgeo.gdal.FileFromMemBuffer(szvsimemfilename, z.read(lstmembers[0]))
 
-            else: # for - else (for loop did not 'break')
-                if verbose: print(f"{str(type(self).__name__)}._geemap_ee_export_image {attempt} of {MAXATTEMPTS} failed - re-raising last Exception({str(last_exception)})")
-                raise last_exception
+            src_ds = osgeo.gdal.Open(szvsimemfilename)
+            if src_ds.RasterCount != 3 * len(lstszfilenames):
+                raise ValueError(f"expected {3 * len(lstszfilenames)} bands in download - found {src_ds.RasterCount}")
 
-        except Exception as e:
-            if verbose: print(f"{str(type(self).__name__)}._geemap_ee_export_image - An error occurred while downloading: Exception({str(e)})")
-            raise
+            if cube is not None:
+                data = src_ds.ReadAsArray().reshape((len(lstszfilenames), 3, src_ds.RasterYSize, src_ds.RasterXSize))
+                if numpy.issubdtype(data.dtype, numpy.floating): data[numpy.isneginf(data)] = numpy.nan
+                nodata = math.nan if numpy.issubdtype(data.dtype, numpy.floating) else src_ds.GetRasterBand(1).GetNoDataValue()
+                cube.append(szfiledescription, lstszdates, data, src_ds.GetGeoTransform(), src_ds.GetProjection(), nodata=nodata, lstbandnames=lstbandnames)
+                if verbose: print(f"{str(type(self).__name__)}._writergbstack - {len(lstszdates)} dates of {szfiledescription} appended to {cube.szcubepath}")
+                return
 
-        try:
-            z = zipfile.ZipFile(filename_zip)
-            z.extractall(os.path.dirname(filename))
-            z.close()
-            os.remove(filename_zip)
-    
-            if file_per_band:
-                if verbose: print(f"{str(type(self).__name__)}._geemap_ee_export_image - Data downloaded to {os.path.dirname(filename)}")
-            else:
-                if verbose: print(f"{str(type(self).__name__)}._geemap_ee_export_image - Data downloaded to {filename}")
-        except Exception as e:
-            if verbose: print(f"{str(type(self).__name__)}._geemap_ee_export_image - An error occurred while unzipping: Exception({str(e)})")
-            raise
+            for iIdx, szfilename in enumerate(lstszfilenames):
+                lstbands = [3*iIdx + 1, 3*iIdx + 2, 3*iIdx + 3]
+                if self.outputprofile is None:
+                    dst_ds = osgeo.gdal.Translate(szfilename, src_ds, format='GTiff', bandList=lstbands)
+                else:
+                    dst_ds = osgeo.gdal.Translate('', src_ds, format='MEM', bandList=lstbands)
+                for iband in range(3):
+                    dst_ds.GetRasterBand(iband+1).SetDescription(lstbandnames[iband])
+                if self.outputprofile is not None:
+                    geetiff.writeprofiled(dst_ds, szfilename, self.outputprofile, verbose=verbose)
+                dst_ds = None
+            if verbose: print(f"{str(type(self).__name__)}._writergbstack - {len(lstszfilenames)} 3-band images written")
 
+        finally:
+            src_ds = None
+            osgeo.gdal.Unlink(szvsimemfilename)
+            osgeo.gdal.PopErrorHandler()
 
     """
     exports the separate images to a local directory
     """
-    def exportimages(self, eeimagecollection, szoutputdir, szfilenameprefix="", verbose=False):
+    def exportimages(self, eeimagecollection, szoutputdir, szfilenameprefix="", manifest=None, cube=None, verbose=False):
         """
         wrap _exportimages to allow some retries to avoid sporadic "ee.ee_exception.EEException: Computation timed out."
         """
         return geeutils.wrapretry(
             self._exportimages, 
             args=(eeimagecollection, szoutputdir),
-            kwargs={'szfilenameprefix':szfilenameprefix, 'verbose':verbose},
-            attempts=8, backoffseconds=60, backofffactor=2, verbose=verbose) # max 1 + 2 + ... + 64 = 127 minutes
+            kwargs={'szfilenameprefix':szfilenameprefix, 'manifest':manifest, 'cube':cube, 'verbose':verbose},
+            attempts=3, backoffseconds=60, backofffactor=2, verbose=verbose) # downloads and evaluations are retried individually
 
-    def _exportimages(self, eeimagecollection, szoutputdir, szfilenameprefix="", verbose=False):
+    def _exportimages(self, eeimagecollection, szoutputdir, szfilenameprefix="", manifest=None, cube=None, descriptor=None, verbose=False):
         """
+        :param manifest: optional geemanifest.GEEManifest of szoutputdir (incremental export): 
+                         only dates missing in the manifest are exported, and exported dates are added to it (per downloaded chunk)
+        :param cube: optional geecube.GEECube of szoutputdir: downloads are appended to the cube iso written as separate files
+        :param descriptor: descriptor of eeimagecollection, in case it is known already (see _getgeecoldescriptor)
         """
         try:
             #
@@ -223,10 +1084,18 @@ class GEEExp(object):
             szoutputdir = os.path.normpath(szoutputdir)
             if not os.path.isdir(szoutputdir) :
                 raise ValueError(f"invalid szoutputdir ({str(szoutputdir)})")
+            checkpoint  = geemanifest.GEECheckpoint(szoutputdir, verbose=verbose) if self.usecheckpoint else None
             #
             # retrieve properties from GEECol eeimagecollection
             #
-            icollectionsize, exportregion, exportscale, szcollectiondescription, szbandnames = self._getgeecolproperties(eeimagecollection, verbose=verbose)
+            if descriptor is None:
+                descriptor          = self._getgeecoldescriptor(eeimagecollection, verbose=verbose)
+            icollectionsize         = descriptor['size']
+            exportregion            = descriptor['eeexportregion']
+            exportscale             = descriptor['scale']
+            szcollectiondescription = descriptor['description']
+            szbandnames             = descriptor['bandnames']
+            transferscaling         = self._transferscaling(descriptor)
             #
             # normal GEECol collections are expected to be single-banded
             # 
@@ -237,7 +1106,10 @@ class GEEExp(object):
             # but by stacking them first, and using the 'file_per_band' parameter in geemap_ee_export_image
             # we gain some performance.
             #
-            if 3 != len(szbandnames):
+            # the downloads themselves are described as 'jobs', generated on the fly and handed to _geemap_ee_export_images,
+            # which exports them sequentially, or - with maxconcurrentdownloads > 1 - several at once
+            #
+            def _gperbandjobs():
                 #
                 # actual export - per band
                 #    normal GEECol collections are expected to be single-banded
@@ -245,7 +1117,25 @@ class GEEExp(object):
                 #
                 for szbandname in szbandnames:
                     collection     = eeimagecollection.filter(ee.Filter.listContains('system:band_names', szbandname)).select([szbandname])
-                    collectionsize = collection.size().getInfo()
+                    collectionsize = descriptor['bands'][szbandname]['size']
+                    lstszdates     = descriptor['bands'][szbandname]['dates']
+                    #
+                    # file description - as in the filenames: szfiledescription.YYYY-MM-dd.tif
+                    #
+                    szfiledescription = f"{szfilenameprefix}{szcollectiondescription}_{szbandname}" if descriptor['bandsuffix'] else f"{szfilenameprefix}{szcollectiondescription}"
+                    #
+                    # incremental export: only the dates missing in the manifest
+                    #
+                    if manifest is not None:
+                        lstszdates = manifest.missingdates(szfiledescription, lstszdates)
+                        if verbose and len(lstszdates) < collectionsize: print(f"{str(type(self).__name__)}.exportimages - collection: {szcollectiondescription} band: {szbandname} images: {collectionsize} - {collectionsize - len(lstszdates)} in manifest")
+                    #
+                    # skip (nearly) empty dates
+                    #
+                    lstszdates = self._validdates(descriptor, szbandname, lstszdates, szfiledescription)
+                    if len(lstszdates) < collectionsize:
+                        collection     = collection.filter(ee.Filter.inList('gee_date', lstszdates))
+                        collectionsize = len(lstszdates)
                 
                     if verbose: print(f"{str(type(self).__name__)}.exportimages - collection: {szcollectiondescription} band: {szbandname} images: {collectionsize}")
             
@@ -254,12 +1144,15 @@ class GEEExp(object):
                     #    getDownloadURL downloads a zipped GeoTIFF
                     #    max file size for getDownloadURL is 32MB
                     #    loop per 100 - "Number of bands (xxx) must be less than or equal to 100."
+                    #    - or less if the request size limit requires so (see _imagesperdownload)
                     #    remark: since 2014 Earth Engine has been nagging getDownloadURL should be deprecated 
                     #
+                    iimagesperdownload = self._imagesperdownload(descriptor, szbandname)
                     offset  = 0
                     while offset < collectionsize:
-                        eelist  = collection.toList(MAXBANDS_PERDOWNLOAD, offset)
-                        offset += MAXBANDS_PERDOWNLOAD
+                        eelist  = collection.toList(iimagesperdownload, offset)
+                        lstszchunkdates = lstszdates[offset:offset + iimagesperdownload]
+                        offset += iimagesperdownload
                         #
                         # stack multiple single-band images into single multi-band image 
                         #    - exports faster than separate images
@@ -273,12 +1166,14 @@ class GEEExp(object):
                             nextimage = ee.Image(nextimage)
                             return ee.Image(previousstack).addBands(nextimage.rename(nextimage.date().format('YYYY-MM-dd')))
                         stackedimage = ee.Image(eelist.iterate(addimagebandstostack, ee.Image().select()))
+                        if transferscaling is not None:
+                            stackedimage = self._transferencode(stackedimage, transferscaling)
                         #
                         # filenames - again
                         #    file_per_band = True will create separate images per band, thereby appending .bandname to the filename parameter
                         #    => files will be: szfilename.bandname.tif - bandname being 'YYYY-MM-dd'
                         #
-                        if 1 < len(szbandnames):
+                        if descriptor['bandsuffix']:
                             # multi band images collection (exceptional)
                             szfilename  = os.path.join(szoutputdir, f"{szfilenameprefix}{szcollectiondescription}_{szbandname}.tif")
                         else:
@@ -287,38 +1182,92 @@ class GEEExp(object):
                         #
                         # export it (using (local) geemap.ee_export_image (clone), which uses ee.Image.getDownloadURL)
                         #
-                        self._geemap_ee_export_image(
-                            stackedimage,
-                            filename      = szfilename,
-                            scale         = exportscale,
-                            region        = exportregion,
-                            file_per_band = True,
-                            verbose       = verbose)
+                        yield {
+                            'ee_object'     : stackedimage,
+                            'filename'      : szfilename,
+                            'scale'         : exportscale,
+                            'region'        : exportregion,
+                            'file_per_band' : True,
+                            'jobkey'        : self._jobkey(szfilename, lstszchunkdates, cube=cube),
+                            'outputs'       : functools.partial(self._outputsexist, [(os.path.join(szoutputdir, f"{szfiledescription}.{szdate}.tif"), szfiledescription, szdate) for szdate in lstszchunkdates], cube=cube),
+                            'zipbufferhandler' : self._perbandzipbufferhandler(szoutputdir, cube, szfiledescription, lstszchunkdates, szbandname, transferscaling, verbose=verbose),
+                            'ondone'        : self._manifestondone(manifest, szfiledescription, lstszchunkdates, descriptor, szbandname)}
     
-                    if verbose: print(f"{str(type(self).__name__)}.exportimages - collection: {szcollectiondescription} band: {szbandname} images: {collectionsize} success")
-            else:
+                    if verbose: print(f"{str(type(self).__name__)}.exportimages - collection: {szcollectiondescription} band: {szbandname} images: {collectionsize} submitted")
+
+            def _grgbjobs():
                 #
                 # actual export - 'special' 3 band images - qgis et al. treat 3-band-images as rgb 
+                #    the images are stacked into multi-band downloads (up to 33 dates - 99 bands - per request),
+                #    which are split locally into the per-date 3-band images (see _writergbstack)
                 #
-                if verbose: print(f"{str(type(self).__name__)}.exportimages - collection: {szcollectiondescription} as {icollectionsize} 3-band images")
+                collection        = eeimagecollection
+                collectionsize    = icollectionsize
+                lstszdates        = descriptor['dates']
+                szfiledescription = f"{szfilenameprefix}{szcollectiondescription}"
+                #
+                # incremental export: only the dates missing in the manifest
+                #
+                if manifest is not None:
+                    lstszdates = manifest.missingdates(szfiledescription, lstszdates)
+                #
+                # skip (nearly) empty dates - considering the first band
+                #
+                lstszdates = self._validdates(descriptor, szbandnames[0], lstszdates, szfiledescription)
+                if len(lstszdates) < collectionsize:
+                    collection     = collection.filter(ee.Filter.inList('gee_date', lstszdates))
+                    collectionsize = len(lstszdates)
 
-                eelist  = eeimagecollection.toList(icollectionsize)
-                for iIdx in range(icollectionsize):
-                    eeimage    = ee.Image(eelist.get(iIdx))
-                    szyyyymmdd = geeutils.szISO8601Date(eeimage.get('gee_date'))
-                    szfilename  = os.path.join(szoutputdir, f"{szfilenameprefix}{szcollectiondescription}.{szyyyymmdd}.tif")
+                if verbose: print(f"{str(type(self).__name__)}.exportimages - collection: {szcollectiondescription} as {collectionsize} 3-band images")
+
+                iimagesperdownload = self._imagesperdownload(descriptor, szbandnames[0], ibandsperimage=3)
+                offset  = 0
+                while offset < collectionsize:
+                    eelist          = collection.toList(iimagesperdownload, offset)
+                    lstszchunkdates = lstszdates[offset:offset + iimagesperdownload]
+                    offset         += iimagesperdownload
+                    #
+                    # stack the 3-band images - bands in collection order: date0 band0..2, date1 band0..2, ...
+                    # (band names made unique, they are lost in the download anyway)
+                    #
+                    def addimagetostack(nextimage, previousstack):
+                        nextimage = ee.Image(nextimage)
+                        szprefix  = ee.String(nextimage.get('gee_date')).cat('_')
+                        return ee.Image(previousstack).addBands(nextimage.rename(nextimage.bandNames().map(lambda szband: szprefix.cat(szband))))
+                    stackedimage = ee.Image(eelist.iterate(addimagetostack, ee.Image().select()))
+                    #
+                    # final filenames - one per date - as before: szfilenameprefix + szcollectiondescription.YYYY-MM-dd.tif
+                    #
+                    lstszfilenames = [os.path.join(szoutputdir, f"{szfilenameprefix}{szcollectiondescription}.{szyyyymmdd}.tif") for szyyyymmdd in lstszchunkdates]
                     #
                     # export it (using (local) geemap.ee_export_image (clone), which uses ee.Image.getDownloadURL)
                     #
-                    self._geemap_ee_export_image(
-                        eeimage,
-                        filename      = szfilename,
-                        scale         = exportscale,
-                        region        = exportregion,
-                        file_per_band = False,
-                        verbose       = verbose)
-    
+                    yield {
+                        'ee_object'        : stackedimage,
+                        'filename'         : os.path.join(szoutputdir, f"{szfilenameprefix}{szcollectiondescription}_{lstszchunkdates[0]}_{lstszchunkdates[-1]}.tif"),
+                        'scale'            : exportscale,
+                        'region'           : exportregion,
+                        'file_per_band'    : False,
+                        'jobkey'           : self._jobkey(lstszfilenames[0], lstszchunkdates, cube=cube),
+                        'outputs'          : functools.partial(self._outputsexist, [(szfilename, szfiledescription, szdate) for szfilename, szdate in zip(lstszfilenames, lstszchunkdates)], cube=cube),
+                        'zipbufferhandler' : functools.partial(
+                            self._writergbstack, lstszfilenames=lstszfilenames, lstbandnames=szbandnames, 
+                            cube=cube, szfiledescription=szfiledescription, lstszdates=lstszchunkdates, verbose=verbose),
+                        'ondone'           : self._manifestondone(manifest, szfiledescription, lstszchunkdates, descriptor, szbandnames[0])}
+
+            #
+            # dispatch
+            #
+            if not descriptor['rgb']:
+                lstszjobkeys = self._geemap_ee_export_images(_gperbandjobs(), checkpoint=checkpoint, verbose=verbose)
+                if verbose: print(f"{str(type(self).__name__)}.exportimages - collection: {szcollectiondescription} bands: {szbandnames} success")
+            else:
+                lstszjobkeys = self._geemap_ee_export_images(_grgbjobs(), checkpoint=checkpoint, verbose=verbose)
                 if verbose: print(f"{str(type(self).__name__)}.exportimages - collection: {szcollectiondescription} as {icollectionsize} 3-band images success")
+            #
+            # export completed - the checkpoint has served its purpose
+            #
+            if checkpoint is not None: checkpoint.clear(lstszjobkeys)
     
         except Exception as e:
             if verbose: print(f"{str(type(self).__name__)}.exportimages - unhandled exception: {str(e)}")
@@ -328,6 +1277,220 @@ class GEEExp(object):
         return True
 
 
+    """
+    exports the separate images of several collections to a local directory, sharing downloads where possible
+    """
+    def exportimagesmulti(self, lsteeimagecollections, szoutputdir, szfilenameprefix="", manifest=None, cube=None, verbose=False):
+        """
+        wrap _exportimagesmulti to allow some retries to avoid sporadic "ee.ee_exception.EEException: Computation timed out."
+        """
+        return geeutils.wrapretry(
+            self._exportimagesmulti, 
+            args=(lsteeimagecollections, szoutputdir),
+            kwargs={'szfilenameprefix':szfilenameprefix, 'manifest':manifest, 'cube':cube, 'verbose':verbose},
+            attempts=3, backoffseconds=60, backofffactor=2, verbose=verbose) # downloads and evaluations are retried individually
+
+    def _exportimagesmulti(self, lsteeimagecollections, szoutputdir, szfilenameprefix="", manifest=None, cube=None, verbose=False):
+        """
+        exports several GEECol imagecollections (e.g. S2ndvi, S2fapar, S2scl and the mask products of a patch), 
+        with results identical to exportimages on each of them separately.
+
+        compatible collections - single band, same projection, region and pixel type, same transfer scaling - are stacked
+        into a single download per date chunk (all their images of up to MAXBANDS_PERDOWNLOAD/n dates), which is split
+        locally into the usual per-product files (szfilenameprefix + description.YYYY-MM-dd.tif) or appended to the cube.
+        - ee evaluates identical sub-expressions in a request once: products derived from the same S2 query, 
+          filter and daily mosaic share these within the download
+        - the collections need not have identical dates: each date chunk contains the images of each product on these dates
+        other collections are exported as by exportimages.
+        """
+        try:
+            szoutputdir = os.path.normpath(szoutputdir)
+            if not os.path.isdir(szoutputdir) :
+                raise ValueError(f"invalid szoutputdir ({str(szoutputdir)})")
+            checkpoint  = geemanifest.GEECheckpoint(szoutputdir, verbose=verbose) if self.usecheckpoint else None
+            #
+            # group the collections by 'compatibility' - in order of appearance
+            #
+            dictgroups = {}
+            for eeimagecollection in lsteeimagecollections:
+                descriptor = self._getgeecoldescriptor(eeimagecollection, verbose=verbose)
+                dictgroups.setdefault(self._multikey(descriptor), []).append((eeimagecollection, descriptor))
+
+            for szkey, lstmembers in dictgroups.items():
+                if szkey is None or len(lstmembers) == 1:
+                    for eeimagecollection, descriptor in lstmembers:
+                        self._exportimages(eeimagecollection, szoutputdir, szfilenameprefix=szfilenameprefix, manifest=manifest, cube=cube, descriptor=descriptor, verbose=verbose)
+                    continue
+                if verbose: print(f"{str(type(self).__name__)}.exportimagesmulti - stacking collections: {[descriptor['description'] for _, descriptor in lstmembers]}")
+                lstszjobkeys = self._geemap_ee_export_images(
+                    self._gmultijobs(lstmembers, szoutputdir, szfilenameprefix=szfilenameprefix, manifest=manifest, cube=cube, verbose=verbose), 
+                    checkpoint=checkpoint, verbose=verbose)
+                if checkpoint is not None: checkpoint.clear(lstszjobkeys)
+
+        except Exception as e:
+            if verbose: print(f"{str(type(self).__name__)}.exportimagesmulti - unhandled exception: {str(e)}")
+            logging.warning(f"{str(type(self).__name__)}.exportimagesmulti - unhandled exception: {str(e)}") 
+            raise
+
+        return True
+
+    """
+    """
+    def _multikey(self, descriptor):
+        """
+        collections with equal keys can share downloads in exportimagesmulti - None for collections which can not
+        """
+        import json
+
+        if 1 != len(descriptor['bandnames']): return None
+        #
+        # float bands are compatible whatever their (clamped) range - integer bands only with identical ranges
+        #
+        pixeltype = descriptor['bands'][descriptor['bandnames'][0]].get('type') or {}
+        if pixeltype.get('precision') in ('float', 'double'): pixeltype = {'precision': pixeltype.get('precision')}
+        return json.dumps({
+            'projection'     : descriptor['projection'],
+            'region'         : descriptor['region'],
+            'dimensions'     : descriptor['dimensions'],
+            'type'           : pixeltype,
+            'transferscaling': self._transferscaling(descriptor)}, sort_keys=True)
+
+    """
+    """
+    def _gmultijobs(self, lstmembers, szoutputdir, szfilenameprefix="", manifest=None, cube=None, verbose=False):
+        """
+        job generator for a group of compatible collections (see _exportimagesmulti) - lstmembers: [(eeimagecollection, descriptor), ...]
+        """
+        #
+        # per member: band, file description and dates to export (incremental export, skipping (nearly) empty dates)
+        #
+        lstitems = []
+        for eeimagecollection, descriptor in lstmembers:
+            szbandname        = descriptor['bandnames'][0]
+            szfiledescription = f"{szfilenameprefix}{descriptor['description']}_{szbandname}" if descriptor['bandsuffix'] else f"{szfilenameprefix}{descriptor['description']}"
+            lstszdates        = descriptor['bands'][szbandname]['dates']
+            if manifest is not None:
+                lstszdates = manifest.missingdates(szfiledescription, lstszdates)
+            lstszdates = self._validdates(descriptor, szbandname, lstszdates, szfiledescription)
+            if not lstszdates: continue
+            collection = eeimagecollection.select([szbandname]).filter(ee.Filter.inList('gee_date', lstszdates))
+            lstitems.append((collection, descriptor, szbandname, szfiledescription, lstszdates))
+        if not lstitems: return
+        #
+        # date chunks over the union of the dates - each date contributing (at most) one band per member
+        #
+        exportregion       = lstitems[0][1]['eeexportregion']
+        exportscale        = lstitems[0][1]['scale']
+        transferscaling    = self._transferscaling(lstitems[0][1])
+        lstszalldates      = sorted(set(szdate for item in lstitems for szdate in item[4]))
+        iimagesperdownload = min(self._imagesperdownload(item[1], item[2], ibandsperimage=len(lstitems)) for item in lstitems)
+        szmultiname        = "_".join(item[3] for item in lstitems)
+
+        for offset in range(0, len(lstszalldates), iimagesperdownload):
+            setszchunkdates = set(lstszalldates[offset:offset + iimagesperdownload])
+            stackedimage    = ee.Image().select()
+            lsttargets      = []
+            lstondone       = []
+            for iIdx, (collection, descriptor, szbandname, szfiledescription, lstszdates) in enumerate(lstitems):
+                lstszmemberdates = [szdate for szdate in lstszdates if szdate in setszchunkdates]
+                if not lstszmemberdates: continue
+                #
+                # stack the images of this member - band names made unique over the members (they are lost in the download anyway)
+                #
+                def addimagebandstostack(nextimage, previousstack, szprefix=f"m{iIdx}_"):
+                    nextimage = ee.Image(nextimage)
+                    return ee.Image(previousstack).addBands(nextimage.rename(ee.String(szprefix).cat(nextimage.date().format('YYYY-MM-dd'))))
+                subcol       = collection.filter(ee.Filter.inList('gee_date', lstszmemberdates))
+                stackedimage = ee.Image(subcol.iterate(addimagebandstostack, stackedimage))
+                lsttargets.extend([(os.path.join(szoutputdir, f"{szfiledescription}.{szdate}.tif"), szfiledescription, szdate, szbandname) for szdate in lstszmemberdates])
+                lstondone.append(self._manifestondone(manifest, szfiledescription, lstszmemberdates, descriptor, szbandname))
+
+            if transferscaling is not None:
+                stackedimage = self._transferencode(stackedimage, transferscaling)
+            szfilename = os.path.join(szoutputdir, f"{szmultiname}.tif")
+            lstszchunkdates = sorted(setszchunkdates)
+            yield {
+                'ee_object'        : stackedimage,
+                'filename'         : szfilename,
+                'scale'            : exportscale,
+                'region'           : exportregion,
+                'file_per_band'    : False,
+                'jobkey'           : self._jobkey(szfilename, lstszchunkdates, cube=cube),
+                'outputs'          : functools.partial(self._outputsexist, [(szfilename, szfiledescription, szdate) for szfilename, szfiledescription, szdate, _ in lsttargets], cube=cube),
+                'zipbufferhandler' : functools.partial(self._writemultistack, lsttargets=lsttargets, cube=cube, transferscaling=transferscaling, verbose=verbose),
+                'ondone'           : functools.partial(self._multiondone, [ondone for ondone in lstondone if ondone is not None])}
+
+            if verbose: print(f"{str(type(self).__name__)}.exportimagesmulti - {szmultiname}: {len(lsttargets)} images from {lstszchunkdates[0]} till {lstszchunkdates[-1]} submitted")
+
+    """
+    """
+    @staticmethod
+    def _multiondone(lstondone):
+        for ondone in lstondone: ondone()
+
+    """
+    """
+    def _writemultistack(self, zipbuffer, lsttargets, cube=None, transferscaling=None, verbose=False):
+        """
+        post-processor for exportimagesmulti downloads: splits the stacked GeoTIFF into the per-product, per-date images
+        - lsttargets: per band (in order) (szfilename, szfiledescription, szdate, szbandname)
+        - written as plain GTiff (as exportimages would have downloaded them), or according to the outputprofile
+        - with a cube, the images are appended to the cube per file description iso written as files
+        - transfer encoded downloads (transferscaling) are decoded (or labeled) as in exportimages
+        """
+        import zipfile
+        import uuid
+        import numpy
+        import osgeo.gdal
+
+        osgeo.gdal.UseExceptions()
+        osgeo.gdal.PushErrorHandler('CPLQuietErrorHandler')
+        szvsimemfilename = f"/vsimem/{uuid.uuid4().hex}.tif"
+        src_ds = None
+        try:
+            with zipfile.ZipFile(zipbuffer) as z:
+                lstmembers = [member for member in z.infolist() if member.filename.lower().endswith(".tif")]
+                if len(lstmembers) != 1:
+                    raise ValueError(f"expected a single GeoTIFF in download - found {len(lstmembers)}")
+                osgeo.gdal.FileFromMemBuffer(szvsimemfilename, z.read(lstmembers[0]))
+
+            src_ds = osgeo.gdal.Open(szvsimemfilename)
+            if src_ds.RasterCount != len(lsttargets):
+                raise ValueError(f"expected {len(lsttargets)} bands in download - found {src_ds.RasterCount}")
+
+            if cube is not None:
+                data = src_ds.ReadAsArray()
+                if data.ndim == 2: data = data[numpy.newaxis]
+                if transferscaling is not None: data = self._transferdecode(data, transferscaling)
+                if numpy.issubdtype(data.dtype, numpy.floating): data[numpy.isneginf(data)] = numpy.nan
+                nodata = math.nan if numpy.issubdtype(data.dtype, numpy.floating) else src_ds.GetRasterBand(1).GetNoDataValue()
+                dictbands = {}
+                for iband, (_, szfiledescription, _, _) in enumerate(lsttargets):
+                    dictbands.setdefault(szfiledescription, []).append(iband)
+                for szfiledescription, lstibands in dictbands.items():
+                    cube.append(szfiledescription, [lsttargets[iband][2] for iband in lstibands], data[lstibands], 
+                                src_ds.GetGeoTransform(), src_ds.GetProjection(), nodata=nodata, lstbandnames=[lsttargets[lstibands[0]][3]])
+                if verbose: print(f"{str(type(self).__name__)}._writemultistack - {len(lsttargets)} images appended to {cube.szcubepath}")
+                return
+
+            for iband, (szfilename, _, szdate, _) in enumerate(lsttargets):
+                dst_ds = osgeo.gdal.Translate('', src_ds, format='MEM', bandList=[iband + 1])
+                dst_ds.GetRasterBand(1).SetDescription(szdate)
+                if transferscaling is not None:
+                    dst_ds = self._transferdataset(dst_ds, transferscaling)
+                if self.outputprofile is None:
+                    osgeo.gdal.GetDriverByName('GTiff').CreateCopy(szfilename, dst_ds)
+                else:
+                    geetiff.writeprofiled(dst_ds, szfilename, self.outputprofile, verbose=verbose)
+                dst_ds = None
+            if verbose: print(f"{str(type(self).__name__)}._writemultistack - {len(lsttargets)} images written")
+
+        finally:
+            src_ds = None
+            osgeo.gdal.Unlink(szvsimemfilename)
+            osgeo.gdal.PopErrorHandler()
+
+
     """
     exports the images stacked as bands in a multiband image to a local directory
     """
@@ -339,20 +1502,11 @@ class GEEExp(object):
             self._exportimagestack, 
             args=(eeimagecollection, szoutputdir),
             kwargs={'szfilenameprefix':szfilenameprefix, 'verbose':verbose},
-            attempts=8, backoffseconds=60, backofffactor=2, verbose=verbose) # max 1 + 2 + ... + 64 = 127 minutes
+            attempts=3, backoffseconds=60, backofffactor=2, verbose=verbose) # downloads and evaluations are retried individually
 
     def _exportimagestack(self, eeimagecollection, szoutputdir, szfilenameprefix="", verbose=False):
         """
         """
-        import osgeo.gdal
-        #
-        # trying to avoid irrelevant gdal warnings
-        #    opening multiband exported file complains:  "Warning 1: TIFFReadDirectory:Sum of Photometric type-related color channels and ExtraSamples doesn't match SamplesPerPixel..."
-        #    SetNoDataValue on multiband copy complains: "Warning 1: Setting nodata to nan on band 1, but band 2 has nodata at -inf.
-        #
-        osgeo.gdal.UseExceptions()                           # considering all this nonsense
-        osgeo.gdal.PushErrorHandler('CPLQuietErrorHandler')  # one might be tempted to use rasterio
-
         try:
             #
             # check szoutputdir
@@ -360,88 +1514,87 @@ class GEEExp(object):
             szoutputdir = os.path.normpath(szoutputdir)
             if not os.path.isdir(szoutputdir) :
                 raise ValueError(f"invalid szoutputdir ({str(szoutputdir)})")
+            checkpoint  = geemanifest.GEECheckpoint(szoutputdir, verbose=verbose) if self.usecheckpoint else None
             #
             # retrieve properties from GEECol eeimagecollection
             #
-            icollectionsize, exportregion, exportscale, szcollectiondescription, szbandnames = self._getgeecolproperties(eeimagecollection, verbose=verbose)
-            #
-            # actual export - per band
-            #
-            for szbandname in szbandnames:
-                collection     = eeimagecollection.filter(ee.Filter.listContains('system:band_names', szbandname)).select([szbandname])
-                collectionsize = collection.size().getInfo()
-            
-                if verbose: print(f"{str(type(self).__name__)}.exportimagestack - collection: {szcollectiondescription} band: {szbandname} images: {collectionsize}")
-        
+            descriptor              = self._getgeecoldescriptor(eeimagecollection, verbose=verbose)
+            exportregion            = descriptor['eeexportregion']
+            exportscale             = descriptor['scale']
+            szcollectiondescription = descriptor['description']
+            szbandnames             = descriptor['bandnames']
+            transferscaling         = self._transferscaling(descriptor)
+
+            def _gstackjobs():
                 #
-                # download 
+                # actual export - per band
                 #
-                offset  = 0
-                while offset < collectionsize:
-                    subcol = ee.ImageCollection(collection.toList(MAXBANDS_PERDOWNLOAD, offset))
-                    offset += MAXBANDS_PERDOWNLOAD
-                    #
-                    # stack multiple single-band images into single multi-band image 
-                    #
-                    def addimagebandstostack(nextimage, previousstack):
-                        nextimage = ee.Image(nextimage)
-                        return ee.Image(previousstack).addBands(nextimage.rename(nextimage.date().format('YYYY-MM-dd')))
-                    stackedimage = ee.Image(subcol.iterate(addimagebandstostack, ee.Image().select()))
-                    #
-                    # filenames
-                    #
-                    szfirstdate = subcol.limit(1, 'system:time_start', True).first().date().format('YYYY-MM-dd').getInfo()
-                    szlastdate  = subcol.limit(1, 'system:time_start', False).first().date().format('YYYY-MM-dd').getInfo()
-                     
-                    if 1 < len(szbandnames):
-                        # multi band images collection (exceptional)
-                        szfilename  = os.path.join(szoutputdir, f"{szfilenameprefix}{szcollectiondescription}_{szbandname}_{szfirstdate}_{szlastdate}.tif")
-                    else:
-                        # single band images collection (expected)
-                        szfilename  = os.path.join(szoutputdir, f"{szfilenameprefix}{szcollectiondescription}_{szfirstdate}_{szlastdate}.tif")
-                    #
-                    # export it (using (local) geemap.ee_export_image (clone), which uses ee.Image.getDownloadURL
-                    #
-                    self._geemap_ee_export_image(
-                        stackedimage,
-                        filename      = szfilename,
-                        scale         = exportscale,
-                        region        = exportregion,
-                        file_per_band = False,
-                        verbose       = verbose)
+                for szbandname in szbandnames:
+                    collection     = eeimagecollection.filter(ee.Filter.listContains('system:band_names', szbandname)).select([szbandname])
+                    collectionsize = descriptor['bands'][szbandname]['size']
+                    lstszdates     = descriptor['bands'][szbandname]['dates']
                     #
-                    # downloading a multiband image via ee.Image.getDownloadURL, loses its bandnames,
-                    # we'll try to restore them via gdal ... nice.
+                    # skip (nearly) empty dates
                     #
-                    src_ds = osgeo.gdal.Open(szfilename)
-                    dst_ds = src_ds.GetDriver().CreateCopy(szfilename + ".tmp.tif", src_ds, options = ['COMPRESS=DEFLATE', 'PHOTOMETRIC=MINISBLACK'])
+                    lstszdates = self._validdates(descriptor, szbandname, lstszdates, f"{szfilenameprefix}{szcollectiondescription}")
+                    if len(lstszdates) < collectionsize:
+                        collection     = collection.filter(ee.Filter.inList('gee_date', lstszdates))
+                        collectionsize = len(lstszdates)
+                
+                    if verbose: print(f"{str(type(self).__name__)}.exportimagestack - collection: {szcollectiondescription} band: {szbandname} images: {collectionsize}")
+            
                     #
-                    #    restore band descriptions which are mysteriously lost in the ee.Image.getDownloadURL (current versions: ee 0.1.248, gee 0.8.12)
+                    # download 
                     #
-                    lstbandnames = stackedimage.bandNames().getInfo()
-                    for iband in range(src_ds.RasterCount):
-                        dst_ds.GetRasterBand(iband+1).SetDescription(lstbandnames[iband])
+                    iimagesperdownload = self._imagesperdownload(descriptor, szbandname)
+                    offset  = 0
+                    while offset < collectionsize:
+                        subcol = ee.ImageCollection(collection.toList(iimagesperdownload, offset))
                         #
-                        #    qgis chokes on '-inf' which is default for masked values in Float32 and Float64 images (current versions: ee 0.1.248, gee 0.8.12)
-                        #    while we're at it, we'll try to patch this too. that way the files should be compatible with exportimagestacktodrive results. 
+                        # band names (dates) of the stacked image - known from the descriptor, in collection order
                         #
-                        datatype = dst_ds.GetRasterBand(1).DataType
-                        if (datatype == osgeo.gdalconst.GDT_Float32) or (datatype == osgeo.gdalconst.GDT_Float64):
-                            rasterArray = dst_ds.GetRasterBand(iband+1).ReadAsArray()
-                            rasterArray[rasterArray == -math.inf] = math.nan
-                            dst_ds.GetRasterBand(iband+1).WriteArray(rasterArray)
-                            if (iband == 0) : dst_ds.GetRasterBand(iband+1).SetNoDataValue(math.nan)
-                    #
-                    #    cleanup - beware: this is bound to crash when you're viewing "previous" files e.g. in qgis.
-                    #
-                    dst_ds = None
-                    src_ds = None
-                    os.remove(szfilename)
-                    os.rename(szfilename + ".tmp.tif", szfilename)                    
+                        lstbandnames = lstszdates[offset:offset + iimagesperdownload]
+                        offset += iimagesperdownload
+                        #
+                        # stack multiple single-band images into single multi-band image 
+                        #
+                        def addimagebandstostack(nextimage, previousstack):
+                            nextimage = ee.Image(nextimage)
+                            return ee.Image(previousstack).addBands(nextimage.rename(nextimage.date().format('YYYY-MM-dd')))
+                        stackedimage = ee.Image(subcol.iterate(addimagebandstostack, ee.Image().select()))
+                        if transferscaling is not None:
+                            stackedimage = self._transferencode(stackedimage, transferscaling)
+                        #
+                        # filenames
+                        #
+                        szfirstdate = min(lstbandnames)
+                        szlastdate  = max(lstbandnames)
+                         
+                        if descriptor['bandsuffix']:
+                            # multi band images collection (exceptional)
+                            szfilename  = os.path.join(szoutputdir, f"{szfilenameprefix}{szcollectiondescription}_{szbandname}_{szfirstdate}_{szlastdate}.tif")
+                        else:
+                            # single band images collection (expected)
+                            szfilename  = os.path.join(szoutputdir, f"{szfilenameprefix}{szcollectiondescription}_{szfirstdate}_{szlastdate}.tif")
+                        #
+                        # export it (using (local) geemap.ee_export_image (clone), which uses ee.Image.getDownloadURL
+                        # the downloaded stack is not extracted as such, but post-processed by _writestack
+                        #
+                        yield {
+                            'ee_object'        : stackedimage,
+                            'filename'         : szfilename,
+                            'scale'            : exportscale,
+                            'region'           : exportregion,
+                            'file_per_band'    : False,
+                            'jobkey'           : self._jobkey(szfilename, lstbandnames),
+                            'outputs'          : functools.partial(self._outputsexist, [(szfilename, None, None)]),
+                            'zipbufferhandler' : functools.partial(self._writestack, szfilename=szfilename, lstbandnames=lstbandnames, transferscaling=transferscaling, verbose=verbose)}
 
-                    if verbose: print(f"{str(type(self).__name__)}.exportimagestack - collection: {szcollectiondescription} band: {szbandname} stack first: {szfirstdate} last: {szlastdate} success")
+                        if verbose: print(f"{str(type(self).__name__)}.exportimagestack - collection: {szcollectiondescription} band: {szbandname} stack first: {szfirstdate} last: {szlastdate} submitted")
 
-                if verbose: print(f"{str(type(self).__name__)}.exportimagestack - collection: {szcollectiondescription} band: {szbandname} images: {collectionsize} success")
+            lstszjobkeys = self._geemap_ee_export_images(_gstackjobs(), checkpoint=checkpoint, verbose=verbose)
+            if checkpoint is not None: checkpoint.clear(lstszjobkeys)
+            if verbose: print(f"{str(type(self).__name__)}.exportimagestack - collection: {szcollectiondescription} bands: {szbandnames} success")
     
         except Exception as e:
             if verbose: print(f"{str(type(self).__name__)}.exportimagestack - unhandled exception: {str(e)}")
@@ -450,62 +1603,337 @@ class GEEExp(object):
     
         return True        
 
+    """
+    """
+    def _writestack(self, zipbuffer, szfilename, lstbandnames, transferscaling=None, verbose=False):
+        """
+        post-processor for exportimagestack downloads: writes the downloaded stack to its final szfilename in a single pass
+        - the GeoTIFF member of the zip is handed to gdal via /vsimem/ - it never touches the disk as such
+        - downloading a multiband image via ee.Image.getDownloadURL, loses its bandnames, we restore them from lstbandnames
+          (known client side: the dates in the descriptor)
+        - qgis chokes on '-inf' which is default for masked values in Float32 and Float64 images (current versions: ee 0.1.248, gee 0.8.12)
+          while we're at it, we'll patch this too - vectorized over a block of bands at once.
+          that way the files should be compatible with exportimagestacktodrive results. 
+        - large stacks are processed block-wise, keeping at most STACKBLOCKBYTES in memory
+        - transfer encoded downloads (transferscaling) are decoded to float32 (nan), or kept as int16 with scale metadata (transferdecode)
+        """
+        import zipfile
+        import uuid
+        import numpy
+        import osgeo.gdal
+        import osgeo.gdal_array
+
+        STACKBLOCKBYTES = 64 * 1024 * 1024
+        #
+        # trying to avoid irrelevant gdal warnings
+        #    opening multiband exported file complains:  "Warning 1: TIFFReadDirectory:Sum of Photometric type-related color channels and ExtraSamples doesn't match SamplesPerPixel..."
+        #    SetNoDataValue on multiband copy complains: "Warning 1: Setting nodata to nan on band 1, but band 2 has nodata at -inf.
+        #    remark: gdal error handlers are per thread - this might run in a worker thread
+        #
+        osgeo.gdal.UseExceptions()                           # considering all this nonsense
+        osgeo.gdal.PushErrorHandler('CPLQuietErrorHandler')  # one might be tempted to use rasterio
+
+        szvsimemfilename = f"/vsimem/{uuid.uuid4().hex}.tif"
+        src_ds = None
+        dst_ds = None
+        try:
+            with zipfile.ZipFile(zipbuffer) as z:
+                lstmembers = [member for member in z.infolist() if member.filename.lower().endswith(".tif")]
+                if len(lstmembers) != 1:
+                    raise ValueError(f"expected a single GeoTIFF in download - found {len(lstmembers)}")
+                osgeo.gdal.FileFromMemBuffer(szvsimemfilename, z.read(lstmembers[0]))
+
+            src_ds = osgeo.gdal.Open(szvsimemfilename)
+            if src_ds.RasterCount != len(lstbandnames):
+                raise ValueError(f"expected {len(lstbandnames)} bands in download - found {src_ds.RasterCount}")
+
+            ixsize    = src_ds.RasterXSize
+            iysize    = src_ds.RasterYSize
+            ibands    = src_ds.RasterCount
+            datatype  = src_ds.GetRasterBand(1).DataType
+            bisfloat  = (datatype == osgeo.gdalconst.GDT_Float32) or (datatype == osgeo.gdalconst.GDT_Float64)
+            nptype    = osgeo.gdal_array.GDALTypeCodeToNumericTypeCode(datatype)
+            bdecode   = (transferscaling is not None) and self.transferdecode
+            dsttype   = osgeo.gdalconst.GDT_Float32 if bdecode else datatype
+
+            #
+            #    default: written directly as DEFLATE GTiff
+            #    output profile: staged in a MEM dataset, and copied according to the profile (COG e.g. can only be created by copy)
+            #
+            if self.outputprofile is None:
+                dst_ds = osgeo.gdal.GetDriverByName('GTiff').Create(szfilename, ixsize, iysize, ibands, dsttype, options = ['COMPRESS=DEFLATE', 'PHOTOMETRIC=MINISBLACK'])
+            else:
+                dst_ds = osgeo.gdal.GetDriverByName('MEM').Create('', ixsize, iysize, ibands, dsttype)
+            dst_ds.SetGeoTransform(src_ds.GetGeoTransform())
+            dst_ds.SetProjection(src_ds.GetProjection())
+            #
+            #    block-wise: as many bands as fit in STACKBLOCKBYTES (typically the whole stack)
+            #
+            iblockbands = max(1, STACKBLOCKBYTES // max(1, ixsize * iysize * numpy.dtype(nptype).itemsize))
+            for ifirstband in range(0, ibands, iblockbands):
+                icount = min(iblockbands, ibands - ifirstband)
+                block  = numpy.empty((icount, iysize, ixsize), dtype=nptype)
+                for iIdx in range(icount):
+                    block[iIdx] = src_ds.GetRasterBand(ifirstband + iIdx + 1).ReadAsArray()
+                if bisfloat:
+                    block[numpy.isneginf(block)] = numpy.nan
+                if bdecode:
+                    block = self._transferdecode(block, transferscaling)
+                for iIdx in range(icount):
+                    dst_ds.GetRasterBand(ifirstband + iIdx + 1).WriteArray(block[iIdx])
+            #
+            #    restore band descriptions which are mysteriously lost in the ee.Image.getDownloadURL (current versions: ee 0.1.248, gee 0.8.12)
+            #
+            for iband in range(ibands):
+                dst_ds.GetRasterBand(iband+1).SetDescription(lstbandnames[iband])
+            if bisfloat or bdecode:
+                dst_ds.GetRasterBand(1).SetNoDataValue(math.nan)
+            elif transferscaling is not None:
+                for iband in range(ibands):
+                    dst_ds.GetRasterBand(iband+1).SetScale(transferscaling[0])
+                    dst_ds.GetRasterBand(iband+1).SetOffset(transferscaling[1])
+                dst_ds.GetRasterBand(1).SetNoDataValue(TRANSFER_INT16NODATA)
+            elif src_ds.GetRasterBand(1).GetNoDataValue() is not None:
+                dst_ds.GetRasterBand(1).SetNoDataValue(src_ds.GetRasterBand(1).GetNoDataValue())
+
+            if self.outputprofile is not None:
+                geetiff.writeprofiled(dst_ds, szfilename, self.outputprofile, verbose=verbose)
+
+            if verbose: print(f"{str(type(self).__name__)}._writestack - {ibands} bands written to {szfilename}")
+
+        finally:
+            dst_ds = None
+            src_ds = None
+            osgeo.gdal.Unlink(szvsimemfilename)
+            osgeo.gdal.PopErrorHandler()
 
-    #####################################################################################
-    #
-    #    export the GEECol imagecollection to google drive
-    #
-    #####################################################################################
 
     """
     """
-    def _starteetask(self, task, iattempt=0, verbose=False):
+    @staticmethod
+    def _arraysgrid(descriptor):
         """
-        helper: wrapper around ee.batch.Task.start()
-        - waits SLEEPTOOMUCHTASKS in case more tasks then MAXACTIVETASKS already in queue
-        - waits SLEEPAFTEREXCEPTION and retries maximum MAXATTEMPTS in case an exception occured
-        remark: in case of less considerate colleague processes stuffing the queue, this might not work
+        computePixels grid and gdal geotransform of the patch, from the descriptor 'projection', 'pixelorigin' and 'dimensions'
+        """
+        projection = descriptor['projection']
+        a, b, c, d, e, f = projection['transform']
+        ix, iy       = descriptor['pixelorigin']
+        geotransform = [c + a*ix + b*iy, a, b, f + d*ix + e*iy, d, e]
+        grid = {
+            'dimensions'     : {'width': descriptor['dimensions'][0], 'height': descriptor['dimensions'][1]},
+            'affineTransform': {'scaleX': geotransform[1], 'shearX': geotransform[2], 'translateX': geotransform[0],
+                                'shearY': geotransform[4], 'scaleY': geotransform[5], 'translateY': geotransform[3]}}
+        if 'crs' in projection: grid['crsCode'] = projection['crs']
+        else:                   grid['crsWkt']  = projection['wkt']
+        return grid, geotransform
+
+    """
+    """
+    def _computepixels(self, eeimage, grid, pixelsource, verbose=False):
+        """
+        single computePixels request (with retries) - returns numpy structured array (y, x) with a field per band
+        """
+        request = {'expression': eeimage, 'fileFormat': 'NUMPY_NDARRAY', 'grid': grid}
+        #
+        #    wrapped: wrapretry needs a __name__, which partials and callable objects (stand-ins) lack
+        #
+        def _computepixels(request):
+            return pixelsource(request)
+        return geeutils.wrapretry(
+            _computepixels,
+            args=(request,),
+            attempts=3, backoffseconds=10, backofffactor=1, verbose=verbose)
+
+    """
+    exports the collection as numpy array (dates, y, x) - in memory, optionally persisted
+    """
+    def exportarrays(self, eeimagecollection, szbandname=None, szoutputdir=None, szoutputformat="NPZ", szfilenameprefix="", pixelsource=None, verbose=False):
         """
+        wrap _exportarrays to allow some retries to avoid sporadic "ee.ee_exception.EEException: Computation timed out."
+        """
+        return geeutils.wrapretry(
+            self._exportarrays, 
+            args=(eeimagecollection,),
+            kwargs={'szbandname':szbandname, 'szoutputdir':szoutputdir, 'szoutputformat':szoutputformat, 'szfilenameprefix':szfilenameprefix, 'pixelsource':pixelsource, 'verbose':verbose},
+            attempts=3, backoffseconds=60, backofffactor=2, verbose=verbose) # chunks are retried individually (_computepixels)
 
-        SLEEPTOOMUCHTASKS        = 120
-        SLEEPAFTEREXCEPTION      = 60
-        MAXACTIVETASKS           = 100
-        MAXATTEMPTS              = 3
+    def _exportarrays(self, eeimagecollection, szbandname=None, szoutputdir=None, szoutputformat="NPZ", szfilenameprefix="", pixelsource=None, verbose=False):
+        """
+        fetch the pixels of band szbandname (default: the first band) of the GEECol collection via computePixels
 
-        def _activertaskscount():
-            taskslist       = ee.batch.Task.list()
-            activetaskslist = [task for task in taskslist if task.state in (
-                ee.batch.Task.State.READY,
-                ee.batch.Task.State.RUNNING,
-                ee.batch.Task.State.CANCEL_REQUESTED)]
-            activertaskscount = len(activetaskslist)
-            if verbose: print(f"{str(type(self).__name__)}._starteetask._activertaskscount: {activertaskscount} tasks active")
-            return activertaskscount
+        returns a dict:
+            'description'  : collection description
+            'bandname'     : band name
+            'dates'        : list of 'YYYY-MM-dd' dates along axis 0
+            'data'         : numpy array (dates, y, x) - masked float pixels as nan
+            'geotransform' : gdal geotransform of the patch
+            'projection'   : 'gee_projection' (crs, transform)
 
-        try:
-            while _activertaskscount() >= MAXACTIVETASKS:
-                if verbose: print(f"{str(type(self).__name__)}._starteetask: sleep a while for gee")
-                time.sleep(SLEEPTOOMUCHTASKS)
-            if verbose: print(f"{str(type(self).__name__)}._starteetask(attempt:{iattempt}): starting task")
-            task.start()
-            if verbose: print(f"{str(type(self).__name__)}._starteetask(attempt:{iattempt}): task started")
-            return True
+        :param szoutputdir: optional - persist the result in szoutputdir in szoutputformat (ARRAYS_OUTPUTFORMATS)
+            "NPZ"   : numpy .npz archive szdescription_first_last.npz with data, dates, geotransform and crs
+            "GTIFF" : multiband GeoTIFF szdescription_first_last.tif as exportimagestack (using the outputprofile if any)
+            "CUBE"  : appended to the geecube.GEECube of szoutputdir
+        :param pixelsource: callable(request) returning the numpy structured array for a computePixels request dict.
+                            defaults to ee.data.computePixels; can be replaced by a local stand-in. e.g.
+            class FakePixels():
+                def __init__(self, idates): self.idates = idates   # dates per request
+                def __call__(self, request):
+                    dimensions = request['grid']['dimensions']
+                    return numpy.zeros((dimensions['height'], dimensions['width']), dtype=[(f"d{i}", 'f4') for i in range(self.idates)])
+            result = GEEExp().exportarrays(eecollection, pixelsource=FakePixels(3))  # collection of (at most) 3 dates
+        """
+        import numpy
 
-        except Exception as e:
-            if verbose: print(f"{str(type(self).__name__)}._starteetask(attempt:{iattempt}): exception: {str(e)}")
-            iattempt += 1
-            if iattempt < MAXATTEMPTS:
-                #
-                #    sleep a while, and try again.
-                #
-                time.sleep(SLEEPAFTEREXCEPTION)
-                if verbose: print(f"{str(type(self).__name__)}._starteetask(attempt:{iattempt-1}): exception - retry")
-                self._starteetask(task, iattempt, verbose=verbose)
+        if pixelsource is None: pixelsource = ee.data.computePixels
+        if szoutputdir is not None:
+            szoutputdir = os.path.normpath(szoutputdir)
+            if not os.path.isdir(szoutputdir)           : raise ValueError(f"invalid szoutputdir ({str(szoutputdir)})")
+            if szoutputformat not in ARRAYS_OUTPUTFORMATS : raise ValueError(f"invalid szoutputformat '{szoutputformat}' - expected one of {ARRAYS_OUTPUTFORMATS}")
+        #
+        # retrieve properties from GEECol eeimagecollection
+        #
+        descriptor              = self._getgeecoldescriptor(eeimagecollection, verbose=verbose)
+        szcollectiondescription = descriptor['description']
+        if szbandname is None: szbandname = descriptor['bandnames'][0]
+        if szbandname not in descriptor['bands']:
+            raise geeutils.NoRetryInvalidCollectionException(f"{str(type(self).__name__)}.exportarrays: band {szbandname} not in collection {szcollectiondescription}")
+
+        collection     = eeimagecollection.filter(ee.Filter.listContains('system:band_names', szbandname)).select([szbandname])
+        collectionsize = descriptor['bands'][szbandname]['size']
+        lstszdates     = descriptor['bands'][szbandname]['dates']
+        bisfloat       = descriptor['bands'][szbandname]['type'].get('precision') in ('float', 'double')
+        grid, geotransform = self._arraysgrid(descriptor)
+        #
+        # skip (nearly) empty dates
+        #
+        lstszdates = self._validdates(descriptor, szbandname, lstszdates, szcollectiondescription)
+        if len(lstszdates) < collectionsize:
+            collection     = collection.filter(ee.Filter.inList('gee_date', lstszdates))
+            collectionsize = len(lstszdates)
+        #
+        # fetch per chunk - stacking single-band images into a multi-band image as in exportimages
+        #
+        def addimagebandstostack(nextimage, previousstack):
+            nextimage = ee.Image(nextimage)
+            return ee.Image(previousstack).addBands(nextimage.rename(nextimage.date().format('YYYY-MM-dd')))
+
+        iimagesperdownload = self._imagesperdownload(descriptor, szbandname)
+        lstchunks = []
+        offset    = 0
+        while offset < collectionsize:
+            eelist       = collection.toList(iimagesperdownload, offset)
+            stackedimage = ee.Image(eelist.iterate(addimagebandstostack, ee.Image().select()))
+            if bisfloat: stackedimage = stackedimage.unmask(ARRAYS_FLOATNODATA, False)
+            pixels       = self._computepixels(stackedimage, grid, pixelsource, verbose=verbose)
+            #
+            # structured array: a field per band - band names being the dates, hence in collection order
+            #
+            lstszchunkdates = lstszdates[offset:offset + iimagesperdownload]
+            if len(pixels.dtype.names) != len(lstszchunkdates):
+                raise ValueError(f"expected {len(lstszchunkdates)} bands from computePixels - found {len(pixels.dtype.names)}")
+            lstchunks.append(numpy.stack([pixels[szname] for szname in pixels.dtype.names]))
+            offset += iimagesperdownload
+            if verbose: print(f"{str(type(self).__name__)}.exportarrays - collection: {szcollectiondescription} band: {szbandname} {min(offset, collectionsize)} of {collectionsize} dates")
+
+        if lstchunks:
+            data = numpy.concatenate(lstchunks)
+        else:
+            data = numpy.empty((0, descriptor['dimensions'][1], descriptor['dimensions'][0]), dtype=numpy.float32 if bisfloat else numpy.int32)
+        if bisfloat:
+            data[data <= ARRAYS_FLOATNODATA] = numpy.nan
+
+        result = {
+            'description' : szcollectiondescription,
+            'bandname'    : szbandname,
+            'dates'       : lstszdates,
+            'data'        : data,
+            'geotransform': geotransform,
+            'projection'  : descriptor['projection']}
+
+        if szoutputdir is not None and 0 < len(lstszdates):
+            self._writearrays(result, szoutputdir, szoutputformat, szfilenameprefix, multiband=descriptor['bandsuffix'], verbose=verbose)
+        return result
+
+    """
+    """
+    def _writearrays(self, result, szoutputdir, szoutputformat, szfilenameprefix="", multiband=False, verbose=False):
+        """
+        persist an exportarrays result
+        """
+        import numpy
+
+        szfiledescription = f"{szfilenameprefix}{result['description']}_{result['bandname']}" if multiband else f"{szfilenameprefix}{result['description']}"
+        lstszdates        = result['dates']
+        data              = result['data']
+        bisfloat          = numpy.issubdtype(data.dtype, numpy.floating)
+        szcrs             = result['projection'].get('crs', result['projection'].get('wkt'))
+        szfirstdate       = sorted(lstszdates)[0]
+        szlastdate        = sorted(lstszdates)[-1]
+
+        if szoutputformat == "NPZ":
+            szfilename = os.path.join(szoutputdir, f"{szfiledescription}_{szfirstdate}_{szlastdate}.npz")
+            numpy.savez_compressed(szfilename, data=data, dates=numpy.array(lstszdates), geotransform=numpy.array(result['geotransform']), crs=numpy.array(szcrs))
+
+        elif szoutputformat == "GTIFF":
+            import osgeo.gdal
+            import osgeo.gdal_array
+            import osgeo.osr
+            osgeo.gdal.UseExceptions()
+            szfilename = os.path.join(szoutputdir, f"{szfiledescription}_{szfirstdate}_{szlastdate}.tif")
+            srs = osgeo.osr.SpatialReference()
+            srs.SetFromUserInput(szcrs)
+            datatype = osgeo.gdal_array.NumericTypeCodeToGDALTypeCode(data.dtype)
+            if self.outputprofile is None:
+                dst_ds = osgeo.gdal.GetDriverByName('GTiff').Create(szfilename, data.shape[2], data.shape[1], data.shape[0], datatype, options = ['COMPRESS=DEFLATE', 'PHOTOMETRIC=MINISBLACK'])
+            else:
+                dst_ds = osgeo.gdal.GetDriverByName('MEM').Create('', data.shape[2], data.shape[1], data.shape[0], datatype)
+            try:
+                dst_ds.SetGeoTransform(result['geotransform'])
+                dst_ds.SetProjection(srs.ExportToWkt())
+                for iband in range(data.shape[0]):
+                    dst_ds.GetRasterBand(iband+1).WriteArray(data[iband])
+                    dst_ds.GetRasterBand(iband+1).SetDescription(lstszdates[iband])
+                if bisfloat: dst_ds.GetRasterBand(1).SetNoDataValue(math.nan)
+                if self.outputprofile is not None:
+                    geetiff.writeprofiled(dst_ds, szfilename, self.outputprofile, verbose=verbose)
+            finally:
+                dst_ds = None
+
+        elif szoutputformat == "CUBE":
+            import geecube
+            cube       = geecube.GEECube(szoutputdir, verbose=verbose)
+            szfilename = cube.szcubepath
             #
-            #    give it up.
+            # projection as wkt - as in the cubes filled via exportimages (gdal)
             #
-            if verbose: print(f"{str(type(self).__name__)}._starteetask(attempt:{iattempt}): exception - exits")
-            return False      
+            import osgeo.osr
+            srs = osgeo.osr.SpatialReference()
+            srs.SetFromUserInput(szcrs)
+            cube.append(szfiledescription, lstszdates, data, result['geotransform'], srs.ExportToWkt(), nodata=math.nan if bisfloat else None, lstbandnames=[result['bandname']])
+
+        if verbose: print(f"{str(type(self).__name__)}._writearrays - {len(lstszdates)} dates of {szfiledescription} written to {szfilename}")
+
+
+    #####################################################################################
+    #
+    #    export the GEECol imagecollection to google drive
+    #
+    #####################################################################################
+
+    """
+    """
+    def _starteetask(self, task, verbose=False):
+        """
+        helper: start ee.batch.Task via the (shared) GEETaskScheduler, which takes care of
+        - waiting in case more than maxactivetasks are already in the queue (using a cached view of the queue)
+        - pacing the submissions
+        - retries in case an exception occurred
+        remark: in case of less considerate colleague processes stuffing the queue, this might not work
+        """
+        if verbose: print(f"{str(type(self).__name__)}._starteetask: starting task")
+        bstarted = self.taskscheduler.submit(task)
+        if verbose: print(f"{str(type(self).__name__)}._starteetask: task {'started' if bstarted else 'failed'} - throughput {self.taskscheduler.throughput()}")
+        return bstarted
 
 
     """
@@ -518,7 +1946,11 @@ class GEEExp(object):
             #
             # retrieve properties from GEECol eeimagecollection
             #
-            icollectionsize, exportregion, exportscale, szcollectiondescription, szbandnames = self._getgeecolproperties(eeimagecollection, verbose=verbose)
+            descriptor              = self._getgeecoldescriptor(eeimagecollection, verbose=verbose)
+            exportregion            = descriptor['eeexportregion']
+            exportscale             = descriptor['scale']
+            szcollectiondescription = descriptor['description']
+            szbandnames             = descriptor['bandnames']
             #
             # actual export - per band
             #    normal GEECol collections are expected to be single-banded
@@ -528,7 +1960,7 @@ class GEEExp(object):
             #
             for szbandname in szbandnames:
                 collection     = eeimagecollection.filter(ee.Filter.listContains('system:band_names', szbandname)).select([szbandname])
-                collectionsize = collection.size().getInfo()
+                collectionsize = descriptor['bands'][szbandname]['size']
             
                 if verbose: print(f"{str(type(self).__name__)}.exportimagestodrive - collection: {szcollectiondescription} band: {szbandname} images: {collectionsize}")
     
@@ -537,12 +1969,12 @@ class GEEExp(object):
                 # for small files even exportseparateimages is faster
                 # apparently ee.batch.Export.image.toDrive creates a lot of overhead
                 #
-                eelist = collection.toList(collection.size())
-                for iIdx in range(collection.size().getInfo()):
+                eelist = collection.toList(collectionsize)
+                for iIdx in range(collectionsize):
                     eeimage     = ee.Image(eelist.get(iIdx))
         
-                    szyyyymmdd  = geeutils.szISO8601Date(eeimage.get('gee_date'))
-                    if 1 < len(szbandnames):
+                    szyyyymmdd  = descriptor['bands'][szbandname]['dates'][iIdx]
+                    if descriptor['bandsuffix']:
                         # multi band images collection (exceptional)
                         szfilename  = f"{szfilenameprefix}{szcollectiondescription}_{szbandname}.{szyyyymmdd}"
                     else:
@@ -586,7 +2018,7 @@ class GEEExp(object):
             self._exportimagestacktodrive, 
             args=(eeimagecollection, szgdrivefolder),
             kwargs={'szfilenameprefix':szfilenameprefix, 'verbose':verbose},
-            attempts=8, backoffseconds=60, backofffactor=2, verbose=verbose) # max 1 + 2 + ... + 64 = 127 minutes
+            attempts=3, backoffseconds=60, backofffactor=2, verbose=verbose) # task starts are retried individually (GEETaskScheduler)
 
     def _exportimagestacktodrive(self, eeimagecollection, szgdrivefolder, szfilenameprefix="", verbose=False):
         """
@@ -595,7 +2027,11 @@ class GEEExp(object):
             #
             # retrieve properties from GEECol eeimagecollection
             #
-            icollectionsize, exportregion, exportscale, szcollectiondescription, szbandnames = self._getgeecolproperties(eeimagecollection, verbose=verbose)
+            descriptor              = self._getgeecoldescriptor(eeimagecollection, verbose=verbose)
+            exportregion            = descriptor['eeexportregion']
+            exportscale             = descriptor['scale']
+            szcollectiondescription = descriptor['description']
+            szbandnames             = descriptor['bandnames']
             #
             # actual export - per band
             #    normal GEECol collections are expected to be single-banded
@@ -606,7 +2042,8 @@ class GEEExp(object):
                 #    yes, mosaic should have sorted them already, but better safe then sorry.
                 #
                 collection     = eeimagecollection.filter(ee.Filter.listContains('system:band_names', szbandname)).select([szbandname]).sort('system:time_start')
-                collectionsize = collection.size().getInfo()
+                collectionsize = descriptor['bands'][szbandname]['size']
+                lstsorteddates = sorted(descriptor['bands'][szbandname]['dates'])
             
                 if verbose: print(f"{str(type(self).__name__)}.exportimagestacktodrive - collection: {szcollectiondescription} band: {szbandname} images: {collectionsize}")
     
@@ -617,6 +2054,7 @@ class GEEExp(object):
                 offset  = 0
                 while offset < collectionsize:
                     subcol = ee.ImageCollection(collection.toList(MAXBANDS_PERTODRIVE, offset))
+                    lstsubcoldates = lstsorteddates[offset:offset + MAXBANDS_PERTODRIVE]
                     offset += MAXBANDS_PERTODRIVE
                     #
                     # stack multiple single-band images into single multi-band image 
@@ -628,10 +2066,10 @@ class GEEExp(object):
                     #
                     #    need these for some distinct filename.
                     #
-                    szfirstdate = subcol.limit(1, 'system:time_start', True).first().date().format('YYYY-MM-dd').getInfo()
-                    szlastdate  = subcol.limit(1, 'system:time_start', False).first().date().format('YYYY-MM-dd').getInfo()
+                    szfirstdate = lstsubcoldates[0]
+                    szlastdate  = lstsubcoldates[-1]
         
-                    if 1 < len(szbandnames):
+                    if descriptor['bandsuffix']:
                         # multi band images collection (exceptional)
                         szfilename  = f"{szfilenameprefix}{szcollectiondescription}_{szbandname}_{szfirstdate}_{szlastdate}"
                     else:
@@ -0,0 +1,306 @@
+"""
+client side reference grid: pixel snapping, reference roi and destination projections without server round trips
+
+geeutils.pixelcenterpoint, pixelinterspoint and squarerasterboundsroi do plain arithmetic on an affine grid, but
+they do it server side: each of them adds 'sample', 'transform', 'buffer' and 'bounds' expressions, which are
+(re-)evaluated in every request using the reference roi, and which need round trips as soon as the client wants to know
+where the roi ended up. GEERefGrid does the same arithmetic client side:
+
+- the reference image and its grid (crs and transform) are looked up in a single round trip (lookup),
+  from raw collection metadata if the reference product allows so (GEECol.refgridcollection)
+- the point is projected into the crs with pyproj, and snapped to a pixel center or a pixel intersection
+- the square roi and the translated/scaled destination projections are client side constants (ee.Geometry, ee.Projection)
+
+coordinates are in reference pixels - as in the server side versions: the roi and center point are geometries in
+the reference image projection, the roi corners are on the reference pixel raster.
+
+tolerance: the client side results match the server side versions within GRID_TOLERANCE_PIXELS reference pixels
+    - snapping: identical, except for points within the tolerance of a pixel boundary (pyproj vs ee transforms
+      might put them at either side)
+    - roi: the client side roi is the exact square, the server side roi is the bounds of a buffer polygon
+    GEERefGrid.verify compares both.
+
+pyproj is an optional dependency - geeproduct.GEERefContext falls back to the server side versions if it is missing.
+
+GEERefGridStore keeps the resolved grids of a patch (REFGRIDFILENAME in the patch directory), so later runs - e.g. next
+year's update of existing patches - load the grid instead of looking it up again. this also keeps the grid of a patch
+pixel-identical over the years, even where the earliest reference image of a year is in another utm zone.
+
+    {
+        "version" : 1,
+        "grids"   : {
+            "GEECol_s2scl:64:4.12345678:51.12345678" : {"crs": "EPSG:32631", "transform": [20, 0, 499980, 0, -20, 5700000],
+                                                        "center": [1234.0, 567.0], "diameter": 64, "roi": [[...]], "created": "2021-06-01T12:00:00"},
+            ...
+        }
+    }
+"""
+import os
+import json
+import math
+import datetime
+import threading
+
+import ee
+import geeutils
+
+
+
+GRID_TOLERANCE_PIXELS = 0.01
+REFGRIDFILENAME       = "geepatches.refgrid.json"
+REFGRIDVERSION        = 1
+
+
+"""
+"""
+def available():
+    """
+    True if the client side grid can be used (pyproj installed)
+    """
+    try:
+        import pyproj
+    except ImportError:
+        return False
+    return True
+
+
+"""
+"""
+class GEERefGrid(object):
+    """
+    affine grid of a reference image: transform [xScale, xShearing, xTranslation, yShearing, yScale, yTranslation]
+    mapping pixel coordinates (col, row) onto crs coordinates
+    e.g.
+        refgrid, eerefimage, lonlat = GEERefGrid.lookup(eerefimagecollection, eedatefrom, eepoint)
+        centerx, centery = refgrid.pixelcenter(*lonlat)
+        eeroi            = refgrid.roi(centerx, centery, 32)
+        eedstprojection  = refgrid.dstprojection(centerx - 32, centery - 32, 0.5)
+    """
+    def __init__(self, szcrs, lsttransform, verbose=False):
+        try:
+            import pyproj
+        except ImportError:
+            raise ImportError("GEERefGrid requires the pyproj package (pip install pyproj)")
+        if len(lsttransform) != 6 : raise ValueError(f"invalid transform lsttransform ({str(lsttransform)})")
+        self.szcrs        = szcrs
+        self.lsttransform = [float(value) for value in lsttransform]
+        a, b, _, d, e, _  = self.lsttransform
+        self._determinant = a*e - b*d
+        if self._determinant == 0 : raise ValueError(f"singular transform lsttransform ({str(lsttransform)})")
+        self._transformer = pyproj.Transformer.from_crs("EPSG:4326", pyproj.CRS.from_user_input(szcrs), always_xy=True)
+        self.eeprojection = ee.Projection(szcrs, self.lsttransform)
+        self._verbose     = verbose
+
+    """
+    """
+    @staticmethod
+    def lookup(eeimagecollection, eedatefrom, eepoint, verbose=False):
+        """
+        reference image for eepoint near eedatefrom - as geeutils.someImageNear: earliest image since eedatefrom,
+        if none, latest image before (search limited to [-1 year, +1 year]) - and its grid, in a single round trip.
+        only image metadata is evaluated: the collection size, the first band projection and the point coordinates.
+
+        returns (GEERefGrid, ee.Image (first band of the reference image), (lon, lat) of eepoint)
+        raises geeutils.NoRetryEmptyCollectionException or geeutils.NoRetryNoImageException
+        """
+        eeimagecollection = eeimagecollection.filterBounds(eepoint)
+        eedate            = ee.Date(eedatefrom)
+        eesince           = eeimagecollection.filter(ee.Filter.date(eedate, eedate.advance(1, 'year'))).sort('system:time_start').limit(1)
+        eebefore          = eeimagecollection.filter(ee.Filter.date(eedate.advance(-1, 'year'), eedate)).sort('system:time_start', False).limit(1)
+        def _projection(eeimage): return ee.Image(eeimage).select(0).projection()
+        info = geeutils.getinfo(ee.Dictionary({
+            'size'   : eeimagecollection.size(),
+            'since'  : eesince.toList(1).map(_projection),
+            'before' : eebefore.toList(1).map(_projection),
+            'point'  : eepoint.transform('EPSG:4326', 0.001).coordinates()}), verbose=verbose)
+
+        if info['size'] == 0:
+            if verbose: print(f"{GEERefGrid.__name__}.lookup: empty reference collection.")
+            raise geeutils.NoRetryEmptyCollectionException(f"{GEERefGrid.__name__}.lookup: empty reference collection.")
+        if   info['since']  : projection, eerefimage = info['since'][0],  ee.Image(eesince.first())
+        elif info['before'] : projection, eerefimage = info['before'][0], ee.Image(eebefore.first())
+        else:
+            if verbose: print(f"{GEERefGrid.__name__}.lookup: no reference image found.")
+            raise geeutils.NoRetryNoImageException(f"{GEERefGrid.__name__}.lookup: no reference image found.")
+        #
+        #    'crs' for epsg codes, 'wkt' for other coordinate systems
+        #
+        szcrs   = projection.get('crs') or projection.get('wkt')
+        refgrid = GEERefGrid(szcrs, projection.get('transform', [1, 0, 0, 0, 1, 0]), verbose=verbose)
+        if verbose: print(f"{GEERefGrid.__name__}.lookup: reference grid crs: {szcrs} transform: {refgrid.lsttransform}")
+        return refgrid, eerefimage.select(0), (info['point'][0], info['point'][1])
+
+    """
+    """
+    def topixel(self, lon, lat):
+        """
+        (fractional) pixel coordinates (col, row) of a point in geographic coordinates
+        """
+        x, y             = self._transformer.transform(lon, lat)
+        a, b, c, d, e, f = self.lsttransform
+        dx, dy           = x - c, y - f
+        return (e*dx - b*dy) / self._determinant, (a*dy - d*dx) / self._determinant
+
+    """
+    """
+    def tocrs(self, col, row):
+        """
+        crs coordinates (x, y) of pixel coordinates
+        """
+        a, b, c, d, e, f = self.lsttransform
+        return a*col + b*row + c, d*col + e*row + f
+
+    """
+    """
+    def pixelcenter(self, lon, lat):
+        """
+        center of the pixel containing the point - as geeutils.pixelcenterpoint - in pixel coordinates: on .5
+        """
+        col, row = self.topixel(lon, lat)
+        return math.floor(col) + 0.5, math.floor(row) + 0.5
+
+    """
+    """
+    def pixelinters(self, lon, lat):
+        """
+        pixel intersection near the point - as geeutils.pixelinterspoint - in pixel coordinates: odd integers
+        geeutils.pixelinterspoint takes the pixel center in a grid scaled (2, 2), hence only the 'odd' intersections are used.
+        """
+        col, row = self.topixel(lon, lat)
+        return 2*math.floor(col/2) + 1.0, 2*math.floor(row/2) + 1.0
+
+    """
+    """
+    def bounds(self, centerx, centery, pixelsradius):
+        """
+        square roi around a center in pixel coordinates - as geeutils.squarerasterboundsroi
+        returns (ulx, uly, lrx, lry) in pixel coordinates
+        """
+        return centerx - pixelsradius, centery - pixelsradius, centerx + pixelsradius, centery + pixelsradius
+
+    """
+    """
+    def point(self, centerx, centery):
+        """
+        ee.Geometry.Point in the reference projection
+        """
+        return ee.Geometry.Point([centerx, centery], proj=self.eeprojection)
+
+    """
+    """
+    def roi(self, centerx, centery, pixelsradius):
+        """
+        square roi as ee.Geometry.Polygon in the reference projection - vertices in the order of ee.Geometry.bounds: upper left first
+        """
+        ulx, uly, lrx, lry = self.bounds(centerx, centery, pixelsradius)
+        return ee.Geometry.Polygon([[[ulx, uly], [lrx, uly], [lrx, lry], [ulx, lry], [ulx, uly]]], proj=self.eeprojection, geodesic=False)
+
+    """
+    """
+    def dstprojection(self, ulx, uly, scale):
+        """
+        reference projection translated to pixel (ulx, uly) and scaled - as ee.Projection.translate(ulx, uly).scale(scale, scale)
+        """
+        a, b, _, d, e, _ = self.lsttransform
+        x, y             = self.tocrs(ulx, uly)
+        return ee.Projection(self.szcrs, [a*scale, b*scale, x, d*scale, e*scale, y])
+
+    """
+    """
+    def verify(self, eepoint, eerefimage, refroipixelsdiameter, verbose=False):
+        """
+        compare the client side roi with the server side version (geeutils) - debug purposes: costs the round trips GEERefGrid avoids
+        returns the maximum deviation of the roi corners in reference pixels
+        raises ValueError if it exceeds GRID_TOLERANCE_PIXELS
+        """
+        lon, lat = geeutils.getinfo(eepoint.transform('EPSG:4326', 0.001).coordinates(), verbose=verbose)
+        if (refroipixelsdiameter %2) == 0:
+            eecenterpoint    = geeutils.pixelinterspoint(eepoint, eerefimage)
+            centerx, centery = self.pixelinters(lon, lat)
+        else:
+            eecenterpoint    = geeutils.pixelcenterpoint(eepoint, eerefimage)
+            centerx, centery = self.pixelcenter(lon, lat)
+        eeserverroi  = geeutils.squarerasterboundsroi(eecenterpoint, refroipixelsdiameter/2, eerefimage)
+        lstserver    = geeutils.getinfo(eeserverroi.transform(self.eeprojection, 0.001).coordinates(), verbose=verbose)[0]
+        ulx, uly, lrx, lry = self.bounds(centerx, centery, refroipixelsdiameter/2)
+        deviation    = max(
+            abs(min(x for x, _ in lstserver) - ulx), abs(min(y for _, y in lstserver) - uly),
+            abs(max(x for x, _ in lstserver) - lrx), abs(max(y for _, y in lstserver) - lry))
+        if verbose: print(f"{str(type(self).__name__)}.verify: roi deviation client vs server side: {deviation} pixels")
+        if deviation > GRID_TOLERANCE_PIXELS:
+            raise ValueError(f"client side roi deviates {deviation} pixels from server side roi (tolerance {GRID_TOLERANCE_PIXELS})")
+        return deviation
+
+
+"""
+"""
+class GEERefGridStore(object):
+    """
+    resolved reference grids of a patch directory - keyed by reference product, roi diameter and point (see key)
+    e.g.
+        store   = GEERefGridStore(szpatchdir)
+        szkey   = GEERefGridStore.key("GEECol_s2scl", 64, eepoint)
+        refgrid = store.load(szkey)
+        if refgrid is None:
+            ... lookup ...
+            store.save(szkey, refgrid, centerx, centery, 64)
+    """
+    def __init__(self, szpatchdir, verbose=False):
+        if not os.path.isdir(szpatchdir) : raise ValueError(f"invalid patch directory szpatchdir ({str(szpatchdir)})")
+        self.szrefgridfile = os.path.join(os.path.normpath(szpatchdir), REFGRIDFILENAME)
+        self._verbose      = verbose
+        self._lock         = threading.Lock()
+        self._grids        = {}
+        if os.path.isfile(self.szrefgridfile):
+            with open(self.szrefgridfile, "r") as fd:
+                refgrids = json.load(fd)
+            if refgrids.get("version") != REFGRIDVERSION:
+                raise ValueError(f"unexpected reference grid version in {self.szrefgridfile}")
+            self._grids = refgrids.get("grids", {})
+            if self._verbose: print(f"{str(type(self).__name__)}: {self.szrefgridfile}: {len(self._grids)} grids")
+
+    """
+    """
+    @staticmethod
+    def key(szrefproduct, refroipixelsdiameter, eepoint):
+        """
+        client side key - None if the point is not known client side (computed geometry): such grids are not stored
+        """
+        try:
+            lon, lat = eepoint.toGeoJSON()['coordinates']
+        except Exception:
+            return None
+        return f"{szrefproduct}:{int(refroipixelsdiameter)}:{lon:.8f}:{lat:.8f}"
+
+    """
+    """
+    def load(self, szkey):
+        """
+        returns (GEERefGrid, centerx, centery) stored under szkey, or None
+        """
+        with self._lock:
+            grid = self._grids.get(szkey)
+        if grid is None: return None
+        if self._verbose: print(f"{str(type(self).__name__)}.load - {szkey}")
+        return GEERefGrid(grid["crs"], grid["transform"]), grid["center"][0], grid["center"][1]
+
+    """
+    """
+    def save(self, szkey, refgrid, centerx, centery, refroipixelsdiameter):
+        """
+        store the grid under szkey - written immediately, via temporary file and rename
+        """
+        ulx, uly, lrx, lry = refgrid.bounds(centerx, centery, refroipixelsdiameter/2)
+        with self._lock:
+            self._grids[szkey] = {
+                "crs"       : refgrid.szcrs,
+                "transform" : refgrid.lsttransform,
+                "center"    : [centerx, centery],
+                "diameter"  : refroipixelsdiameter,
+                "roi"       : [[ulx, uly], [lrx, uly], [lrx, lry], [ulx, lry], [ulx, uly]],
+                "created"   : datetime.datetime.now().isoformat(timespec='seconds')}
+            sztmpfile = f"{self.szrefgridfile}.{threading.get_ident()}.tmp"
+            with open(sztmpfile, "w") as fd:
+                json.dump({"version": REFGRIDVERSION, "grids": self._grids}, fd, indent=1)
+            os.replace(sztmpfile, self.szrefgridfile)
+        if self._verbose: print(f"{str(type(self).__name__)}.save - {szkey}")
@@ -0,0 +1,198 @@
+"""
+per-patch date manifests for incremental exports
+
+a patch directory (e.g. .../PV100LC_40/Lon0004.xxxxxxxx_Lat0051.xxxxxxxx) gets a manifest file (MANIFESTFILENAME)
+describing what has been exported into it:
+
+    {
+        "version"  : 1,
+        "products" : {
+            "S2ndvi"          : {"dates": ["2020-01-05", ...], "dtype": "float", "roi": {GeoJSON}, "exporttime": "2021-06-01T12:00:00"},
+            "S1gamma0_VV_ASC" : {...},
+            ...
+        },
+        "empty"    : {
+            "S1Bsigma0" : [["2022-01-01", "2023-01-01"], ...]
+        }
+    }
+
+- "products" is keyed by the file description as found in the filenames (szdescription.YYYY-MM-DD.tif), hence
+  including the (optional) filename prefix; dates are the dates exported so far.
+- "empty" remembers negative results: GEEExporter product (as in geebatch.EXPORTABLEPRODUCTS) and date ranges
+  for which no collection could be obtained (NoRetryEmptyCollectionException), so these are not retried.
+
+a patch directory without manifest (exported before manifests existed) is seeded from its existing files.
+
+GEECheckpoint - a lighter sibling, living only during an export - records the completed download jobs
+(CHECKPOINTFILENAME in the output directory), so a retried or restarted export continues at the first incomplete job.
+"""
+import os
+import re
+import json
+import datetime
+import threading
+
+
+
+MANIFESTFILENAME   = "geepatches.manifest.json"
+MANIFESTVERSION    = 1
+CHECKPOINTFILENAME = "geepatches.checkpoint.json"
+
+_REFILEDATE = re.compile(r"^(?P<description>.+)\.(?P<date>\d{4}-\d{2}-\d{2})\.tif$")
+
+
+"""
+"""
+class GEEManifest(object):
+    """
+    e.g.
+        manifest = GEEManifest(szpatchdir)
+        lstszmissing = manifest.missingdates("S2ndvi", ["2020-01-05", "2020-01-10"])
+        ...
+        manifest.adddates("S2ndvi", ["2020-01-10"], szdtype="float", roi=geojson)
+        manifest.save()
+    """
+    def __init__(self, szpatchdir, verbose=False):
+        if not os.path.isdir(szpatchdir) : raise ValueError(f"invalid patch directory szpatchdir ({str(szpatchdir)})")
+        self.szpatchdir     = os.path.normpath(szpatchdir)
+        self.szmanifestfile = os.path.join(self.szpatchdir, MANIFESTFILENAME)
+        self._verbose       = verbose
+        self._lock          = threading.Lock()
+        self._manifest      = self._load()
+
+    def _load(self):
+        if os.path.isfile(self.szmanifestfile):
+            with open(self.szmanifestfile, "r") as fd:
+                manifest = json.load(fd)
+            if manifest.get("version") != MANIFESTVERSION:
+                raise ValueError(f"unexpected manifest version in {self.szmanifestfile}")
+            if self._verbose: print(f"{str(type(self).__name__)}._load: {self.szmanifestfile}: {len(manifest['products'])} products")
+            return manifest
+        #
+        #    no manifest yet: seed from the existing files
+        #
+        manifest = {"version": MANIFESTVERSION, "products": {}, "empty": {}}
+        for direntry in os.scandir(self.szpatchdir):
+            if not direntry.is_file(): continue
+            match = _REFILEDATE.match(direntry.name)
+            if not match: continue
+            product = manifest["products"].setdefault(match.group("description"), {"dates": [], "dtype": None, "roi": None, "exporttime": None})
+            product["dates"].append(match.group("date"))
+        for product in manifest["products"].values():
+            product["dates"] = sorted(set(product["dates"]))
+        if self._verbose: print(f"{str(type(self).__name__)}._load: {self.szmanifestfile} seeded from files: {len(manifest['products'])} products")
+        return manifest
+
+    def save(self):
+        """
+        write manifest - via temporary file and rename, to avoid half-written manifests
+        """
+        with self._lock:
+            sztmpfile = self.szmanifestfile + ".tmp"
+            with open(sztmpfile, "w") as fd:
+                json.dump(self._manifest, fd, indent=1)
+            os.replace(sztmpfile, self.szmanifestfile)
+
+    def dates(self, szdescription):
+        """
+        dates exported so far for the file description
+        """
+        with self._lock:
+            return list(self._manifest["products"].get(szdescription, {}).get("dates", []))
+
+    def missingdates(self, szdescription, lstszdates):
+        """
+        subset of lstszdates not exported yet for the file description (order preserved)
+        """
+        setknown = set(self.dates(szdescription))
+        return [szdate for szdate in lstszdates if szdate not in setknown]
+
+    def adddates(self, szdescription, lstszdates, szdtype=None, roi=None):
+        """
+        register exported dates for the file description
+        """
+        with self._lock:
+            product = self._manifest["products"].setdefault(szdescription, {"dates": [], "dtype": None, "roi": None, "exporttime": None})
+            product["dates"]      = sorted(set(product["dates"]).union(lstszdates))
+            product["exporttime"] = datetime.datetime.now().isoformat(timespec='seconds')
+            if szdtype is not None: product["dtype"] = szdtype
+            if roi     is not None: product["roi"]   = roi
+
+    def isempty(self, szproduct, szdatefrom, szdatetill):
+        """
+        True if the product is known to have no collection in [szdatefrom, szdatetill)
+        """
+        with self._lock:
+            for szemptyfrom, szemptytill in self._manifest["empty"].get(szproduct, []):
+                if szemptyfrom <= szdatefrom and szdatetill <= szemptytill: return True
+            return False
+
+    def addempty(self, szproduct, szdatefrom, szdatetill):
+        """
+        register negative result: no collection for the product in [szdatefrom, szdatetill)
+        """
+        with self._lock:
+            lstranges = self._manifest["empty"].setdefault(szproduct, [])
+            if [szdatefrom, szdatetill] not in lstranges:
+                lstranges.append([szdatefrom, szdatetill])
+
+
+"""
+"""
+class GEECheckpoint(object):
+    """
+    completed download jobs of the exports into a directory - keyed by (client side) job keys, e.g. 'S2ndvi.tif:2020-01-05:2020-06-30:33:1f0c6a2e'
+    e.g.
+        checkpoint = GEECheckpoint(szoutputdir)
+        if not checkpoint.isdone(szjobkey):
+            ... download ...
+            checkpoint.done(szjobkey)
+        ...
+        checkpoint.clear(lstszjobkeys) # export completed
+    """
+    def __init__(self, szoutputdir, verbose=False):
+        if not os.path.isdir(szoutputdir) : raise ValueError(f"invalid output directory szoutputdir ({str(szoutputdir)})")
+        self.szcheckpointfile = os.path.join(os.path.normpath(szoutputdir), CHECKPOINTFILENAME)
+        self._verbose         = verbose
+        self._lock            = threading.Lock()
+        self._setdone         = set()
+        if os.path.isfile(self.szcheckpointfile):
+            try:
+                with open(self.szcheckpointfile, "r") as fd:
+                    self._setdone = set(json.load(fd).get("jobs", []))
+            except ValueError:
+                #
+                #    unreadable checkpoint - start over: costs downloads, not correctness
+                #
+                self._setdone = set()
+            if self._verbose: print(f"{str(type(self).__name__)}: {self.szcheckpointfile}: {len(self._setdone)} jobs completed before")
+
+    def _save(self):
+        if not self._setdone:
+            if os.path.isfile(self.szcheckpointfile): os.remove(self.szcheckpointfile)
+            return
+        sztmpfile = self.szcheckpointfile + ".tmp"
+        with open(sztmpfile, "w") as fd:
+            json.dump({"jobs": sorted(self._setdone)}, fd, indent=1)
+        os.replace(sztmpfile, self.szcheckpointfile)
+
+    def isdone(self, szjobkey):
+        with self._lock:
+            return szjobkey in self._setdone
+
+    def done(self, szjobkey):
+        """
+        record completed job - saved immediately
+        """
+        with self._lock:
+            self._setdone.add(szjobkey)
+            self._save()
+
+    def clear(self, lstszjobkeys=None):
+        """
+        forget the jobs (default: all) - typically once an export completed. the file is removed when no jobs remain.
+        """
+        with self._lock:
+            if lstszjobkeys is None: self._setdone = set()
+            else:                    self._setdone.difference_update(lstszjobkeys)
+            self._save()
@@ -3,6 +3,7 @@
 #
 import numbers
 import ee
+import geeutils
 if not ee.data._credentials: ee.Initialize()
 
 """
@@ -139,20 +140,24 @@ class SimpleFilter(IColFilter):
         mapping often result in "EEException: Too many concurrent aggregations."
         using iterator is (expected to be) slower
     """
-    def __init__(self, szclassesband, classesarray, thresholdpct):
+    def __init__(self, szclassesband, classesarray, thresholdpct, tagcache=None):
         """
         :param szclassesband: the classification band to be considered in the images of the input collection
         :param classesarray: list (python list, NOT ee.List) of the class values to be evaluated
         :param thresholdpct: the minimum (positive thresholds) or maximum (negative thresholds) percentage coverage by these classes ( [0..100] )
+        :param tagcache: (optional) geecache.GEECoverageTagCache remembering the coverage per image id, band, class set and region
         """
         if not szclassesband                            : raise ValueError("no band specified")
         _assertlistofnumber(classesarray)
         if not isinstance(thresholdpct, numbers.Number) : raise ValueError("invalid threshold")
         if not (0 <= abs(thresholdpct) <= 100)          : raise ValueError("invalid threshold value. must be [0..100]")
         self.szband        = szclassesband
+        self.classesarray  = list(classesarray)
         self.eeclasseslist = ee.List(classesarray).distinct()
+        self.threshold     = abs(thresholdpct)
         self.eethreshold   = ee.Number(thresholdpct).abs();
         self.binvert       = True if (thresholdpct <= 0) else False; # 0 considered negative; indicating NO coverage by specified classes allowed
+        self.tagcache      = tagcache
 
     #
     # original implementation: pure iteration (to avoid "EEException: Too many concurrent aggregations.")
@@ -237,6 +242,55 @@ class SimpleFilter(IColFilter):
     def filtercollection(self, eeimagecollection, eeregion, verbose=False):
         """
         """
+        if self.tagcache is None:
+            return self._tagcollection(eeimagecollection, eeregion, verbose=verbose).filter(self._thresholdfilter())
+        #
+        #    coverage tags cached client side: only the images not seen before (over this region) are aggregated,
+        #    the collection itself is filtered on the ids of the images passing the threshold.
+        #    costs round trips (image ids, missing tags), but no aggregations at all once the images are known.
+        #
+        info     = geeutils.getinfo(ee.Dictionary({
+            'collection' : eeimagecollection.get('system:id'),
+            'ids'        : eeimagecollection.aggregate_array('system:index')}), verbose=verbose)
+        szkey    = self.tagcache.key(self.szband, self.classesarray, eeregion, info['collection'])
+        lstszids = info['ids']
+        dictpct  = self.tagcache.get(szkey, lstszids)
+        lstszmissingids = [szid for szid in lstszids if szid not in dictpct]
+        if lstszmissingids:
+            taggedimagescoll = self._tagcollection(eeimagecollection.filter(ee.Filter.inList('system:index', lstszmissingids)), eeregion, verbose=verbose)
+            #
+            # images without pixels in the region have no 'eeselclspct' (dropped by reduceColumns): remembered as None - never passing
+            #
+            dictmissingpct = {szid: None for szid in lstszmissingids}
+            dictmissingpct.update({szid: pct for szid, pct in geeutils.getinfo(
+                ee.List(taggedimagescoll.reduceColumns(ee.Reducer.toList(2), ['system:index', 'eeselclspct']).get('list')), verbose=verbose)})
+            self.tagcache.put(szkey, dictmissingpct)
+            dictpct.update(dictmissingpct)
+        lstszpassingids = [szid for szid in lstszids if self._passes(dictpct[szid])]
+        if verbose: print(f"{str(type(self).__name__)}.filtercollection: {len(lstszmissingids)} of {len(lstszids)} images aggregated - {len(lstszpassingids)} passing")
+        return eeimagecollection.filter(ee.Filter.inList('system:index', lstszpassingids))
+
+    def _passes(self, pct):
+        """
+        client side equivalent of _thresholdfilter
+        """
+        if pct is None: return False
+        return (pct <= self.threshold) if self.binvert else (pct >= self.threshold)
+
+    def _thresholdfilter(self):
+        """
+        """
+        if self.binvert:
+            # negative threshold was specified => considered as maximum coverage
+            return ee.Filter.lte('eeselclspct', self.eethreshold)
+        else:
+            # positive threshold was specified => considered as minimum coverage
+            return ee.Filter.gte('eeselclspct', self.eethreshold)
+
+    def _tagcollection(self, eeimagecollection, eeregion, verbose=False):
+        """
+        the input collection, its images tagged with their coverage by the specified classes ('eeselclspct')
+        """
 
         #
         #    try to prevent "EEException: Too many concurrent aggregations."
@@ -339,16 +393,7 @@ class SimpleFilter(IColFilter):
         else:
             taggedimagescoll = ee.ImageCollection.fromImages(
                 ee.List(ee.List.sequence(0, eeimagecollection.size(), MAX_CONCURRENT_AGGREGATIONS).iterate(_batch_tagselclspct, ee.List([]))).flatten())
-        
-        #
-        # apply threshold and return remaining images
-        #
-        if self.binvert:
-            # negative threshold was specified => considered as maximum coverage
-            return taggedimagescoll.filter(ee.Filter.lte('eeselclspct', self.eethreshold))     
-        else:
-            # positive threshold was specified => considered as minimum coverage
-            return taggedimagescoll.filter(ee.Filter.gte('eeselclspct', self.eethreshold))  
+        return taggedimagescoll
 
 
 """"  
@@ -6,6 +6,7 @@ import ee
 import geeutils
 import geebiopar
 import geemask
+import geegrid
 
 
 """
@@ -124,9 +125,12 @@ class GEECol(object):
                +--- GEECol_s2sclclassfractions (test: one-image-collection)
                +--- GEECol_s2sclstaticsmask    (test: one-image-collection)
                +--- GEECol_s2cloudlessmask     (test: using S2_CLOUD_PROBABILITY)
+               +--- GEECol_s2multimask         (bit-packed simplemask, convmask, combimask, cloudlessmask)
                +--- GEECol_s2rgb               (test)
                +--- GEECol_s1sigma0
                +--- GEECol_s1gamma0
+               +--- GEECol_s1sigma0multi       (all polarisations and orbit passes from a single S1 query)
+               +--- GEECol_s1gamma0multi       (all polarisations and orbit passes from a single S1 query)
                +--- GEECol_s1rvi               (test)
                +--- GEECol_pv333ndvi
                +--- GEECol_pv333sm
@@ -183,16 +187,56 @@ class GEECol(object):
         raise NotImplementedError(f"{str(type(self).__name__)} - Subclasses should implement 'scaleandflag!'")
 
 
-    def getcollection(self, eedatefrom, eedatetill, eepoint, roipixelsindiameter, refcollection=None, refroipixelsdiameter=None, doscaleandflag=True, verbose=False):
+    def transferscaling(self):
+        """
+        (scale, offset) of the optional int16 transfer encoding of the scaled collection (see GEEExp transferencoding):
+            encoded = round((value - offset) / scale)   -   value = encoded * scale + offset
+        the GEECol_..._he products prove this kind of scaling is acceptable, hence float products should specify
+        a scaling covering their (clamped) range within [-32767, 32767] at the precision they need.
+
+        default None: no transfer encoding - typically for integer (byte) products which gain nothing.
+        """
+        return None
+
+
+    def refgridcollection(self, eeroi, eedatefrom, eedatetill, verbose=False):
+        """
+        raw (not mosaicked) ee.ImageCollection sharing its grid with the collection obtained from collect - the earliest image
+        determining the grid, as in geeutils.mosaictodate - allowing geegrid.GEERefGrid.lookup to find the grid of this product 
+        when used as reference collection, from image metadata only.
+
+        default None: no such collection - the grid is looked up in the collection obtained from collect.
+        """
+        return None
+
+
+    def _upstreamcollection(self, szupstream, colfilter, eeroi, eedatefrom, eedatetill, builder):
+        """
+        upstream (intermediate) collection shared with other products - via the GEEUpstream memo in self.upstream, if any
+        (set by a planner, e.g. GEEExporter). without memo, the collection is simply built.
+
+        :param szupstream: name of the upstream node, e.g. 'S2scl' - identifies it together with colfilter, eeroi and dates
+        :param builder: function () -> ee.ImageCollection
+        """
+        upstream = getattr(self, 'upstream', None)
+        if upstream is None: return builder()
+        return upstream.collection(szupstream, colfilter, eeroi, eedatefrom, eedatetill, builder)
+
+
+    def getcollection(self, eedatefrom, eedatetill, eepoint, roipixelsindiameter, refcollection=None, refroipixelsdiameter=None, doscaleandflag=True, refcontext=None, verbose=False):
         """
         wrap _getcollection to allow some retries to avoid sporadic "ee.ee_exception.EEException: Computation timed out."
+        the server evaluations within _getcollection are retried individually (geeutils.getinfo), 
+        hence the retries of _getcollection as a whole are a last resort only.
+
+        :param refcontext: GEERefContext shared over the products of a point. if specified, it replaces refcollection and refroipixelsdiameter
         """
         try:
             return geeutils.wrapretry(
                 self._getcollection, 
                 args=(eedatefrom, eedatetill, eepoint, roipixelsindiameter),
-                kwargs={'refcollection':refcollection, 'refroipixelsdiameter':refroipixelsdiameter, 'doscaleandflag':doscaleandflag, 'verbose':verbose},
-                attempts=8, backoffseconds=60, backofffactor=2, verbose=verbose) # max 1 + 2 + ... + 64 = 127 minutes
+                kwargs={'refcollection':refcollection, 'refroipixelsdiameter':refroipixelsdiameter, 'doscaleandflag':doscaleandflag, 'refcontext':refcontext, 'verbose':verbose},
+                attempts=3, backoffseconds=60, backofffactor=2, verbose=verbose)
         except geeutils.NoRetryException as e:
             #
             # arriving here is expected to indicate that some problem was explicitly caught
@@ -209,9 +253,9 @@ class GEECol(object):
             #
             raise
 
-    def _getcollection(self, eedatefrom, eedatetill, eepoint, roipixelsindiameter, refcollection=None, refroipixelsdiameter=None, doscaleandflag=True, verbose=False):
+    def _getcollection(self, eedatefrom, eedatetill, eepoint, roipixelsindiameter, refcollection=None, refroipixelsdiameter=None, doscaleandflag=True, refcontext=None, verbose=False):
         """
-        determine reference roi (to obtain product patches congruent with reference product)
+        determine reference roi (to obtain product patches congruent with reference product) - via GEERefContext
         determine reference projection (to obtain specified resolution)
         collect the specified ee.ImageCollection
         reproject and rescale this ee.ImageCollection
@@ -220,88 +264,26 @@ class GEECol(object):
             - 'gee_centerpoint' : ee.Geometry.Point - debug
             - 'gee_projection'  : ee.Projection - used to shrink the exported region a little, and to find the scale parameter for exports
             - 'gee_description' : string - used to brew filenames for exports
+            - 'gee_transferscale', 'gee_transferoffset' : number - only for products specifying a transferscaling
         """
 
         #
-        # find reference collection
-        #
-        if isinstance(refcollection, ee.ImageCollection):
-            if verbose: print(f"{str(type(self).__name__)}.getcollection: reference collection specified as ee.ImageCollection")
-            _eerefimagecollection = refcollection
-        elif isinstance(refcollection, GEECol): 
-            if verbose: print(f"{str(type(self).__name__)}.getcollection: reference collection specified as {str(type(refcollection).__name__)}")
-            _eerefimagecollection = refcollection.collect(eepoint, eedatefrom, eedatetill, verbose=verbose)
-        else:
-            if verbose: print(f"{str(type(self).__name__)}.getcollection: no reference collection specified - using self")
-            _eerefimagecollection = self.collect(eepoint, eedatefrom, eedatetill, verbose=verbose)
-        #
-        # _eerefimagecollection.size().getInfo() forces the collection to be evaluated
-        #     if this crashes during the evaluation, this might be retry-able
-        #     if the evaluation 'works', but results in an empty collection, all hope may be abandoned
-        #
-        if ( _eerefimagecollection.size().getInfo() == 0):
-            if verbose: print(f"{str(type(self).__name__)}.getcollection: empty reference collection.")
-            raise geeutils.NoRetryEmptyCollectionException(f"{str(type(self).__name__)}.getcollection: empty reference collection.")
-        #
-        # find reference image - assume single band, or all bands having identical projection
-        #
-        _eerefimage = geeutils.someImageNear(_eerefimagecollection, eedatefrom, eepoint).select(0)
-        try:
-            #
-            #    this weird call is expected to throw in case no _eerefimage can be found 
-            #    (e.g. due to an actual _eerefimagecollection outside the 'someImageNear' search range)
-            #    for strange reasons the _eerefimage will have type ee.Image, even if it is not there
-            #    and even then SOME calls will pass, while others will throw. 
-            #
-            if (_eerefimage.bandNames().size().getInfo() > 0): pass
-        except Exception as e:
-            if verbose: print(f"{str(type(self).__name__)}.getcollection: no reference image found. Exception:  {str(e)}")
-            raise geeutils.NoRetryNoImageException(f"{str(type(self).__name__)}.getcollection: no reference image found.")
-        if verbose: print(f"{str(type(self).__name__)}.getcollection: selected reference image:\n{geeutils.szprojectioninfo(_eerefimage)} id:{_eerefimage.id().getInfo()}")
-
-        #
-        # find roi center
+        # reference context: reference image, roi center and reference roi - shared over products if specified
         #
-        if refroipixelsdiameter is not None:
-            if verbose: print(f"{str(type(self).__name__)}.getcollection: specified roi diameter in reference collection pixels: {refroipixelsdiameter}")
-            pass                                                                          # roi size in pixels of reference collection
-        else:
-            if verbose: print(f"{str(type(self).__name__)}.getcollection: no roi diameter in reference collection pixels specified (using destination roi diameter: {roipixelsindiameter})")
-            refroipixelsdiameter = roipixelsindiameter                                    # self acting as reference
-            
-        _refroipixelsdiameter = round(refroipixelsdiameter)                               #  "an integer" I said.
-        _refroipixelsdiameter = max(_refroipixelsdiameter, 1)                             #  preferably larger then 1
-        if verbose and (_refroipixelsdiameter != refroipixelsdiameter):
-            print(f"{str(type(self).__name__)}.getcollection: specified roi diameter in reference collection pixels ({refroipixelsdiameter}) modified to {_refroipixelsdiameter}")
-
-        if (_refroipixelsdiameter %2) == 0:                                               #  even diameter
-            if verbose: print(f"{str(type(self).__name__)}.getcollection: selecting roi center at reference collection pixels raster intersection")
-            _eeroicenterpoint = geeutils.pixelinterspoint(eepoint, _eerefimage) #  roi center on refimage pixels intersection
-        else:                                                                   #  odd diameter
-            if verbose: print(f"{str(type(self).__name__)}.getcollection: selecting roi center at reference collection pixel center")
-            _eeroicenterpoint = geeutils.pixelcenterpoint(eepoint, _eerefimage) #  roi center on refimage pixel center
-        if verbose: print(f"{str(type(self).__name__)}.getcollection: selected roi center:\n{geeutils.szgeometryinfo(_eeroicenterpoint)}")
-        #
-        # find actual roi -  roi radius for odd sizes: 1, 2, 3, ... - for even sizes: 0.5, 1.5, 2.5, ...
-        #
-        _eerefroi = geeutils.squarerasterboundsroi(_eeroicenterpoint, _refroipixelsdiameter/2, _eerefimage, verbose=verbose)
-        if verbose: print(f"{str(type(self).__name__)}.getcollection: selected roi:\n{geeutils.szgeometryinfo(_eerefroi)}")
-        #
-        # find roi origin to translate to, to align pixel boundaries with reference roi
-        #
-        _eerefroiulx  = _eerefroi.coordinates().flatten().get(0)
-        _eerefroiuly  = _eerefroi.coordinates().flatten().get(1)
+        if refcontext is None:
+            refcontext = GEERefContext(
+                refcollection if isinstance(refcollection, (ee.ImageCollection, GEECol)) else self,
+                eedatefrom, eedatetill, eepoint, 
+                refroipixelsdiameter if refroipixelsdiameter is not None else roipixelsindiameter)
+        elif verbose: print(f"{str(type(self).__name__)}.getcollection: reference context specified")
+        refcontext.resolve(verbose=verbose)
+        _eerefimage           = refcontext.eerefimage
+        _eeroicenterpoint     = refcontext.eeroicenterpoint
+        _eerefroi             = refcontext.eerefroi
         #
         # translate and scale reference projection to obtain target projection
         #
-        _roipixelsindiameter = round(roipixelsindiameter)                              #  "an integer" I said.
-        _roipixelsindiameter = max(_roipixelsindiameter, 1)                            #  preferably larger then 1
-        if verbose and (_roipixelsindiameter != roipixelsindiameter):
-            print(f"{str(type(self).__name__)}.getcollection: specified roi diameter in destination collection pixels ({roipixelsindiameter}) modified to {_roipixelsindiameter}")
-        
-        _eedstprojection = _eerefimage.projection().translate(_eerefroiulx, _eerefroiuly)
-        _eedstprojection = _eedstprojection.scale(_refroipixelsdiameter/_roipixelsindiameter, _refroipixelsdiameter/_roipixelsindiameter)
-        if verbose: print(f"{str(type(self).__name__)}.getcollection: destination projection roi:\n{geeutils.szprojectioninfo(_eedstprojection)}")
+        _roipixelsindiameter, _eedstprojection = refcontext.dstprojection(roipixelsindiameter, verbose=verbose)
         #
         # find native image collection
         #
@@ -311,7 +293,7 @@ class GEECol(object):
         #     if this crashes during the evaluation, this might be retry-able
         #     if the evaluation 'works', but results in an empty collection, all hope may be abandoned
         #
-        if ( _eenatimagecollection.size().getInfo() == 0):
+        if ( geeutils.getinfo(_eenatimagecollection.size(), verbose=verbose) == 0):
             if verbose: print(f"{str(type(self).__name__)}.getcollection: empty destination collection.")
             raise geeutils.NoRetryEmptyCollectionException(f"{str(type(self).__name__)}.getcollection: empty destination collection.")
         #
@@ -324,6 +306,12 @@ class GEECol(object):
         if doscaleandflag:
             _eedstimagecollection = self.scaleandflag(_eedstimagecollection, verbose=verbose)
             if verbose: print(f"{str(type(self).__name__)}.getcollection: scaled collection: {geeutils.szimagecollectioninfo(_eedstimagecollection)}")
+            #
+            # transfer scaling (if any) travels along as collection properties, so GEEExp can encode/decode
+            #
+            if self.transferscaling() is not None:
+                _eedstimagecollection = _eedstimagecollection.set('gee_transferscale',  self.transferscaling()[0])
+                _eedstimagecollection = _eedstimagecollection.set('gee_transferoffset', self.transferscaling()[1])
         #
         # add some collection properties (e.g. used during export)
         #
@@ -340,13 +328,13 @@ class GEECol(object):
             #
             #    store intermediates so client can retrieve them for debugging
             #
-            self._eerefimagecollection = _eerefimagecollection
+            self._eerefimagecollection = refcontext.eerefimagecollection
             self._eerefimage           = _eerefimage
-            self._refroipixelsdiameter = _refroipixelsdiameter
+            self._refroipixelsdiameter = refcontext.refroipixelsdiameter
             self._eeroicenterpoint     = _eeroicenterpoint
             self._eerefroi             = _eerefroi
-            self._eerefroiulx          = _eerefroiulx
-            self._eerefroiuly          = _eerefroiuly
+            self._eerefroiulx          = refcontext.eerefroiulx
+            self._eerefroiuly          = refcontext.eerefroiuly
             self._roipixelsindiameter  = _roipixelsindiameter
             self._eedstprojection      = _eedstprojection
             self._eenatimagecollection = _eenatimagecollection
@@ -357,6 +345,266 @@ class GEECol(object):
         return _eedstimagecollection
 
 
+"""
+"""
+class GEEUpstream(object):
+    """
+    memo of upstream collections shared by the products of a point and date range: e.g. the daily SCL mosaic behind 
+    S2scl, S2sclsimplemask, S2sclconvmask, ..., or the NDVI collection behind S2ndvi and S2ndvi_he.
+    the upstream node is built once, and its (client side) ee.ImageCollection object is reused: the products then share
+    identical sub-expressions, which the server evaluates once per request (e.g. in stacked downloads - GEEExp.exportimagesmulti).
+
+    e.g.
+        upstream = GEEUpstream()
+        sclcol   = GEECol_s2scl(colfilter=s2f)
+        maskcol  = GEECol_s2sclsimplemask(colfilter=s2f)
+        sclcol.upstream = maskcol.upstream = upstream
+        ... getcollection(...) - the SCL mosaic is built once
+    """
+    def __init__(self, verbose=False):
+        self._verbose     = verbose
+        self._collections = {}
+        self.builds       = 0
+        self.hits         = 0
+
+    def collection(self, szupstream, colfilter, eeroi, eedatefrom, eedatetill, builder):
+        """
+        upstream collection - built by builder() on first use
+        the filter is identified by its instance: the memo keeps it, so its id can not be reused
+        """
+        szkey = f"{szupstream}:{id(colfilter)}:" + ee.List([eeroi, ee.Date(eedatefrom), ee.Date(eedatetill)]).serialize()
+        if szkey in self._collections:
+            self.hits += 1
+            if self._verbose: print(f"{str(type(self).__name__)}.collection: {szupstream} shared")
+            return self._collections[szkey][1]
+        eeimagecollection = builder()
+        self._collections[szkey] = (colfilter, eeimagecollection)
+        self.builds += 1
+        if self._verbose: print(f"{str(type(self).__name__)}.collection: {szupstream} built")
+        return eeimagecollection
+
+
+"""
+"""
+class GEERefContext(object):
+    """
+    reference context for GEECol.getcollection: everything derived from the reference collection for a point and a date range,
+    independent of the product itself:
+    - the reference image (its projection is the base of the destination projections) - None for grids from a refgridstore
+    - the roi center point, the reference roi and its upper left corner
+    obtaining it costs several server round trips. in case several products are exported for the same point, 
+    the context can be computed once and shared. it is evaluated on first use (resolve), and remembers negative results too.
+
+    clientgrid: the grid arithmetic is done client side (geegrid.GEERefGrid), with the reference image looked up in a single
+    round trip - falling back to the server side versions (geeutils.pixelcenterpoint,...) in case pyproj is not available.
+    refgridstore: geegrid.GEERefGridStore of the patch - a grid stored by an earlier run (e.g. previous year) is used as is,
+    and a grid looked up is stored. (client side grids of GEECol reference collections only)
+
+    e.g.
+        refcontext = GEERefContext(GEECol_s2scl(), eedatefrom, eedatetill, eepoint, 64)
+        eendvicol  = GEECol_s2ndvi().getcollection(eedatefrom, eedatetill, eepoint, 128, refcontext=refcontext)
+        eefaparcol = GEECol_s2fapar().getcollection(eedatefrom, eedatetill, eepoint, 128, refcontext=refcontext)
+    """
+    def __init__(self, refcollection, eedatefrom, eedatetill, eepoint, refroipixelsdiameter, clientgrid=True, refgridstore=None):
+        """
+        :param refcollection: reference collection as GEECol or as ee.ImageCollection
+        :param refroipixelsdiameter: roi diameter in reference collection pixels
+        :param clientgrid: use the client side grid (geegrid) if available
+        :param refgridstore: geegrid.GEERefGridStore (optional) persisting the client side grid over runs
+        """
+        if not isinstance(refcollection, (ee.ImageCollection, GEECol)): raise ValueError("reference collection expected to be a GEECol or an ee.ImageCollection")
+        self.refcollection        = refcollection
+        self.eedatefrom           = eedatefrom
+        self.eedatetill           = eedatetill
+        self.eepoint              = eepoint
+        self.refroipixelsdiameter = refroipixelsdiameter
+        self.clientgrid           = clientgrid and geegrid.available()
+        self.refgrid              = None
+        self.refgridstore         = refgridstore
+        self._resolved            = False
+        self._noretryexception    = None
+
+    def resolve(self, verbose=False):
+        """
+        evaluate the context - once. exceptions which are not worth a retry (e.g. empty reference collection) are remembered and re-raised.
+        """
+        if self._noretryexception is not None: raise self._noretryexception
+        if self._resolved: return self
+        try:
+            self._resolve(verbose=verbose)
+        except geeutils.NoRetryException as e:
+            self._noretryexception = e
+            raise
+        self._resolved = True
+        return self
+
+    def _refimagecollection(self, verbose=False):
+        if isinstance(self.refcollection, ee.ImageCollection):
+            if verbose: print(f"{str(type(self).__name__)}.resolve: reference collection specified as ee.ImageCollection")
+            return self.refcollection
+        if verbose: print(f"{str(type(self).__name__)}.resolve: reference collection specified as {str(type(self.refcollection).__name__)}")
+        return self.refcollection.collect(self.eepoint, self.eedatefrom, self.eedatetill, verbose=verbose)
+
+    def _refroipixelsdiameter(self, verbose=False):
+        _refroipixelsdiameter = round(self.refroipixelsdiameter)                          #  "an integer" I said.
+        _refroipixelsdiameter = max(_refroipixelsdiameter, 1)                             #  preferably larger then 1
+        if verbose and (_refroipixelsdiameter != self.refroipixelsdiameter):
+            print(f"{str(type(self).__name__)}.resolve: specified roi diameter in reference collection pixels ({self.refroipixelsdiameter}) modified to {_refroipixelsdiameter}")
+        return _refroipixelsdiameter
+
+    def _resolve(self, verbose=False):
+        if self.clientgrid: self._resolveclientside(verbose=verbose)
+        else:               self._resolveserverside(verbose=verbose)
+
+    def _resolveclientside(self, verbose=False):
+        #
+        # find reference collection - and the raw collection sharing its grid, if the reference product specifies one
+        #
+        _eerefimagecollection = self._refimagecollection(verbose=verbose)
+        _eegridcollection     = None
+        if isinstance(self.refcollection, GEECol):
+            _eegridcollection = self.refcollection.refgridcollection(self.eepoint, self.eedatefrom, self.eedatetill, verbose=verbose)
+        if _eegridcollection is None: _eegridcollection = _eerefimagecollection
+        _refroipixelsdiameter = self._refroipixelsdiameter(verbose=verbose)
+        #
+        # grid stored by an earlier run - no evaluation at all. the products will still find out their own collections being empty.
+        # the reference image is left unset: the grid is all the destination projections need, and an unchecked lookup
+        # (e.g. in an empty reference collection) would only fail later, as an opaque server error.
+        #
+        _szstorekey = None
+        _stored     = None
+        if self.refgridstore is not None and isinstance(self.refcollection, GEECol):
+            _szstorekey = geegrid.GEERefGridStore.key(str(type(self.refcollection).__name__), _refroipixelsdiameter, self.eepoint)
+            if _szstorekey is not None: _stored = self.refgridstore.load(_szstorekey)
+        if _stored is not None:
+            if verbose: print(f"{str(type(self).__name__)}.resolve: reference grid from {self.refgridstore.szrefgridfile}")
+            _refgrid, _centerx, _centery = _stored
+            _eerefimage = None
+        else:
+            #
+            # find reference image and its grid - single round trip
+            #
+            _refgrid, _eerefimage, (_lon, _lat) = geegrid.GEERefGrid.lookup(_eegridcollection, self.eedatefrom, self.eepoint, verbose=verbose)
+            #
+            # find roi center - client side
+            #
+            if (_refroipixelsdiameter %2) == 0:                                           #  even diameter
+                if verbose: print(f"{str(type(self).__name__)}.resolve: selecting roi center at reference collection pixels raster intersection")
+                _centerx, _centery = _refgrid.pixelinters(_lon, _lat)
+            else:                                                                         #  odd diameter
+                if verbose: print(f"{str(type(self).__name__)}.resolve: selecting roi center at reference collection pixel center")
+                _centerx, _centery = _refgrid.pixelcenter(_lon, _lat)
+            if _szstorekey is not None:
+                self.refgridstore.save(_szstorekey, _refgrid, _centerx, _centery, _refroipixelsdiameter)
+        #
+        # find actual roi and its origin - client side
+        #
+        _ulx, _uly, _, _ = _refgrid.bounds(_centerx, _centery, _refroipixelsdiameter/2)
+        if verbose: print(f"{str(type(self).__name__)}.resolve: selected roi center ({_centerx}, {_centery}) roi upper left ({_ulx}, {_uly}) in reference pixels")
+
+        self.refgrid              = _refgrid
+        self.eerefimagecollection = _eerefimagecollection
+        self.eerefimage           = _eerefimage
+        self.refroipixelsdiameter = _refroipixelsdiameter
+        self.eeroicenterpoint     = _refgrid.point(_centerx, _centery)
+        self.eerefroi             = _refgrid.roi(_centerx, _centery, _refroipixelsdiameter/2)
+        self.eerefroiulx          = _ulx
+        self.eerefroiuly          = _uly
+
+    def _resolveserverside(self, verbose=False):
+        #
+        # find reference collection
+        #
+        _eerefimagecollection = self._refimagecollection(verbose=verbose)
+        #
+        # _eerefimagecollection.size().getInfo() forces the collection to be evaluated
+        #     if this crashes during the evaluation, this might be retry-able
+        #     if the evaluation 'works', but results in an empty collection, all hope may be abandoned
+        #
+        if ( geeutils.getinfo(_eerefimagecollection.size(), verbose=verbose) == 0):
+            if verbose: print(f"{str(type(self).__name__)}.resolve: empty reference collection.")
+            raise geeutils.NoRetryEmptyCollectionException(f"{str(type(self).__name__)}.resolve: empty reference collection.")
+        #
+        # find reference image - assume single band, or all bands having identical projection
+        #
+        _eerefimage = geeutils.someImageNear(_eerefimagecollection, self.eedatefrom, self.eepoint).select(0)
+        try:
+            #
+            #    this weird call is expected to throw in case no _eerefimage can be found 
+            #    (e.g. due to an actual _eerefimagecollection outside the 'someImageNear' search range)
+            #    for strange reasons the _eerefimage will have type ee.Image, even if it is not there
+            #    and even then SOME calls will pass, while others will throw. 
+            #
+            if (_eerefimage.bandNames().size().getInfo() > 0): pass
+        except Exception as e:
+            if verbose: print(f"{str(type(self).__name__)}.resolve: no reference image found. Exception:  {str(e)}")
+            raise geeutils.NoRetryNoImageException(f"{str(type(self).__name__)}.resolve: no reference image found.")
+        if verbose: print(f"{str(type(self).__name__)}.resolve: selected reference image:\n{geeutils.szprojectioninfo(_eerefimage)} id:{_eerefimage.id().getInfo()}")
+        #
+        # find roi center
+        #
+        _refroipixelsdiameter = self._refroipixelsdiameter(verbose=verbose)
+        if (_refroipixelsdiameter %2) == 0:                                               #  even diameter
+            if verbose: print(f"{str(type(self).__name__)}.resolve: selecting roi center at reference collection pixels raster intersection")
+            _eeroicenterpoint = geeutils.pixelinterspoint(self.eepoint, _eerefimage) #  roi center on refimage pixels intersection
+        else:                                                                        #  odd diameter
+            if verbose: print(f"{str(type(self).__name__)}.resolve: selecting roi center at reference collection pixel center")
+            _eeroicenterpoint = geeutils.pixelcenterpoint(self.eepoint, _eerefimage) #  roi center on refimage pixel center
+        if verbose: print(f"{str(type(self).__name__)}.resolve: selected roi center:\n{geeutils.szgeometryinfo(_eeroicenterpoint)}")
+        #
+        # find actual roi -  roi radius for odd sizes: 1, 2, 3, ... - for even sizes: 0.5, 1.5, 2.5, ...
+        #
+        _eerefroi = geeutils.squarerasterboundsroi(_eeroicenterpoint, _refroipixelsdiameter/2, _eerefimage, verbose=verbose)
+        if verbose: print(f"{str(type(self).__name__)}.resolve: selected roi:\n{geeutils.szgeometryinfo(_eerefroi)}")
+        #
+        # find roi origin to translate to, to align pixel boundaries with reference roi
+        #
+        self.eerefimagecollection = _eerefimagecollection
+        self.eerefimage           = _eerefimage
+        self.refroipixelsdiameter = _refroipixelsdiameter
+        self.eeroicenterpoint     = _eeroicenterpoint
+        self.eerefroi             = _eerefroi
+        self.eerefroiulx          = _eerefroi.coordinates().flatten().get(0)
+        self.eerefroiuly          = _eerefroi.coordinates().flatten().get(1)
+
+    def dstprojection(self, roipixelsindiameter, verbose=False):
+        """
+        destination projection for a roi diameter (in destination pixels) - pixel boundaries aligned with the reference roi
+        returns (roi diameter as used, ee.Projection)
+        """
+        _roipixelsindiameter = round(roipixelsindiameter)                              #  "an integer" I said.
+        _roipixelsindiameter = max(_roipixelsindiameter, 1)                            #  preferably larger then 1
+        if verbose and (_roipixelsindiameter != roipixelsindiameter):
+            print(f"{str(type(self).__name__)}.dstprojection: specified roi diameter in destination collection pixels ({roipixelsindiameter}) modified to {_roipixelsindiameter}")
+        
+        if self.refgrid is not None:
+            _eedstprojection = self.refgrid.dstprojection(self.eerefroiulx, self.eerefroiuly, self.refroipixelsdiameter/_roipixelsindiameter)
+        else:
+            _eedstprojection = self.eerefimage.projection().translate(self.eerefroiulx, self.eerefroiuly)
+            _eedstprojection = _eedstprojection.scale(self.refroipixelsdiameter/_roipixelsindiameter, self.refroipixelsdiameter/_roipixelsindiameter)
+        if verbose: print(f"{str(type(self).__name__)}.dstprojection: destination projection roi:\n{geeutils.szprojectioninfo(_eedstprojection)}")
+        return _roipixelsindiameter, _eedstprojection
+
+    def verify(self, verbose=False):
+        """
+        debug: compare the client side roi with the server side version - see geegrid.GEERefGrid.verify
+        returns the deviation in reference pixels (0 for server side contexts)
+        """
+        self.resolve(verbose=verbose)
+        if self.refgrid is None: return 0
+        _eerefimage = self.eerefimage
+        if _eerefimage is None:
+            #
+            # stored grid - look up the reference image now (raises NoRetry... exceptions on empty collections)
+            #
+            _eegridcollection = None
+            if isinstance(self.refcollection, GEECol):
+                _eegridcollection = self.refcollection.refgridcollection(self.eepoint, self.eedatefrom, self.eedatetill, verbose=verbose)
+            if _eegridcollection is None: _eegridcollection = self.eerefimagecollection
+            _, _eerefimage, _ = geegrid.GEERefGrid.lookup(_eegridcollection, self.eedatefrom, self.eepoint, verbose=verbose)
+        return self.refgrid.verify(self.eepoint, _eerefimage, self.refroipixelsdiameter, verbose=verbose)
+
+
 ###############################################################################
 #
 # Sentinel 2 related products
@@ -371,12 +619,13 @@ class S2sclcppfilter(geemask.IColFilter):
     default settings emulate some 'cloudy pixel percentage' filter: maximum 95% pixels have SCL class 8,9 or 10
     typical use in the collect method of sentinel 2  products (GEECol daughter classes)
     """
-    def __init__(self, s2sclclassesarray=[8,9,10], thresholdpct=-95):
+    def __init__(self, s2sclclassesarray=[8,9,10], thresholdpct=-95, tagcache=None):
         """
         :param s2sclclassesarray: list (python list, NOT ee.List) of the SCL class values to be evaluated
         :param thresholdpct: the minimum (positive thresholds) or maximum (negative thresholds) percentage coverage by these classes ( [-100..100] )
+        :param tagcache: (optional) geecache.GEECoverageTagCache - see geemask.SimpleFilter
         """
-        self.filter = geemask.SimpleFilter('SCL', s2sclclassesarray, thresholdpct)
+        self.filter = geemask.SimpleFilter('SCL', s2sclclassesarray, thresholdpct, tagcache=tagcache)
 
     def filtercollection(self, eeimagecollection, eeregion, verbose=False):
         """
@@ -397,8 +646,9 @@ class GEECol_s2ndvi(GEECol, OrdinalProjectable):
         self.colfilter=colfilter
         if (colfilter is not None) and (not isinstance(colfilter, geemask.IColFilter) ) : raise ValueError("filter expected to be an IColFilter")
         
-    def collect(self, eeroi, eedatefrom, eedatetill, verbose=False):
+    def _ndvicollection(self, eeroi, eedatefrom, eedatetill, verbose=False):
         """
+        daily max composite NDVI - upstream of S2ndvi and S2ndvi_he
         """
         #
         #    base collection
@@ -425,6 +675,19 @@ class GEECol_s2ndvi(GEECol, OrdinalProjectable):
         #
         eeimagecollection = geeutils.mosaictodate(eeimagecollection, szmethod="max", verbose=verbose)
         #
+        #
+        #
+        return eeimagecollection
+
+    def collect(self, eeroi, eedatefrom, eedatetill, verbose=False):
+        """
+        """
+        #
+        #    base collection: daily NDVI composite - shared with S2ndvi_he (GEEUpstream) if possible
+        #
+        eeimagecollection = self._upstreamcollection('S2ndvi', self.colfilter, eeroi, eedatefrom, eedatetill,
+                                                     lambda: self._ndvicollection(eeroi, eedatefrom, eedatetill, verbose=verbose))
+        #
         #    add collection properties describing this collection
         #       
         eeimagecollection = eeimagecollection.set('gee_description', 'S2ndvi')
@@ -443,6 +706,12 @@ class GEECol_s2ndvi(GEECol, OrdinalProjectable):
                                                                  .copyProperties(image, ['system:time_start'])))
         return eeimagecollection
 
+    def transferscaling(self):
+        """
+        ndvi [-1, 1] -> [-10000, 10000]
+        """
+        return (0.0001, 0.0)
+
 
 """
 GEECol_s2ndvi with historical vito ndvi scaling
@@ -471,6 +740,12 @@ class GEECol_s2ndvi_he(GEECol_s2ndvi):
                                                                  .copyProperties(image, ['system:time_start'])))
         return eeimagecollection        
 
+    def transferscaling(self):
+        """
+        already byte-scaled
+        """
+        return None
+
 
 """
 """
@@ -480,8 +755,9 @@ class GEECol_s2fapar(GEECol, OrdinalProjectable):
         self.colfilter=colfilter
         if (colfilter is not None) and (not isinstance(colfilter, geemask.IColFilter) ) : raise ValueError("filter expected to be an IColFilter")
 
-    def collect(self, eeroi, eedatefrom, eedatetill, verbose=False):
+    def _faparcollection(self, eeroi, eedatefrom, eedatetill, verbose=False):
         """
+        daily max composite FAPAR - upstream of S2fapar and S2fapar_he
         """
         #
         #    base collection
@@ -516,6 +792,19 @@ class GEECol_s2fapar(GEECol, OrdinalProjectable):
         #
         eeimagecollection = geeutils.mosaictodate(eeimagecollection, szmethod="max", verbose=verbose)
         #
+        #
+        #
+        return eeimagecollection
+
+    def collect(self, eeroi, eedatefrom, eedatetill, verbose=False):
+        """
+        """
+        #
+        #    base collection: daily FAPAR composite - shared with S2fapar_he (GEEUpstream) if possible
+        #
+        eeimagecollection = self._upstreamcollection('S2fapar', self.colfilter, eeroi, eedatefrom, eedatetill,
+                                                     lambda: self._faparcollection(eeroi, eedatefrom, eedatetill, verbose=verbose))
+        #
         #    add collection properties describing this collection
         #       
         eeimagecollection = eeimagecollection.set('gee_description', 'S2fapar')
@@ -534,6 +823,12 @@ class GEECol_s2fapar(GEECol, OrdinalProjectable):
                                                                  .copyProperties(image, ['system:time_start'])))
         return eeimagecollection
 
+    def transferscaling(self):
+        """
+        fapar [0, 1] -> [0, 10000]
+        """
+        return (0.0001, 0.0)
+
 
 """
 GEECol_s2fapar with historical vito fapar scaling
@@ -562,6 +857,12 @@ class GEECol_s2fapar_he(GEECol_s2fapar):
                                                                  .copyProperties(image, ['system:time_start'])))
         return eeimagecollection  
 
+    def transferscaling(self):
+        """
+        already byte-scaled
+        """
+        return None
+
 
 """
 """
@@ -587,25 +888,34 @@ class GEECol_s2scl(GEECol, CategoricalProjectable):
         self.colfilter=colfilter
         if (colfilter is not None) and (not isinstance(colfilter, geemask.IColFilter) ) : raise ValueError("filter expected to be an IColFilter")
 
-    def collect(self, eeroi, eedatefrom, eedatetill, verbose=False):
+    def _sclcollection(self, eeroi, eedatefrom, eedatetill, verbose=False):
         """
+        raw SCL images - (optional) filtering applied
         """
-        #
-        #    base collection
-        #
         eeimagecollection = (ee.ImageCollection('COPERNICUS/S2_SR')
                              .select(['SCL'])
                              .filterBounds(eeroi)
                              .filter(ee.Filter.date(eedatefrom, eedatetill)))
-        #
-        #    (optional) filtering
-        #
         if self.colfilter is not None:
             eeimagecollection = self.colfilter.filtercollection(eeimagecollection, eeroi, verbose=verbose)
+        return eeimagecollection
+
+    def refgridcollection(self, eeroi, eedatefrom, eedatetill, verbose=False):
+        """
+        raw SCL images as mosaicked in collect - daughters with a collect of their own fall back to the default
+        """
+        if type(self).collect is not GEECol_s2scl.collect: return super().refgridcollection(eeroi, eedatefrom, eedatetill, verbose=verbose)
+        return self._sclcollection(eeroi, eedatefrom, eedatetill, verbose=verbose)
+
+    def collect(self, eeroi, eedatefrom, eedatetill, verbose=False):
+        """
+        """
         #
-        #    apply mode composite in case of overlapping images on same day
+        #    base collection - (optional) filtering included
+        #    with mode composite in case of overlapping images on same day - shared with the other S2scl based products (GEEUpstream) if possible
         #
-        eeimagecollection = geeutils.mosaictodate(eeimagecollection, szmethod="mode", verbose=verbose)
+        eeimagecollection = self._upstreamcollection('S2scl', self.colfilter, eeroi, eedatefrom, eedatetill,
+                                                     lambda: geeutils.mosaictodate(self._sclcollection(eeroi, eedatefrom, eedatetill, verbose=verbose), szmethod="mode", verbose=verbose))
         #
         #    add collection properties describing this collection
         #       
@@ -1335,6 +1645,120 @@ class GEECol_s2cloudlessmask(GEECol, CategoricalProjectable):
         return eeimagecollection
 
 
+"""
+"""
+class GEECol_s2multimask(GEECol_s2scl):
+    """
+    the masks we export on every patch - GEECol_s2sclsimplemask, GEECol_s2sclconvmask, GEECol_s2sclcombimask and 
+    GEECol_s2cloudlessmask - packed as one bit each in a single uint8 band: one download and one file per date iso four.
+
+        bit 0 (  1): GEECol_s2sclsimplemask
+        bit 1 (  2): GEECol_s2sclconvmask
+        bit 2 (  4): GEECol_s2sclcombimask
+        bit 3 (  8): GEECol_s2cloudlessmask
+        bit 4 ( 16): no data - GEECol_s2sclsimplemask has no data in the pixel (its bit is 0)
+        bit 5 ( 32): no data - GEECol_s2sclconvmask
+        bit 6 ( 64): no data - GEECol_s2sclcombimask
+        bit 7 (128): no data - GEECol_s2cloudlessmask
+
+    bit set: masked (belgian sky) - bit clear: not masked (clear sky). pixels without any data are exported as 240.
+    dates are those of the GEECol_s2sclsimplemask collection; masks missing a date have no data on that date.
+    GEECol_s2multimask.unpack restores the individual masks (0, 1, 255) as exported by their own products.
+
+    remark: the packed values are reprojected (mode) as a whole, which can differ slightly from reprojecting the masks separately.
+    """
+    MASKBITS   = ['S2sclsimplemask', 'S2sclconvmask', 'S2sclcombimask', 'S2cloudlessmask']
+    NODATABITS = 4   # no data bit of mask i: NODATABITS + i
+
+    def __init__(self, colfilter=None):
+        """
+        """
+        super().__init__(colfilter)
+        #
+        #    mask products - in MASKBITS order - with their default configurations
+        #
+        self.maskcols = [
+            GEECol_s2sclsimplemask(colfilter=colfilter),
+            GEECol_s2sclconvmask(colfilter=colfilter),
+            GEECol_s2sclcombimask(colfilter=colfilter),
+            GEECol_s2cloudlessmask(colfilter=colfilter)]
+
+    def collect(self, eeroi, eedatefrom, eedatetill, verbose=False):
+        #
+        #    mask collections - all of them daily composites with 'gee_date'
+        #
+        lsteecollections = [maskcol.collect(eeroi, eedatefrom, eedatetill, verbose=verbose) for maskcol in self.maskcols]
+        #
+        #    attach the other masks to the first one, by date
+        #
+        eeimagecollection = lsteecollections[0]
+        for ibit in range(1, len(lsteecollections)):
+            eeimagecollection = ee.ImageCollection(ee.Join.saveFirst(f'gee_maskbit{ibit}').apply(**{
+                'primary'   : eeimagecollection,
+                'secondary' : lsteecollections[ibit],
+                'condition' : ee.Filter.equals(**{'leftField': 'gee_date', 'rightField': 'gee_date'})}))
+        #
+        #    pack
+        #
+        def pack(image):
+            image    = ee.Image(image)
+            lstmasks = [image.select(0)]
+            for ibit in range(1, len(lsteecollections)):
+                lstmasks.append(ee.Image(ee.Algorithms.If(
+                    image.get(f'gee_maskbit{ibit}'), 
+                    ee.Image(image.get(f'gee_maskbit{ibit}')).select(0), 
+                    ee.Image.constant(0).updateMask(0))))                  # date missing in this mask: no data
+            packed = ee.Image.constant(0)
+            for ibit, mask in enumerate(lstmasks):
+                packed = (packed
+                          .bitwiseOr(mask.unmask(0, False).gt(0).leftShift(ibit))
+                          .bitwiseOr(mask.mask().eq(0).leftShift(self.NODATABITS + ibit)))
+            return (packed
+                    .toUint8()
+                    .updateMask(lstmasks[0].mask())                        # footprint of the first mask
+                    .rename('MASK')
+                    .copyProperties(image, ['system:time_start', 'gee_date']))
+        eeimagecollection = eeimagecollection.map(pack)
+        #
+        #    add collection properties describing this collection (in this case: overwrites 'gee_description' from GEECol_s2scl)
+        #       
+        eeimagecollection = eeimagecollection.set('gee_description', 'S2multimask')
+        #
+        #
+        #
+        return eeimagecollection
+
+    def scaleandflag(self, eeimagecollection, verbose=False):
+        """
+        pixels without any data (e.g. beyond the footprint of 'S2 half tiles') as the no data bits only (240)
+        """
+        inodata = sum(2**(self.NODATABITS + ibit) for ibit in range(len(self.MASKBITS)))
+        eeimagecollection = eeimagecollection.map(lambda image: (image
+                                                                 .unmask(inodata, False)
+                                                                 .toUint8()))
+        return eeimagecollection
+
+    @staticmethod
+    def unpack(data, szmask=None):
+        """
+        client side: unpack exported multimask data (numpy array) into the individual masks
+        - 0: not masked, 1: masked, 255: no data - as exported by the individual mask products
+        returns dict MASKBITS name -> numpy uint8 array, or only the array of szmask if specified
+        """
+        import numpy
+        data   = numpy.asarray(data).astype(numpy.uint8)
+        masks  = {}
+        for ibit, szname in enumerate(GEECol_s2multimask.MASKBITS):
+            if szmask is not None and szmask != szname: continue
+            mask = ((data >> ibit) & 1).astype(numpy.uint8)
+            mask[(data & (1 << (GEECol_s2multimask.NODATABITS + ibit))) != 0] = 255
+            masks[szname] = mask
+        if szmask is not None:
+            if szmask not in masks: raise ValueError(f"invalid mask '{szmask}' - expected one of {GEECol_s2multimask.MASKBITS}")
+            return masks[szmask]
+        return masks
+
+
 ###############################################################################
 #
 # Sentinel 1 related products
@@ -1412,6 +1836,12 @@ class GEECol_s1sigma0(GEECol, UserProjectable):
                                                                  .toFloat()))
         return eeimagecollection
 
+    def transferscaling(self):
+        """
+        dB in 0.01 dB steps - [-327.67, 327.67] dB covers anything sensible
+        """
+        return (0.01, 0.0)
+
     def _reproject(self, eeimagecollection, eeprojection, verbose=False):
         """
         reproject the collection - for S1 we need to convert and reconvert from/to dB
@@ -1489,6 +1919,107 @@ class GEECol_s1gamma0(GEECol_s1sigma0):
         return eeimagecollection
 
 
+"""
+"""
+class GEECol_s1sigma0multi(GEECol_s1sigma0):
+    """
+    all polarisations (bands) and orbit passes of GEECol_s1sigma0 in a single collection:
+    the S1 catalog is filtered once, and each polarisation and orbit pass - selected from the images containing
+    that polarisation, and mosaicked per day separately - ends up as single band images named 'VV_ASC', 'VH_ASC', 'VV_DES', ...
+
+    with description 'S1sigma0' (or 'S1Asigma0', 'S1Bsigma0') and 'gee_perband' set, GEEExp exports these bands per band,
+    as description_band, hence the same files as the separate GEECol_s1sigma0('VV', 'ASC'), GEECol_s1sigma0('VH', 'ASC'), ...
+    collections - including the dates of single polarisation acquisitions.
+    """
+    SZPRODUCT = 'sigma0'
+
+    def __init__(self, szplatformnumber=None, lstszbands=['VV', 'VH'], lstszorbitpasses=['ASC', 'DES']):
+        #
+        #    dual polarisation pair: exported per band (see 'gee_perband'), as description_band
+        #
+        if (len(lstszbands) != 2) or (set(lstszbands) not in [{'VV', 'VH'}, {'HH', 'HV'}]):
+            raise ValueError("bands must be specified as a dual polarisation pair: ['VV', 'VH'] or ['HH', 'HV']")
+        self.lstszbands = list(lstszbands)
+
+        if (not lstszorbitpasses) or (not set(lstszorbitpasses).issubset(['ASC', 'ASCENDING', 'DES', 'DESCENDING'])):
+            raise ValueError("orbitpasses must be specified as a list of 'ASCENDING'(or 'ASC'), 'DESCENDING'(or 'DES')")
+        self.lstszorbitpasses = list(dict.fromkeys({'ASC':'ASCENDING', 'DES':'DESCENDING'}.get(szorbitpass, szorbitpass) for szorbitpass in lstszorbitpasses))
+
+        if szplatformnumber is not None:
+            if not szplatformnumber in ['A', 'B']:
+                raise ValueError("platformnumber -if specified- must be one of 'A' or 'B'")
+        self.szplatformnumber = szplatformnumber
+
+    def _s1collection(self, eeroi, eedatefrom, eedatetill, verbose=False):
+        """
+        single S1 query for all variants - images containing any of the bands
+        """
+        eeimagecollection = (ee.ImageCollection('COPERNICUS/S1_GRD')
+                             .filter(ee.Filter.eq('instrumentSwath', 'IW'))
+                             .filterBounds(eeroi)
+                             .filter(ee.Filter.date(eedatefrom, eedatetill))
+                             .filter(ee.Filter.Or(*[ee.Filter.listContains('system:band_names', szband) for szband in self.lstszbands])))
+        if self.szplatformnumber is not None: 
+            eeimagecollection = eeimagecollection.filter(ee.Filter.eq('platform_number', self.szplatformnumber))
+        return eeimagecollection
+
+    def _s1image(self, image, szband):
+        """
+        per image conversion - sigma0: just the band
+        """
+        return image.select([szband])
+
+    def collect(self, eeroi, eedatefrom, eedatetill, verbose=False):
+        eeimagecollection = self._s1collection(eeroi, eedatefrom, eedatetill, verbose=verbose)
+        #
+        #    split by orbit pass and polarisation - each mosaicked per day on its own, from the images containing the polarisation,
+        #    its band suffixed by the pass
+        #
+        eepasscollection = None
+        for szorbitpass in self.lstszorbitpasses:
+            for szband in self.lstszbands:
+                eecollection = (eeimagecollection
+                                .filter(ee.Filter.eq('orbitProperties_pass', szorbitpass))
+                                .filter(ee.Filter.listContains('system:band_names', szband))
+                                .map(lambda image, szband=szband: self._s1image(image, szband)))
+                eecollection = geeutils.mosaictodate(eecollection, szmethod="mosaic", verbose=verbose)
+                eecollection = eecollection.map(lambda image, szpassband=f"{szband}_{szorbitpass[0:3]}": image.rename([szpassband]))
+                eepasscollection = eecollection if eepasscollection is None else eepasscollection.merge(eecollection)
+        eeimagecollection = eepasscollection.sort('system:time_start')
+        #
+        #    add collection properties describing this collection - as the bands are named [band]_[pass], 
+        #    the files exported per band are named as the separate GEECol_s1sigma0 ones: S1sigma0_VV_ASC, ...
+        #    'gee_perband': always exported per band - also when only 3 of the bands happen to be present
+        #       
+        eeimagecollection = eeimagecollection.set('gee_description', 'S1' + ("" if self.szplatformnumber is None else str(self.szplatformnumber)) + self.SZPRODUCT)
+        eeimagecollection = eeimagecollection.set('gee_perband', True)
+        #
+        #
+        #
+        return eeimagecollection
+
+
+"""
+"""
+class GEECol_s1gamma0multi(GEECol_s1sigma0multi):
+    """
+    GEECol_s1sigma0multi for gamma0 - files as the separate GEECol_s1gamma0 collections: S1gamma0_VV_ASC, ...
+    """
+    SZPRODUCT = 'gamma0'
+
+    def _s1collection(self, eeroi, eedatefrom, eedatetill, verbose=False):
+        return super()._s1collection(eeroi, eedatefrom, eedatetill, verbose=verbose).filter(ee.Filter.listContains('system:band_names','angle'))
+
+    def _s1image(self, image, szband):
+        """
+        gamma0_db = sigma0_db - 10 x log(cos(t)) - as GEECol_s1gamma0
+        """
+        return (image.select([szband])
+                .subtract(image.select('angle').multiply(3.1415/180.0).cos().log10().multiply(10.))
+                .rename([szband])
+                .copyProperties(image)
+                .copyProperties(image, ['system:id', 'system:time_start']))
+
 """
 """
 class GEECol_s1rvi(GEECol, OrdinalProjectable):
@@ -1577,12 +2108,13 @@ class PV333smfilter(geemask.IColFilter):
 
     typical use in the collect method of sentinel 2  products (GEECol daughter classes)
     """
-    def __init__(self, classesarray=[112, 120, 240, 248], thresholdpct=5):
+    def __init__(self, classesarray=[112, 120, 240, 248], thresholdpct=5, tagcache=None):
         """
         :param classesarray: list (python list, NOT ee.List) of the STATUS MASK values to be evaluated
         :param thresholdpct: the minimum (positive thresholds) or maximum (negative thresholds) percentage coverage by these values ( [0..100] )
+        :param tagcache: (optional) geecache.GEECoverageTagCache - see geemask.SimpleFilter
         """
-        self.filter = geemask.SimpleFilter('SM', classesarray, thresholdpct)
+        self.filter = geemask.SimpleFilter('SM', classesarray, thresholdpct, tagcache=tagcache)
 
     def filtercollection(self, eeimagecollection, eeregion, verbose=False):
         """
@@ -1652,6 +2184,12 @@ class GEECol_pv333ndvi(GEECol, OrdinalProjectable):
                                                                  .copyProperties(image, ['system:time_start'])))
         return eeimagecollection
 
+    def transferscaling(self):
+        """
+        ndvi [-1, 1] -> [-10000, 10000]
+        """
+        return (0.0001, 0.0)
+
 
 """
 GEECol_pv333ndvi with historical vito ndvi scaling
@@ -1680,6 +2218,12 @@ class GEECol_pv333ndvi_he(GEECol_pv333ndvi):
                                                                  .copyProperties(image, ['system:time_start'])))
         return eeimagecollection 
 
+    def transferscaling(self):
+        """
+        already byte-scaled
+        """
+        return None
+
 
 """
 """
@@ -0,0 +1,116 @@
+"""
+GeoTIFF output profiles for the GEEExp local exports
+
+the server zip contains plain GeoTIFFs: stripped, and (apart from the exportimagestack post-processing) uncompressed.
+our archive holds millions of these small files, hence downstream readers pay for this layout.
+the output profiles below can be selected in GEEExp (outputprofile=...) and are applied while writing the final files.
+
+- "DEFLATE" : GTiff, DEFLATE compression with horizontal (integer) or floating point predictor
+- "ZSTD"    : GTiff, ZSTD compression with predictor - faster to decompress than DEFLATE, needs gdal built with zstd
+- "COG"     : Cloud-Optimized GeoTIFF (gdal >= 3.1), internal tiling, DEFLATE with predictor, overviews as far as useful
+              (for 64x64 patches there will be none: they fit in a single tile)
+- "NBITS"   : GTiff, DEFLATE, and NBITS for (unsigned) integer products whose values fit in less bits (e.g. S2scl: 4 bits)
+              remark: masks using 255 as no-data value still need 8 bits; for these NBITS falls back to plain DEFLATE,
+                      as it does for bands without any valid pixel (fully masked patches: no min/max to compute)
+
+see examples/benchmark_outputprofiles.py for bytes on disk and read times on typical patches
+"""
+import math
+
+
+
+OUTPUTPROFILES = ["DEFLATE", "ZSTD", "COG", "NBITS"]
+
+#
+#    tile size for COG - our patches are small
+#
+COGBLOCKSIZE = 64
+
+
+"""
+"""
+def _isfloat(datatype):
+    import osgeo.gdal
+    return datatype in (osgeo.gdal.GDT_Float32, osgeo.gdal.GDT_Float64)
+
+"""
+"""
+def _nbits(src_ds):
+    """
+    minimum number of bits needed to represent the (unsigned integer) data in src_ds. None if not applicable,
+    e.g. for bands consisting of no-data only, for which gdal can not compute the min/max.
+    """
+    import osgeo.gdal
+    datatype = src_ds.GetRasterBand(1).DataType
+    if datatype not in (osgeo.gdal.GDT_Byte, osgeo.gdal.GDT_UInt16):
+        return None
+    imax = 0
+    for iband in range(src_ds.RasterCount):
+        band    = src_ds.GetRasterBand(iband+1)
+        nodata  = band.GetNoDataValue()
+        try:
+            minmax = band.ComputeRasterMinMax(False)
+        except Exception:
+            #
+            #    gdal exceptions enabled: "Failed to compute min/max, no valid pixels found in sampling."
+            #
+            return None
+        if minmax is None: return None
+        imin, imaxband = minmax
+        if math.isnan(imin) or math.isnan(imaxband): return None
+        if imin < 0: return None
+        imax = max(imax, int(imaxband), int(nodata) if (nodata is not None and not math.isnan(nodata)) else 0)
+    inbits = max(1, int(math.ceil(math.log2(imax + 1))))
+    ifullbits = 8 if datatype == osgeo.gdal.GDT_Byte else 16
+    return inbits if inbits < ifullbits else None
+
+"""
+"""
+def profileoptions(szoutputprofile, src_ds):
+    """
+    returns (szdrivername, lstcreationoptions) to write src_ds according to output profile szoutputprofile
+    """
+    if szoutputprofile not in OUTPUTPROFILES:
+        raise ValueError(f"invalid output profile '{szoutputprofile}' - expected one of {OUTPUTPROFILES}")
+
+    datatype    = src_ds.GetRasterBand(1).DataType
+    szpredictor = "3" if _isfloat(datatype) else "2"
+    lstoptions  = []
+
+    if szoutputprofile == "COG":
+        lstoptions  = ["COMPRESS=DEFLATE", "PREDICTOR=YES", f"BLOCKSIZE={COGBLOCKSIZE}", "OVERVIEWS=AUTO",
+                       f"RESAMPLING={'AVERAGE' if _isfloat(datatype) else 'NEAREST'}"]
+        return "COG", lstoptions
+
+    if szoutputprofile == "DEFLATE":
+        lstoptions = ["COMPRESS=DEFLATE", f"PREDICTOR={szpredictor}"]
+    elif szoutputprofile == "ZSTD":
+        lstoptions = ["COMPRESS=ZSTD", f"PREDICTOR={szpredictor}", "ZSTD_LEVEL=9"]
+    elif szoutputprofile == "NBITS":
+        inbits     = _nbits(src_ds)
+        lstoptions = ["COMPRESS=DEFLATE"] + ([f"NBITS={inbits}"] if inbits else [f"PREDICTOR={szpredictor}"])
+    #
+    #    multiband stacks are no rgb images
+    #
+    if src_ds.RasterCount > 1 and src_ds.RasterCount != 3:
+        lstoptions.append("PHOTOMETRIC=MINISBLACK")
+        lstoptions.append("INTERLEAVE=BAND")
+    return "GTiff", lstoptions
+
+"""
+"""
+def writeprofiled(src_ds, szfilename, szoutputprofile, verbose=False):
+    """
+    write (copy) gdal dataset src_ds to szfilename according to output profile szoutputprofile
+    """
+    import osgeo.gdal
+    szdrivername, lstoptions = profileoptions(szoutputprofile, src_ds)
+    driver = osgeo.gdal.GetDriverByName(szdrivername)
+    if driver is None:
+        raise ValueError(f"gdal driver '{szdrivername}' not available for output profile '{szoutputprofile}'")
+    dst_ds = driver.CreateCopy(szfilename, src_ds, options=lstoptions)
+    if dst_ds is None:
+        raise IOError(f"writing '{szfilename}' with output profile '{szoutputprofile}' failed")
+    dst_ds.FlushCache()
+    dst_ds = None
+    if verbose: print(f"geetiff.writeprofiled - {szfilename} ({szdrivername} {' '.join(lstoptions)})")
@@ -0,0 +1,364 @@
+"""
+http transport for the GEEExp local downloads (getDownloadURL zips)
+"""
+import time
+import queue
+import tempfile
+import zipfile
+import logging
+import threading
+import collections
+import concurrent.futures
+
+import requests
+import requests.adapters
+
+import geeutils
+
+
+
+"""
+GEETransport:
+- keeps a pool of persistent keep-alive requests.Session-s, one per concurrent download: tens of thousands of downloads per run
+  should not pay the tcp/tls setup each time
+- streams the response in chunksize chunks into a spooled buffer (in memory as long as it does not exceed spoolsize)
+- resumes partially downloaded payloads using http Range requests; if the server ignores the Range header (200 iso 206)
+  the payload is restarted from scratch
+- verifies the payload against its Content-Length (or Content-Range total) and verifies the zip integrity before it is handed over
+- retries via geeutils.wrapretry
+- optionally hedges slow downloads (hedgepercentile): once a download takes longer than the hedgepercentile of the
+  recent (hedgehistory) download latencies, a duplicate request for the same url is issued. the first complete
+  and verified payload wins, the other one is cancelled. hedges are only issued once hedgeminsamples latencies are known, 
+  and never before hedgeminseconds. counters are available via stats()
+  cancelling closes the in-flight response and session of the loser (from the winner side), so a loser blocked in a read
+  gives up its worker thread at once; a cancelled request is never retried.
+"""
+class GEETransportException(IOError): pass
+
+class GEETransport(object):
+    """
+    e.g.
+        transport = GEETransport(chunksize=1024*1024)
+        zipbuffer = transport.downloadzip(url)
+        with zipfile.ZipFile(zipbuffer) as z: ...
+        zipbuffer.close()
+    """
+
+    """
+    """
+    def __init__(self, chunksize=1024*1024, spoolsize=64*1024*1024, timeout=(30, 300), attempts=3, backoffseconds=10, backofffactor=1, poolsize=4,
+                 hedgepercentile=None, hedgehistory=200, hedgeminsamples=20, hedgeminseconds=5, hedgeworkers=16):
+        """
+        :param chunksize: chunk size used to stream the response. Defaults to 1MB
+        :param spoolsize: payloads up to this size are kept in memory. Defaults to 64MB (getDownloadURL requests are limited to 48MB)
+        :param timeout: requests (connect, read) timeout in seconds
+        :param attempts, backoffseconds, backofffactor: geeutils.wrapretry parameters
+        :param poolsize: connection pool size per session
+        :param hedgepercentile: latency percentile (e.g. 95) beyond which a duplicate request is issued. default None: no hedging
+        :param hedgehistory: number of recent download latencies considered
+        :param hedgeminsamples: minimum number of latencies known before hedging starts
+        :param hedgeminseconds: never hedge before this number of seconds
+        :param hedgeworkers: number of threads running the hedged requests (the original and its duplicate).
+                             two per concurrent download, or the duplicates queue behind the slow originals they should bypass
+        """
+        self.chunksize      = int(chunksize)
+        self.spoolsize      = int(spoolsize)
+        self.timeout        = timeout
+        self.attempts       = attempts
+        self.backoffseconds = backoffseconds
+        self.backofffactor  = backofffactor
+        self.poolsize       = poolsize
+        self._sessions      = queue.LifoQueue()
+
+        self.hedgepercentile = hedgepercentile
+        self.hedgeminsamples = hedgeminsamples
+        self.hedgeminseconds = hedgeminseconds
+        self._latencies      = collections.deque(maxlen=hedgehistory)
+        self._statslock      = threading.Lock()
+        self._downloads      = 0
+        self._hedgesissued   = 0
+        self._hedgeswon      = 0
+        self._hedgeexecutor  = concurrent.futures.ThreadPoolExecutor(max_workers=hedgeworkers) if hedgepercentile is not None else None
+        #
+        #    in-flight requests of cancellable downloads: cancelevent -> [session, response]
+        #
+        self._inflight       = {}
+        self._inflightlock   = threading.Lock()
+
+    """
+    """
+    def _acquiresession(self):
+        """
+        persistent keep-alive session - one per worker: requests.Session is not guaranteed to be thread-safe.
+        sessions are pooled rather than thread-local, so they survive the worker threads (a GEEExp thread pool only lives for one export)
+        """
+        try:
+            return self._sessions.get_nowait()
+        except queue.Empty:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=self.poolsize, pool_maxsize=self.poolsize)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            return session
+
+    """
+    """
+    def _releasesession(self, session):
+        self._sessions.put(session)
+
+    """
+    """
+    def _cancel(self, cancelevent):
+        """
+        cancel the download running with cancelevent (if any): closing its response and session interrupts a blocked read
+        """
+        with self._inflightlock:
+            cancelevent.set()
+            lstinflight = self._inflight.get(cancelevent)
+        if lstinflight is None: return
+        session, response = lstinflight
+        try:
+            if response is not None: response.close()
+            session.close()
+        except Exception as e:
+            logging.debug(f"{str(type(self).__name__)}._cancel - {str(e)}")
+
+    """
+    """
+    def close(self):
+        """
+        stop the hedge threads and close all idle sessions - the transport is not to be used afterwards
+        """
+        if self._hedgeexecutor is not None: self._hedgeexecutor.shutdown(wait=True)
+        while True:
+            try:
+                self._sessions.get_nowait().close()
+            except queue.Empty:
+                break
+
+    """
+    """
+    def _receive(self, session, url, buffer, ioffset, headers, cancelevent=None, verbose=False):
+        """
+        single http request, appending the response to buffer
+        returns the expected total payload size (None if unknown)
+        stops silently as soon as cancelevent is set
+        """
+        with session.get(url, stream=True, headers=headers, timeout=self.timeout) as r:
+            if cancelevent is not None:
+                with self._inflightlock:
+                    if cancelevent in self._inflight: self._inflight[cancelevent][1] = r
+                if cancelevent.is_set(): return None
+            if r.status_code == 206:
+                #
+                #    partial content: "Content-Range: bytes start-end/total"
+                #
+                szcontentrange = r.headers.get('Content-Range', '')
+                try:
+                    istart = int(szcontentrange.split(' ')[1].split('-')[0])
+                    szsize = szcontentrange.split('/')[1]
+                    itotal = None if szsize == '*' else int(szsize)
+                except Exception:
+                    raise GEETransportException(f"invalid Content-Range ({szcontentrange})")
+                if istart != ioffset:
+                    raise GEETransportException(f"unexpected Content-Range ({szcontentrange}) resuming at {ioffset}")
+                if verbose: print(f"{str(type(self).__name__)}._receive - resuming at {ioffset} bytes")
+
+            elif r.status_code == 200:
+                #
+                #    full content: restart from scratch (server might ignore Range)
+                #
+                if ioffset > 0:
+                    if verbose: print(f"{str(type(self).__name__)}._receive - server ignored Range - restart from scratch")
+                    buffer.seek(0)
+                    buffer.truncate()
+                szcontentlength = r.headers.get('Content-Length')
+                itotal = int(szcontentlength) if szcontentlength is not None else None
+                #
+                #    remark: Content-Length is meaningless in case the response is content-encoded (requests decodes it)
+                #
+                if r.headers.get('Content-Encoding', 'identity') != 'identity': itotal = None
+
+            else:
+                raise GEETransportException(f"error occurred while downloading - status code({r.status_code})")
+
+            for chunk in r.iter_content(chunk_size=self.chunksize):
+                if cancelevent is not None and cancelevent.is_set(): break
+                buffer.write(chunk)
+        return itotal
+
+    """
+    """
+    def _download(self, url, buffer, cancelevent=None, verbose=False):
+        """
+        (continue to) download url into buffer
+        - buffer content is considered to be the first part of the payload; in case it is not empty, we try to resume
+        - returns None (without verification) in case it was cancelled via cancelevent - also when the cancellation
+          made the request fail (its response and session closed by _cancel), hence wrapretry does not retry it
+        """
+        if cancelevent is not None and cancelevent.is_set(): return None
+
+        buffer.seek(0, 2)
+        ioffset = buffer.tell()
+        headers = {'Range': f"bytes={ioffset}-"} if ioffset > 0 else {}
+
+        session = self._acquiresession()
+        if cancelevent is not None:
+            with self._inflightlock:
+                self._inflight[cancelevent] = [session, None]
+        try:
+            if cancelevent is not None and cancelevent.is_set(): return None
+            itotal = self._receive(session, url, buffer, ioffset, headers, cancelevent=cancelevent, verbose=verbose)
+        except Exception:
+            if cancelevent is not None and cancelevent.is_set(): return None
+            raise
+        finally:
+            bcancelled = False
+            if cancelevent is not None:
+                with self._inflightlock:
+                    self._inflight.pop(cancelevent, None)
+                    bcancelled = cancelevent.is_set()
+            #
+            #    a session closed by _cancel is not pooled again
+            #
+            if bcancelled: session.close()
+            else:          self._releasesession(session)
+        if cancelevent is not None and cancelevent.is_set(): return None
+
+        #
+        #    verify length - an incomplete payload will be resumed by the next attempt
+        #
+        buffer.seek(0, 2)
+        isize = buffer.tell()
+        if itotal is not None and isize != itotal:
+            raise GEETransportException(f"incomplete download ({isize} of {itotal} bytes)")
+        #
+        #    verify zip integrity - a corrupt complete payload cannot be resumed: restart from scratch
+        #
+        try:
+            buffer.seek(0)
+            with zipfile.ZipFile(buffer) as z:
+                szbadmember = z.testzip()
+            if szbadmember is not None:
+                raise zipfile.BadZipFile(f"corrupt member {szbadmember}")
+        except zipfile.BadZipFile as e:
+            buffer.seek(0)
+            buffer.truncate()
+            raise GEETransportException(f"invalid zip ({str(e)})")
+
+        buffer.seek(0)
+        return isize
+
+    """
+    """
+    def _downloadbuffer(self, url, cancelevent=None, verbose=False):
+        """
+        download (with retries) url into a fresh spooled buffer - returns the buffer, or None if cancelled
+        """
+        buffer = tempfile.SpooledTemporaryFile(max_size=self.spoolsize)
+        try:
+            isize = geeutils.wrapretry(
+                self._download,
+                args=(url, buffer),
+                kwargs={'cancelevent':cancelevent, 'verbose':verbose},
+                attempts=self.attempts, backoffseconds=self.backoffseconds, backofffactor=self.backofffactor, verbose=verbose)
+        except Exception:
+            buffer.close()
+            raise
+        if isize is None:
+            buffer.close()
+            return None
+        if verbose: print(f"{str(type(self).__name__)}.downloadzip - {isize} bytes")
+        return buffer
+
+    """
+    """
+    def _hedgeseconds(self):
+        """
+        current hedge threshold in seconds - None if not hedging (yet)
+        """
+        if self.hedgepercentile is None: return None
+        with self._statslock:
+            if len(self._latencies) < self.hedgeminsamples: return None
+            lstlatencies = sorted(self._latencies)
+        iIdx = min(len(lstlatencies) - 1, int(len(lstlatencies) * self.hedgepercentile / 100.))
+        return max(self.hedgeminseconds, lstlatencies[iIdx])
+
+    """
+    """
+    def _hedgeddownload(self, url, hedgeseconds, verbose=False):
+        """
+        download via the original request, and - if it takes longer than hedgeseconds - a duplicate request. first one wins.
+        """
+        lstevents = [threading.Event()]
+        pending   = {self._hedgeexecutor.submit(self._downloadbuffer, url, cancelevent=lstevents[0], verbose=verbose): 0}
+        done, _   = concurrent.futures.wait(pending, timeout=hedgeseconds)
+        if not done:
+            lstevents.append(threading.Event())
+            pending[self._hedgeexecutor.submit(self._downloadbuffer, url, cancelevent=lstevents[1], verbose=verbose)] = 1
+            with self._statslock: self._hedgesissued += 1
+            if verbose: print(f"{str(type(self).__name__)}.downloadzip - no response after {hedgeseconds:.1f} seconds - hedge issued")
+
+        buffer        = None
+        lastexception = None
+        remaining     = set(pending)
+        while remaining and buffer is None:
+            done, remaining = concurrent.futures.wait(remaining, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    lastexception = future.exception()
+                    continue
+                if buffer is None and future.result() is not None:
+                    buffer = future.result()
+                    if pending[future] == 1:
+                        with self._statslock: self._hedgeswon += 1
+                elif future.result() is not None:
+                    future.result().close()
+        #
+        #    cancel the loser - its buffer is closed as soon as it gives up
+        #
+        for event in lstevents: self._cancel(event)
+        for future in remaining:
+            future.add_done_callback(lambda future: future.result().close() if (future.exception() is None and future.result() is not None) else None)
+
+        if buffer is None:
+            raise lastexception if lastexception is not None else GEETransportException("hedged download failed")
+        return buffer
+
+    """
+    """
+    def downloadzip(self, url, verbose=False):
+        """
+        download a zip payload from url into a spooled buffer
+        returns the verified buffer, positioned at its start. the caller is supposed to close it.
+        """
+        starttime    = time.monotonic()
+        hedgeseconds = self._hedgeseconds()
+        try:
+            if hedgeseconds is None:
+                buffer = self._downloadbuffer(url, verbose=verbose)
+            else:
+                buffer = self._hedgeddownload(url, hedgeseconds, verbose=verbose)
+        except Exception as e:
+            logging.warning(f"{str(type(self).__name__)}.downloadzip - failed: {str(e)}")
+            raise
+        with self._statslock:
+            self._latencies.append(time.monotonic() - starttime)
+            self._downloads += 1
+        return buffer
+
+    """
+    """
+    def stats(self):
+        """
+        download and hedging counters
+        """
+        hedgeseconds = self._hedgeseconds()
+        with self._statslock:
+            lstlatencies = sorted(self._latencies)
+            return {
+                'downloads'    : self._downloads,
+                'hedgesissued' : self._hedgesissued,
+                'hedgeswon'    : self._hedgeswon,
+                'medianseconds': lstlatencies[len(lstlatencies)//2] if lstlatencies else None,
+                'hedgeseconds' : hedgeseconds}
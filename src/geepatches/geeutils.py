@@ -894,6 +894,20 @@ def wrapretry(func, args=(), kwargs={}, *, attempts=3, backoffseconds=10, backof
     return result
 
 
+def getinfo(eeobject, *, check=None, attempts=6, backoffseconds=30, backofffactor=2, verbose=False):
+    """
+    single server evaluation (eeobject.getInfo()) with retries - max 0.5 + 1 + ... + 8 = 15.5 minutes backoff by default.
+    retrying the evaluation itself, rather than the whole function it is part of, avoids redoing the evaluations which did succeed.
+    check (optional): called with the evaluated result, inside the retried callable, returning the (possibly transformed) result.
+                      it can raise a NoRetryException to stop at once for results which will never be any better.
+    """
+    if check is None:
+        return wrapretry(eeobject.getInfo, attempts=attempts, backoffseconds=backoffseconds, backofffactor=backofffactor, verbose=verbose)
+    def _getinfo():
+        return check(eeobject.getInfo())
+    return wrapretry(_getinfo, attempts=attempts, backoffseconds=backoffseconds, backofffactor=backofffactor, verbose=verbose)
+
+
 #
 #    debug functions
 #